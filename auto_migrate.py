@@ -5,6 +5,7 @@ ButterKnife自动迁移工具
 自动检测当前目录并执行迁移
 """
 
+import argparse
 import os
 import sys
 import json
@@ -22,15 +23,19 @@ from transformer.onclick_transformer import OnClickTransformer
 from transformer.bindcall_remover import BindCallRemover
 from injector.code_injector import CodeInjector
 from writer.file_writer import FileWriter
+from writer.diff_writer import DiffWriter
 from utils.logger import Logger
 from utils.code_formatter import CodeFormatter
+from scanner.prefilter import file_has_butterknife_signature
 
 
 class AutoButterKnifeMigrator:
     """自动ButterKnife迁移工具"""
     
-    def __init__(self):
+    def __init__(self, dry_run: bool = False, diff_output: str = None):
         self.config = Config()
+        self.config.DRY_RUN = dry_run
+        self.config.DIFF_OUTPUT = diff_output
         self.logger = Logger()
         self.scanner = FileScanner(self.config)
         self.parser = ButterKnifeParser()
@@ -40,8 +45,10 @@ class AutoButterKnifeMigrator:
             OnClickTransformer(),
             BindCallRemover()
         ]
-        self.injector = CodeInjector()
+        self.injector = CodeInjector(self.logger)
         self.writer = FileWriter(self.config)
+        # 预览模式只输出差异，不写入文件
+        self.diff_writer = DiffWriter(self.config.PROJECT_PATH, diff_output) if dry_run else None
         
     def detect_project_type(self):
         """检测项目类型"""
@@ -136,9 +143,15 @@ class AutoButterKnifeMigrator:
                 try:
                     print(f"📄 处理文件: {file_path}")
                     
+                    # 字节级预过滤，不含ButterKnife特征串的文件无需读取和解析
+                    if not file_has_butterknife_signature(file_path):
+                        print(f"   ⏭️  跳过（无ButterKnife注解）")
+                        continue
+                    
                     # 读取文件内容
                     with open(file_path, 'r', encoding='utf-8') as f:
                         content = f.read()
+                    original_content = content
                     
                     # 检测格式化问题
                     issues = self.formatter.detect_formatting_issues(content)
@@ -166,6 +179,17 @@ class AutoButterKnifeMigrator:
                     # 注入代码
                     final_content = self.injector.inject(transformed_content, parsed_data)
                     
+                    # 内容未变化时不备份也不写入
+                    if final_content == original_content:
+                        print(f"   ⏭️  内容未变化，跳过写入")
+                        continue
+                    
+                    if self.diff_writer is not None:
+                        self.diff_writer.write_diff(file_path, original_content, final_content)
+                        migrated_count += 1
+                        print(f"   👀 预览完成（未写入）")
+                        continue
+                    
                     # 写入文件
                     self.writer.write_file(file_path, final_content)
                     
@@ -174,10 +198,18 @@ class AutoButterKnifeMigrator:
                     
                 except Exception as e:
                     print(f"   ❌ 迁移失败: {str(e)}")
-                    self.logger.error(f"迁移文件 {file_path} 失败: {str(e)}")
+                    self.logger.error("迁移文件 %s 失败: %s", file_path, e)
             
-            # 3. 生成报告
-            self.generate_report(migrated_count, total_butterknife_files, java_files)
+            # 3. 生成报告（预览模式不保存）
+            self.writer.close()
+            self.logger.flush()
+            if self.diff_writer is not None:
+                self.diff_writer.close()
+                statistics = self.diff_writer.statistics
+                print(f"👀 预览模式: 未写入任何文件，{statistics['files']} 个文件有差异"
+                      f"（+{statistics['added_lines']} -{statistics['removed_lines']} 行）")
+            else:
+                self.generate_report(migrated_count, total_butterknife_files, java_files)
             
             print()
             print("=" * 60)
@@ -215,7 +247,13 @@ class AutoButterKnifeMigrator:
 
 def main():
     """主函数"""
-    migrator = AutoButterKnifeMigrator()
+    parser = argparse.ArgumentParser(description='ButterKnife自动迁移工具')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='预览模式：不写入文件、不创建备份，输出每个文件的统一差异')
+    parser.add_argument('--diff-output', help='预览模式的补丁文件路径（默认输出到标准输出）')
+    args = parser.parse_args()
+    
+    migrator = AutoButterKnifeMigrator(args.dry_run, args.diff_output)
     success = migrator.migrate()
     
     if success:
@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试模块
+使用方式: python -m benchmarks.bench_prefilter
+"""
\ No newline at end of file
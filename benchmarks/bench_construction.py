@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+组件构造基准测试
+比较解析器、转换器、注入器等组件的单个实例构造耗时：
+- shared: 当前实现，正则为类属性 SharedPattern，构造时不编译
+- eager: 每个实例构造时重新 re.compile 全部正则（原来的做法，命中re模块内部缓存）
+- eager_cold: 同上，但每次构造前清空re模块缓存（缓存被其他正则挤出时的情况）
+另外给出进程内第一次编译全部共享正则的一次性开销
+
+使用方式:
+    python -m benchmarks.bench_construction --instances 2000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser, ParsingResult
+from butterknife_parser_module.parse_records import ParseResult
+from transformer.findview_transformer import FindViewTransformer
+from transformer.onclick_transformer import OnClickTransformer
+from transformer.bindcall_remover import BindCallRemover
+from injector.code_injector import CodeInjector
+from utils.code_formatter import CodeFormatter
+from utils.pattern_registry import PATTERN_REGISTRY, compiled_patterns
+from pipeline.file_pipeline import FilePipeline
+
+
+# 组件名称 -> 构造函数
+COMPONENTS: Dict[str, Callable[[], Any]] = {
+    'ButterKnifeParser': ButterKnifeParser,
+    'FindViewTransformer': FindViewTransformer,
+    'OnClickTransformer': OnClickTransformer,
+    'BindCallRemover': BindCallRemover,
+    'CodeInjector': CodeInjector,
+    'CodeFormatter': CodeFormatter,
+    'ParsingResult': lambda: ParsingResult(ParseResult.empty()),
+    'FilePipeline': lambda: FilePipeline(Config())
+}
+
+
+def _pattern_sources(factory: Callable[[], Any]) -> list:
+    """组件（及其内部组件）用到的全部正则的 (模式, 标志)"""
+    instance = factory()
+    owners = [instance]
+    if isinstance(instance, ParsingResult):
+        owners = [instance.parser]
+    elif isinstance(instance, FilePipeline):
+        owners = [instance.parser, instance.injector] + instance.transformers
+    return [(pattern.pattern, pattern.flags) for owner in owners for pattern in compiled_patterns(owner).values()]
+
+
+def time_construction(factory: Callable[[], Any], instances: int, sources: list = None,
+                      purge: bool = False) -> float:
+    """构造instances个实例的平均耗时（微秒）；提供sources时每个实例额外编译这些正则"""
+    start = time.perf_counter()
+    for _ in range(instances):
+        factory()
+        if sources is not None:
+            if purge:
+                re.purge()
+            for pattern, flags in sources:
+                re.compile(pattern, flags)
+    return (time.perf_counter() - start) / instances * 1e6
+
+
+def run(instances: int) -> Dict[str, Any]:
+    """执行基准测试，返回结果字典"""
+    # 进程内第一次编译全部共享正则
+    PATTERN_REGISTRY.clear()
+    re.purge()
+    start = time.perf_counter()
+    sources = {name: _pattern_sources(factory) for name, factory in COMPONENTS.items()}
+    first_compile = time.perf_counter() - start
+
+    components = {}
+    for name, factory in COMPONENTS.items():
+        cold_instances = max(1, instances // 20)
+        components[name] = {
+            'patterns': len(sources[name]),
+            'shared_us': round(time_construction(factory, instances), 3),
+            'eager_us': round(time_construction(factory, instances, sources[name]), 3),
+            'eager_cold_us': round(time_construction(factory, cold_instances, sources[name], purge=True), 3)
+        }
+
+    return {
+        'benchmark': 'construction',
+        'instances': instances,
+        'registered_patterns': PATTERN_REGISTRY.registered_count(),
+        'first_compile_seconds': round(first_compile, 6),
+        'components': components
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='组件构造（shared / eager）基准测试')
+    parser.add_argument('--instances', type=int, default=2000, help='每个组件构造的实例数')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    report = run(args.instances)
+
+    print("=" * 50)
+    print("组件构造基准测试（每个实例的平均耗时，微秒）")
+    print("=" * 50)
+    print(f"共享正则: {report['registered_patterns']} 个，第一次全部编译耗时 "
+          f"{report['first_compile_seconds'] * 1000:.1f} ms")
+    print(f"{'组件':<20}{'正则数':>6}{'shared':>10}{'eager':>10}{'eager_cold':>12}")
+    for name, result in report['components'].items():
+        print(f"{name:<20}{result['patterns']:>6}{result['shared_us']:>10.2f}"
+              f"{result['eager_us']:>10.2f}{result['eager_cold_us']:>12.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
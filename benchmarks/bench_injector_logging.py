@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+注入器调试日志开销基准测试
+在一个大型Activity上比较 CodeInjector 在调试日志开启（输出到空设备）与按级别关闭时的耗时
+
+使用方式:
+    python -m benchmarks.bench_injector_logging --views 300 --clicks 100 --size-kb 256
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from injector.code_injector import CodeInjector
+from pipeline.file_pipeline import FilePipeline
+from utils.logger import Logger
+from benchmarks.project_generator import AndroidProjectGenerator
+
+
+def create_activity(views: int, clicks: int, size_kb: int) -> str:
+    """生成一个大型Activity的源码"""
+    generator = AndroidProjectGenerator(
+        activities=1, fragments=0, adapters=0, plain=0,
+        views_per_class=views, clicks_per_class=clicks, ids_per_click=min(views, 8),
+        size_distribution=((1, size_kb),)
+    )
+    project_path = tempfile.mkdtemp(prefix="bench_injector_")
+    try:
+        generator.generate(project_path)
+        for directory, _, names in os.walk(project_path):
+            for name in names:
+                with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                    return f.read()
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+    raise RuntimeError("未生成Activity")
+
+
+def create_logger(level: str) -> Logger:
+    """创建只输出到控制台、同步写入的日志记录器"""
+    config = Config()
+    config.LOG_LEVEL = level
+    config.LOG_FILE = None
+    config.LOG_ASYNC = False
+    return Logger(config)
+
+
+class _CountingStream:
+    """统计写入行数的空输出流"""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text: str):
+        self.lines += text.count('\n')
+
+    def flush(self):
+        pass
+
+
+def bench_inject(injector: CodeInjector, code: str, parsed_data: dict, repeat: int) -> dict:
+    """重复执行注入，返回最快一次的耗时和输出行数"""
+    best = None
+    stream = _CountingStream()
+    with contextlib.redirect_stdout(stream):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            injector.inject(code, parsed_data)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        'seconds': round(best, 6),
+        'debug_lines_per_run': stream.lines // repeat
+    }
+
+
+def run(views: int, clicks: int, size_kb: int, repeat: int) -> dict:
+    """执行基准测试，返回结果字典"""
+    source = create_activity(views, clicks, size_kb)
+    pipeline = FilePipeline(Config())
+    parsed_data = pipeline.parse(source)
+    code = pipeline.transform(parsed_data, source)
+
+    results = {
+        'debug': bench_inject(CodeInjector(create_logger('DEBUG')), code, parsed_data, repeat),
+        'info': bench_inject(CodeInjector(create_logger('INFO')), code, parsed_data, repeat),
+        'no_logger': bench_inject(CodeInjector(), code, parsed_data, repeat)
+    }
+
+    return {
+        'file_bytes': len(source.encode('utf-8')),
+        'bind_views': len(parsed_data.get('bind_views', [])),
+        'on_clicks': len(parsed_data.get('on_clicks', [])),
+        'repeat': repeat,
+        'results': results,
+        'debug_overhead': round(results['debug']['seconds'] / results['info']['seconds'], 2)
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='注入器调试日志开销基准测试')
+    parser.add_argument('--views', type=int, default=300, help='@BindView字段数')
+    parser.add_argument('--clicks', type=int, default=100, help='@OnClick方法数')
+    parser.add_argument('--size-kb', type=int, default=256, help='Activity文件的大约大小(KB)')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数（取最快一次）')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    report = run(args.views, args.clicks, args.size_kb, args.repeat)
+
+    print("=" * 50)
+    print("注入器调试日志开销基准测试")
+    print("=" * 50)
+    print(f"Activity大小: {report['file_bytes'] / 1024:.0f} KB，"
+          f"{report['bind_views']} 个@BindView，{report['on_clicks']} 个@OnClick")
+    for name, result in report['results'].items():
+        print(f"{name:>10}: {result['seconds']:.4f}s  调试输出 {result['debug_lines_per_run']} 行")
+    print(f"调试日志开销: {report['debug_overhead']}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
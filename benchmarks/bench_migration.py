@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+迁移流程分阶段基准测试
+在合成Android项目上分别计时 ButterKnifeMigrator.migrate 的各个阶段：
+扫描 → 解析 → 转换 → 注入 → 写入，并记录完整 migrate() 的端到端耗时
+结果以JSON输出，可在不同版本之间对比
+
+使用方式:
+    python -m benchmarks.bench_migration --activities 200 --fragments 100 --adapters 100 --json before.json
+    python -m benchmarks.bench_migration --compare before.json --json after.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, Any
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config, TOOL_VERSION
+from main import ButterKnifeMigrator
+from scanner.prefilter import has_butterknife_signature
+from benchmarks.project_generator import (
+    AndroidProjectGenerator, DEFAULT_SIZE_DISTRIBUTION, parse_size_distribution
+)
+
+
+STAGES = ('scan', 'parse', 'transform', 'inject', 'write')
+
+
+def create_config(project_path: str, backup: bool) -> Config:
+    """创建基准测试使用的配置（日志和缓存都位于临时项目内）"""
+    config = Config()
+    config.PROJECT_PATH = project_path
+    config.BACKUP_ENABLED = backup
+    config.PARSE_CACHE_ENABLED = False
+    config.LOG_LEVEL = 'WARNING'
+    return config
+
+
+@contextlib.contextmanager
+def quiet_output():
+    """丢弃迁移过程中的控制台输出，避免终端输出影响计时"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield
+
+
+def time_stages(project_path: str, backup: bool) -> Dict[str, Any]:
+    """
+    分阶段执行一次迁移，返回各阶段耗时
+
+    解析阶段包含读取文件和字节级预过滤，与 FilePipeline.process_file 一致
+    """
+    migrator = ButterKnifeMigrator(create_config(project_path, backup))
+    pipeline = migrator.pipeline
+    seconds = dict.fromkeys(STAGES, 0.0)
+    migrated = 0
+
+    with quiet_output():
+        start = time.perf_counter()
+        java_files = migrator.scanner.scan_files()
+        seconds['scan'] = time.perf_counter() - start
+
+        for file_path in java_files:
+            start = time.perf_counter()
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            parsed_data = None
+            if has_butterknife_signature(data):
+                content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                parsed_data = pipeline.parse(content)
+            seconds['parse'] += time.perf_counter() - start
+
+            if parsed_data is None or not parsed_data['has_butterknife']:
+                continue
+
+            start = time.perf_counter()
+            transformed_content = pipeline.transform(parsed_data, content)
+            seconds['transform'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            final_content = pipeline.inject(transformed_content, parsed_data)
+            seconds['inject'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            if migrator.writer.write_file(file_path, final_content):
+                migrated += 1
+            seconds['write'] += time.perf_counter() - start
+
+    return {'seconds': seconds, 'scanned': len(java_files), 'migrated': migrated}
+
+
+def time_migrate(project_path: str, backup: bool) -> float:
+    """执行完整的 migrate()，返回端到端耗时"""
+    migrator = ButterKnifeMigrator(create_config(project_path, backup))
+    with quiet_output():
+        start = time.perf_counter()
+        migrator.migrate()
+        return time.perf_counter() - start
+
+
+def run(generator: AndroidProjectGenerator, repeat: int = 3, backup: bool = False) -> Dict[str, Any]:
+    """
+    执行基准测试，返回结果字典
+    每次重复都重新生成项目（写入阶段会修改文件），各阶段取最快一次
+    """
+    best = dict.fromkeys(STAGES)
+    best_migrate = None
+    project = None
+    counts = None
+
+    for _ in range(repeat):
+        for measure in ('stages', 'migrate'):
+            project_path = tempfile.mkdtemp(prefix="bench_migration_")
+            try:
+                project = generator.generate(project_path)
+                if measure == 'stages':
+                    timing = time_stages(project_path, backup)
+                    counts = timing
+                    for stage in STAGES:
+                        elapsed = timing['seconds'][stage]
+                        best[stage] = elapsed if best[stage] is None else min(best[stage], elapsed)
+                else:
+                    elapsed = time_migrate(project_path, backup)
+                    best_migrate = elapsed if best_migrate is None else min(best_migrate, elapsed)
+            finally:
+                shutil.rmtree(project_path, ignore_errors=True)
+
+    stages = {}
+    for stage in STAGES:
+        files = counts['scanned'] if stage in ('scan', 'parse') else counts['migrated']
+        stages[stage] = {
+            'seconds': round(best[stage], 6),
+            'files': files,
+            'files_per_second': round(files / best[stage], 1) if best[stage] else None
+        }
+
+    return {
+        'benchmark': 'migration',
+        'tool_version': TOOL_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'backup': backup,
+        'generator': generator.get_settings(),
+        'project': project,
+        'files_scanned': counts['scanned'],
+        'files_migrated': counts['migrated'],
+        'stages': stages,
+        'stages_total_seconds': round(sum(best.values()), 6),
+        'migrate_seconds': round(best_migrate, 6),
+        'mb_per_second': round(project['total_bytes'] / best_migrate / (1024 * 1024), 2)
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    对比两次基准测试结果
+
+    Returns:
+        各阶段及端到端耗时的 (基线秒数, 当前秒数, 当前/基线比值)
+    """
+    comparison = {}
+    names = list(STAGES) + ['migrate']
+    for name in names:
+        if name == 'migrate':
+            old = baseline.get('migrate_seconds')
+            new = current.get('migrate_seconds')
+        else:
+            old = baseline.get('stages', {}).get(name, {}).get('seconds')
+            new = current.get('stages', {}).get(name, {}).get('seconds')
+
+        if old is None or new is None:
+            continue
+
+        comparison[name] = {
+            'baseline_seconds': old,
+            'current_seconds': new,
+            'ratio': round(new / old, 3) if old else None
+        }
+
+    return comparison
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='迁移流程分阶段基准测试')
+    parser.add_argument('--activities', type=int, default=40, help='Activity数量')
+    parser.add_argument('--fragments', type=int, default=20, help='Fragment数量')
+    parser.add_argument('--adapters', type=int, default=20, help='带ViewHolder内部类的Adapter数量')
+    parser.add_argument('--plain', type=int, default=120, help='不含ButterKnife的普通类数量')
+    parser.add_argument('--views', type=int, default=6, help='每个类的@BindView字段数')
+    parser.add_argument('--clicks', type=int, default=3, help='每个Activity/Fragment的@OnClick方法数')
+    parser.add_argument('--ids-per-click', type=int, default=3, help='多ID @OnClick({...}) 方法的ID数')
+    parser.add_argument('--sizes', default=','.join(f"{w}:{s}" for w, s in DEFAULT_SIZE_DISTRIBUTION),
+                        help='文件大小分布，格式为 权重:大小KB，逗号分隔')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数（取最快一次）')
+    parser.add_argument('--backup', action='store_true', help='写入阶段同时创建备份')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    parser.add_argument('--compare', help='与之前保存的JSON结果对比')
+    args = parser.parse_args()
+
+    generator = AndroidProjectGenerator(
+        activities=args.activities,
+        fragments=args.fragments,
+        adapters=args.adapters,
+        plain=args.plain,
+        views_per_class=args.views,
+        clicks_per_class=args.clicks,
+        ids_per_click=args.ids_per_click,
+        size_distribution=parse_size_distribution(args.sizes),
+        seed=args.seed
+    )
+    report = run(generator, args.repeat, args.backup)
+
+    print("=" * 50)
+    print("迁移流程分阶段基准测试")
+    print("=" * 50)
+    print(f"文件数: {report['project']['files']}，总大小: {report['project']['total_bytes'] / (1024 * 1024):.1f} MB，"
+          f"迁移 {report['files_migrated']} 个文件")
+    for stage, result in report['stages'].items():
+        print(f"{stage:>10}: {result['seconds']:.3f}s  {result['files']} 个文件")
+    print(f"{'migrate':>10}: {report['migrate_seconds']:.3f}s  {report['mb_per_second']} MB/秒")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare_reports(baseline, report)
+        print("-" * 50)
+        print(f"与 {args.compare} 对比（当前/基线）:")
+        for name, result in report['comparison'].items():
+            print(f"{name:>10}: {result['baseline_seconds']:.3f}s -> {result['current_seconds']:.3f}s  "
+                  f"x{result['ratio']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析结果记录基准测试
+在合成Android项目上比较两种解析结果表示：
+- records: ParseResult / BindView / OnClickBinding / ClassInfo（__slots__数据类）
+- dicts: 等价的嵌套字典（ParseResult.to_dict()，即原来的表示）
+比较常驻内存、pickle大小（传给工作进程的数据量）和pickle往返耗时
+
+使用方式:
+    python -m benchmarks.bench_parse_records --activities 200 --fragments 100 --adapters 100
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+from benchmarks.bench_parser import load_sources
+from benchmarks.project_generator import (
+    AndroidProjectGenerator, DEFAULT_SIZE_DISTRIBUTION, parse_size_distribution
+)
+
+
+def measure_memory(build: Callable[[], List[Any]]) -> int:
+    """构造结果列表期间新分配并保留的字节数"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = build()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del results
+    return retained
+
+
+def measure_pickle(results: List[Any], repeat: int) -> Dict[str, Any]:
+    """pickle大小和最快一次的往返耗时"""
+    best = None
+    payload = b''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(payload)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {'pickle_bytes': len(payload), 'pickle_round_trip_seconds': round(best, 6)}
+
+
+def run(generator: AndroidProjectGenerator, repeat: int) -> Dict[str, Any]:
+    """执行基准测试，返回结果字典"""
+    project_path = tempfile.mkdtemp(prefix="bench_parse_records_")
+    try:
+        project = generator.generate(project_path)
+        sources = load_sources(project_path)
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+
+    records = [ButterKnifeParser().parse(source) for source in sources]
+    # 字符串在两种表示之间共享，只比较容器本身的开销
+    representations = {
+        'records': lambda: [type(record).from_compact(record.to_compact()) for record in records],
+        'dicts': lambda: [record.to_dict() for record in records]
+    }
+
+    report = {}
+    for name, build in representations.items():
+        results = build()
+        report[name] = {'retained_bytes': measure_memory(build), **measure_pickle(results, repeat)}
+
+    return {
+        'benchmark': 'parse_records',
+        'repeat': repeat,
+        'generator': generator.get_settings(),
+        'project': project,
+        'files_parsed': len(sources),
+        'representations': report,
+        'memory_ratio': round(report['dicts']['retained_bytes'] / report['records']['retained_bytes'], 2),
+        'pickle_ratio': round(report['dicts']['pickle_bytes'] / report['records']['pickle_bytes'], 2)
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='解析结果记录（records / dicts）基准测试')
+    parser.add_argument('--activities', type=int, default=40, help='Activity数量')
+    parser.add_argument('--fragments', type=int, default=20, help='Fragment数量')
+    parser.add_argument('--adapters', type=int, default=20, help='带ViewHolder内部类的Adapter数量')
+    parser.add_argument('--views', type=int, default=6, help='每个类的@BindView字段数')
+    parser.add_argument('--clicks', type=int, default=3, help='每个Activity/Fragment的@OnClick方法数')
+    parser.add_argument('--sizes', default=','.join(f"{w}:{s}" for w, s in DEFAULT_SIZE_DISTRIBUTION),
+                        help='文件大小分布，格式为 权重:大小KB，逗号分隔')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数（取最快一次）')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    generator = AndroidProjectGenerator(
+        activities=args.activities, fragments=args.fragments, adapters=args.adapters, plain=0,
+        views_per_class=args.views, clicks_per_class=args.clicks,
+        size_distribution=parse_size_distribution(args.sizes), seed=args.seed
+    )
+    report = run(generator, args.repeat)
+
+    print("=" * 50)
+    print("解析结果记录基准测试")
+    print("=" * 50)
+    print(f"文件数: {report['files_parsed']}")
+    for name, result in report['representations'].items():
+        print(f"{name:>8}: 内存 {result['retained_bytes'] / 1024:.1f} KB  "
+              f"pickle {result['pickle_bytes'] / 1024:.1f} KB  "
+              f"往返 {result['pickle_round_trip_seconds'] * 1000:.2f} ms")
+    print(f"内存节省: {report['memory_ratio']}x，pickle大小: {report['pickle_ratio']}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
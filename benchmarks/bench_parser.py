@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析器基准测试
+在合成Android项目上比较两种解析方式：
+- multi: 每类信息（@BindView、@OnClick、@OnLongClick、bind调用、import、类、方法）各扫描一遍全文
+- single: 一个组合正则在屏蔽注释和字符串后的文本上一次扫描收集全部信息
+同时核对两种方式的注解解析结果是否一致
+
+使用方式:
+    python -m benchmarks.bench_parser --activities 200 --fragments 100 --adapters 100
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser, PARSER_MODES
+from scanner.prefilter import has_butterknife_signature
+from utils.java_lexer import tokenize_java, mask_java
+from benchmarks.project_generator import (
+    AndroidProjectGenerator, DEFAULT_SIZE_DISTRIBUTION, parse_size_distribution
+)
+
+
+# 两种方式必须完全一致的字段（类和方法信息在single方式下不再包含注释中的内容）
+ANNOTATION_FIELDS = ('has_butterknife', 'bind_views', 'on_clicks', 'on_long_clicks', 'bind_call', 'imports')
+
+
+def load_sources(project_path: str) -> List[str]:
+    """读取项目中所有包含ButterKnife的Java文件"""
+    sources = []
+    for directory, _, names in os.walk(project_path):
+        for name in sorted(names):
+            if not name.endswith('.java'):
+                continue
+            with open(os.path.join(directory, name), 'rb') as f:
+                data = f.read()
+            if has_butterknife_signature(data):
+                sources.append(data.decode('utf-8'))
+    return sources
+
+
+def time_mode(sources: List[str], mode: str, repeat: int) -> Dict[str, Any]:
+    """解析所有文件，返回最快一次的耗时和解析结果"""
+    parser = ButterKnifeParser(mode)
+    best = None
+    results = None
+    for _ in range(repeat):
+        # 清空词法分析和屏蔽缓存，每次都从原始文本开始
+        tokenize_java.cache_clear()
+        mask_java.cache_clear()
+        start = time.perf_counter()
+        results = [parser.parse(source) for source in sources]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {'seconds': best, 'results': results}
+
+
+def run(generator: AndroidProjectGenerator, repeat: int) -> Dict[str, Any]:
+    """执行基准测试，返回结果字典"""
+    project_path = tempfile.mkdtemp(prefix="bench_parser_")
+    try:
+        project = generator.generate(project_path)
+        sources = load_sources(project_path)
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+
+    total_bytes = sum(len(source.encode('utf-8')) for source in sources)
+    timed = {mode: time_mode(sources, mode, repeat) for mode in PARSER_MODES}
+
+    modes = {}
+    for mode, result in timed.items():
+        seconds = result['seconds']
+        modes[mode] = {
+            'seconds': round(seconds, 6),
+            'files_per_second': round(len(sources) / seconds, 1) if seconds else None,
+            'mb_per_second': round(total_bytes / seconds / (1024 * 1024), 2) if seconds else None
+        }
+
+    multi_results = timed['multi']['results']
+    single_results = timed['single']['results']
+    annotation_mismatches = sum(
+        1 for multi, single in zip(multi_results, single_results)
+        if any(multi[field] != single[field] for field in ANNOTATION_FIELDS)
+    )
+    structure_mismatches = sum(
+        1 for multi, single in zip(multi_results, single_results)
+        if multi['class_info'] != single['class_info'] or multi['methods'] != single['methods']
+    )
+
+    return {
+        'benchmark': 'parser',
+        'repeat': repeat,
+        'generator': generator.get_settings(),
+        'project': project,
+        'files_parsed': len(sources),
+        'total_bytes': total_bytes,
+        'modes': modes,
+        'speedup': round(timed['multi']['seconds'] / timed['single']['seconds'], 2),
+        'annotation_mismatches': annotation_mismatches,
+        'structure_mismatches': structure_mismatches
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='解析器（multi / single）基准测试')
+    parser.add_argument('--activities', type=int, default=40, help='Activity数量')
+    parser.add_argument('--fragments', type=int, default=20, help='Fragment数量')
+    parser.add_argument('--adapters', type=int, default=20, help='带ViewHolder内部类的Adapter数量')
+    parser.add_argument('--views', type=int, default=6, help='每个类的@BindView字段数')
+    parser.add_argument('--clicks', type=int, default=3, help='每个Activity/Fragment的@OnClick方法数')
+    parser.add_argument('--sizes', default=','.join(f"{w}:{s}" for w, s in DEFAULT_SIZE_DISTRIBUTION),
+                        help='文件大小分布，格式为 权重:大小KB，逗号分隔')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数（取最快一次）')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    generator = AndroidProjectGenerator(
+        activities=args.activities, fragments=args.fragments, adapters=args.adapters, plain=0,
+        views_per_class=args.views, clicks_per_class=args.clicks,
+        size_distribution=parse_size_distribution(args.sizes), seed=args.seed
+    )
+    report = run(generator, args.repeat)
+
+    print("=" * 50)
+    print("解析器基准测试")
+    print("=" * 50)
+    print(f"文件数: {report['files_parsed']}，总大小: {report['total_bytes'] / (1024 * 1024):.1f} MB")
+    for mode, result in report['modes'].items():
+        print(f"{mode:>8}: {result['seconds']:.3f}s  "
+              f"{result['files_per_second']:.0f} 文件/秒  {result['mb_per_second']:.2f} MB/秒")
+    print(f"加速比: {report['speedup']}x")
+    print(f"注解结果不一致的文件: {report['annotation_mismatches']}，"
+          f"类/方法信息不一致的文件: {report['structure_mismatches']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字节级预过滤器基准测试
+比较 mmap/字节预过滤 与 完整解码 + 注解检测 的吞吐量
+
+使用方式:
+    python -m benchmarks.bench_prefilter --files 2000 --hit-ratio 0.1
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+from scanner.prefilter import file_has_butterknife_signature
+
+
+PLAIN_TEMPLATE = '''package com.example.bench;
+
+import android.os.Bundle;
+import android.widget.TextView;
+
+public class Plain{index} extends BaseActivity {{
+    private TextView title;
+{body}
+}}
+'''
+
+BUTTERKNIFE_TEMPLATE = '''package com.example.bench;
+
+import android.os.Bundle;
+import android.widget.TextView;
+import butterknife.BindView;
+import butterknife.ButterKnife;
+
+public class Bound{index} extends BaseActivity {{
+    @BindView(R.id.title)
+    TextView title;
+{body}
+}}
+'''
+
+METHOD_TEMPLATE = '''
+    private void method{index}() {{
+        // 普通方法，用于填充文件大小
+        title.setText("value {index}");
+    }}
+'''
+
+
+def create_corpus(directory: str, file_count: int, hit_ratio: float, size_kb: int) -> int:
+    """生成测试文件，返回总字节数"""
+    methods = []
+    length = 0
+    while length < size_kb * 1024:
+        method = METHOD_TEMPLATE.format(index=len(methods))
+        methods.append(method)
+        length += len(method)
+    body = ''.join(methods)
+
+    hit_every = int(round(1 / hit_ratio)) if hit_ratio > 0 else 0
+    total_bytes = 0
+    for index in range(file_count):
+        is_hit = hit_every and index % hit_every == 0
+        template = BUTTERKNIFE_TEMPLATE if is_hit else PLAIN_TEMPLATE
+        data = template.format(index=index, body=body).encode('utf-8')
+        with open(os.path.join(directory, f"File{index}.java"), 'wb') as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    return total_bytes
+
+
+def bench_prefilter(paths: list) -> tuple:
+    """字节级预过滤"""
+    start = time.perf_counter()
+    hits = sum(1 for path in paths if file_has_butterknife_signature(path))
+    return hits, time.perf_counter() - start
+
+
+def bench_decode(paths: list) -> tuple:
+    """完整解码后检测注解（原有方式）"""
+    parser = ButterKnifeParser()
+    start = time.perf_counter()
+    hits = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if parser._has_butterknife_annotations(content):
+            hits += 1
+    return hits, time.perf_counter() - start
+
+
+def run(file_count: int, hit_ratio: float, size_kb: int, repeat: int) -> dict:
+    """执行基准测试，返回结果字典"""
+    directory = tempfile.mkdtemp(prefix="bench_prefilter_")
+    try:
+        total_bytes = create_corpus(directory, file_count, hit_ratio, size_kb)
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+        results = {}
+        for name, function in (('prefilter', bench_prefilter), ('decode', bench_decode)):
+            best = None
+            for _ in range(repeat):
+                hits, elapsed = function(paths)
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = {
+                'hits': hits,
+                'seconds': round(best, 6),
+                'files_per_second': round(file_count / best, 1),
+                'mb_per_second': round(total_bytes / best / (1024 * 1024), 1)
+            }
+
+        assert results['prefilter']['hits'] == results['decode']['hits'], "预过滤结果与完整检测不一致"
+
+        return {
+            'files': file_count,
+            'total_bytes': total_bytes,
+            'hit_ratio': hit_ratio,
+            'results': results,
+            'speedup': round(results['decode']['seconds'] / results['prefilter']['seconds'], 2)
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='字节级预过滤器基准测试')
+    parser.add_argument('--files', type=int, default=2000, help='测试文件数')
+    parser.add_argument('--hit-ratio', type=float, default=0.1, help='包含ButterKnife的文件比例')
+    parser.add_argument('--size-kb', type=int, default=16, help='每个文件的大约大小(KB)')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数（取最快一次）')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    report = run(args.files, args.hit_ratio, args.size_kb, args.repeat)
+
+    print("=" * 50)
+    print("字节级预过滤器基准测试")
+    print("=" * 50)
+    print(f"文件数: {report['files']}，总大小: {report['total_bytes'] / (1024 * 1024):.1f} MB")
+    for name, result in report['results'].items():
+        print(f"{name:>10}: {result['seconds']:.3f}s  "
+              f"{result['files_per_second']:.0f} 文件/秒  {result['mb_per_second']:.1f} MB/秒  "
+              f"命中 {result['hits']}")
+    print(f"加速比: {report['speedup']}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
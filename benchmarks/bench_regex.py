@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+正则表达式回溯基准测试
+在病态输入语料上逐个计时解析器、转换器、注入器和格式化器中编译好的正则，
+并让嵌入了病态输入的完整Activity走一遍 解析 → 转换 → 注入 流程
+输入大小翻倍时耗时也应大致翻倍，增长比明显超过2说明存在超线性回溯
+
+使用方式:
+    python -m benchmarks.bench_regex --size-kb 64 --top 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser, PARSER_MODES
+from transformer.findview_transformer import FindViewTransformer
+from transformer.onclick_transformer import OnClickTransformer
+from transformer.bindcall_remover import BindCallRemover
+from injector.code_injector import CodeInjector
+from utils.code_formatter import CodeFormatter
+from utils.java_lexer import tokenize_java, mask_java
+from utils.pattern_registry import compiled_patterns
+from pipeline.file_pipeline import FilePipeline
+from benchmarks.pathological_corpus import PATHOLOGICAL_INPUTS, build_input, build_source
+
+
+# 单个正则在一个病态输入上的耗时预算（秒）
+PATTERN_BUDGET_SECONDS = 0.25
+# 一个嵌入病态输入的文件走完整流程的耗时预算（秒）
+SOURCE_BUDGET_SECONDS = 2.0
+
+# 持有编译正则的组件：名称 -> 构造函数
+PATTERN_OWNERS: Dict[str, Callable[[], Any]] = {
+    'ButterKnifeParser': ButterKnifeParser,
+    'ButterKnifeParser(single)': lambda: ButterKnifeParser('single'),
+    'FindViewTransformer': FindViewTransformer,
+    'OnClickTransformer': OnClickTransformer,
+    'BindCallRemover': BindCallRemover,
+    'CodeInjector': CodeInjector,
+    'CodeFormatter': CodeFormatter
+}
+
+
+def collect_patterns() -> List[Tuple[str, Any]]:
+    """收集所有组件上编译好的正则，返回 (组件.属性, 正则) 列表"""
+    patterns = []
+    for owner_name, factory in PATTERN_OWNERS.items():
+        for attribute, value in sorted(compiled_patterns(factory()).items()):
+            patterns.append((f"{owner_name}.{attribute}", value))
+    return patterns
+
+
+def time_pattern(pattern, text: str) -> float:
+    """用finditer扫描全文的耗时"""
+    start = time.perf_counter()
+    for _ in pattern.finditer(text):
+        pass
+    return time.perf_counter() - start
+
+
+def time_source(pipeline: FilePipeline, source: str) -> float:
+    """一个文件解析、转换、注入的耗时（不使用词法分析和屏蔽缓存）"""
+    tokenize_java.cache_clear()
+    mask_java.cache_clear()
+    start = time.perf_counter()
+    parsed_data = pipeline.parse(source)
+    content = pipeline.transform(parsed_data, source)
+    pipeline.inject(content, parsed_data)
+    return time.perf_counter() - start
+
+
+def time_patterns(size: int) -> List[Dict[str, Any]]:
+    """每个正则在每个病态输入上的耗时，按耗时从高到低排序"""
+    inputs = {name: build_input(name, size) for name in PATHOLOGICAL_INPUTS}
+    rows = []
+    for pattern_name, pattern in collect_patterns():
+        for input_name, text in inputs.items():
+            rows.append({'pattern': pattern_name, 'input': input_name, 'seconds': time_pattern(pattern, text)})
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+
+def time_sources(size: int) -> List[Dict[str, Any]]:
+    """每种解析方式下每个病态文件走完整流程的耗时，按耗时从高到低排序"""
+    rows = []
+    for mode in PARSER_MODES:
+        config = Config()
+        config.PARSER_MODE = mode
+        pipeline = FilePipeline(config)
+        for input_name in PATHOLOGICAL_INPUTS:
+            rows.append({'mode': mode, 'input': input_name,
+                         'seconds': time_source(pipeline, build_source(input_name, size))})
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+
+def run(size: int, top: int) -> Dict[str, Any]:
+    """执行基准测试，返回结果字典"""
+    patterns = time_patterns(size)
+    sources = time_sources(size)
+
+    # 最慢的几项在两倍大小的输入上重测，计算增长比
+    pattern_lookup = dict(collect_patterns())
+    for row in patterns[:top]:
+        doubled = time_pattern(pattern_lookup[row['pattern']], build_input(row['input'], size * 2))
+        row['growth'] = round(doubled / row['seconds'], 2) if row['seconds'] else None
+    for row in sources[:top]:
+        config = Config()
+        config.PARSER_MODE = row['mode']
+        doubled = time_source(FilePipeline(config), build_source(row['input'], size * 2))
+        row['growth'] = round(doubled / row['seconds'], 2) if row['seconds'] else None
+
+    return {
+        'benchmark': 'regex',
+        'size': size,
+        'inputs': len(PATHOLOGICAL_INPUTS),
+        'patterns_checked': len(pattern_lookup),
+        'pattern_budget_seconds': PATTERN_BUDGET_SECONDS,
+        'source_budget_seconds': SOURCE_BUDGET_SECONDS,
+        'slowest_patterns': patterns[:top],
+        'slowest_sources': sources[:top],
+        'patterns_over_budget': sum(1 for row in patterns if row['seconds'] > PATTERN_BUDGET_SECONDS),
+        'sources_over_budget': sum(1 for row in sources if row['seconds'] > SOURCE_BUDGET_SECONDS)
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='正则表达式回溯基准测试（病态输入语料）')
+    parser.add_argument('--size-kb', type=int, default=32, help='每个病态输入的大小(KB)')
+    parser.add_argument('--top', type=int, default=10, help='显示最慢的项数')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    report = run(args.size_kb * 1024, args.top)
+
+    print("=" * 50)
+    print("正则表达式回溯基准测试")
+    print("=" * 50)
+    print(f"病态输入: {report['inputs']} 种，每种 {args.size_kb} KB，正则: {report['patterns_checked']} 个")
+    print(f"最慢的正则（预算 {PATTERN_BUDGET_SECONDS}s，增长比为输入翻倍后的耗时倍数）:")
+    for row in report['slowest_patterns']:
+        print(f"  {row['seconds']:.4f}s  x{row['growth']}  {row['pattern']}  [{row['input']}]")
+    print(f"最慢的文件（预算 {SOURCE_BUDGET_SECONDS}s）:")
+    for row in report['slowest_sources']:
+        print(f"  {row['seconds']:.4f}s  x{row['growth']}  {row['mode']}  [{row['input']}]")
+    print(f"超出预算: 正则 {report['patterns_over_budget']} 项，文件 {report['sources_over_budget']} 项")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
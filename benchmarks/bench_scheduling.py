@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行调度基准测试
+在文件大小严重偏斜的合成项目上比较按扫描顺序分发（fifo）与最长处理时间优先（lpt）的完成时间（makespan）
+
+- 模拟：先串行测出每个文件的实际处理耗时，再模拟按不同顺序分发给N个工作进程的完成时间
+  （lpt-size 只用文件大小估算，lpt-history 使用上次运行的耗时）
+- 实测：分别以 fifo / lpt 并行迁移同一个项目的副本，取最快一次的墙钟时间
+
+使用方式:
+    python -m benchmarks.bench_scheduling --jobs 4 --plain 400 --sizes 97:2,3:256
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, Any
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import ButterKnifeMigrator
+from pipeline.file_pipeline import FilePipeline
+from pipeline.scheduler import estimate_costs, simulate_makespan
+from cache.cost_history import CostHistory
+from benchmarks.bench_migration import create_config, quiet_output
+from benchmarks.project_generator import AndroidProjectGenerator, parse_size_distribution
+
+
+def measure_costs(project_path: str) -> Dict[str, Any]:
+    """串行处理每个文件，返回扫描顺序的任务和各文件处理耗时（秒）"""
+    migrator = ButterKnifeMigrator(create_config(project_path, False))
+    pipeline = FilePipeline(migrator.config)
+    java_files = migrator.scanner.scan_files()
+
+    seconds = []
+    for file_path in java_files:
+        start = time.perf_counter()
+        pipeline.process_file(file_path)
+        seconds.append(time.perf_counter() - start)
+
+    return {'files': java_files, 'seconds': seconds}
+
+
+def simulate(project_path: str, measured: Dict[str, Any], jobs: int) -> Dict[str, Any]:
+    """模拟不同分发顺序的完成时间"""
+    files = measured['files']
+    seconds = measured['seconds']
+    tasks = [(file_path, None) for file_path in files]
+
+    # 以实测耗时作为“上次运行”的历史
+    history_dir = tempfile.mkdtemp(prefix="bench_scheduling_history_")
+    try:
+        history = CostHistory(history_dir)
+        for file_path, elapsed in zip(files, seconds):
+            history.record(os.path.relpath(file_path, project_path), os.path.getsize(file_path), elapsed)
+        history.save()
+        orders = {
+            'fifo': list(range(len(files))),
+            'lpt_size': _order(estimate_costs(tasks, project_path)),
+            'lpt_history': _order(estimate_costs(tasks, project_path, history))
+        }
+    finally:
+        shutil.rmtree(history_dir, ignore_errors=True)
+
+    makespans = {
+        name: round(simulate_makespan([seconds[index] for index in order], jobs), 6)
+        for name, order in orders.items()
+    }
+    lower_bound = max(sum(seconds) / jobs, max(seconds, default=0.0))
+    return {
+        'makespan_seconds': makespans,
+        'lower_bound_seconds': round(lower_bound, 6),
+        'improvement': {
+            name: round(makespans['fifo'] / makespan, 2) if makespan else None
+            for name, makespan in makespans.items() if name != 'fifo'
+        }
+    }
+
+
+def _order(costs) -> list:
+    """按成本从大到小的任务下标"""
+    return sorted(range(len(costs)), key=lambda index: -costs[index])
+
+
+def measure_parallel(generator: AndroidProjectGenerator, jobs: int, schedule: str, repeat: int) -> float:
+    """在新生成的项目副本上并行迁移，返回最快一次的墙钟时间"""
+    best = None
+    for _ in range(repeat):
+        project_path = tempfile.mkdtemp(prefix="bench_scheduling_")
+        try:
+            generator.generate(project_path)
+            config = create_config(project_path, False)
+            config.JOBS = jobs
+            config.SCHEDULE = schedule
+            with quiet_output():
+                start = time.perf_counter()
+                ButterKnifeMigrator(config).migrate()
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        finally:
+            shutil.rmtree(project_path, ignore_errors=True)
+    return round(best, 6)
+
+
+def run(generator: AndroidProjectGenerator, jobs: int, repeat: int = 1, measure: bool = True) -> Dict[str, Any]:
+    """执行基准测试，返回结果字典"""
+    project_path = tempfile.mkdtemp(prefix="bench_scheduling_")
+    try:
+        stats = generator.generate(project_path)
+        with quiet_output():
+            measured = measure_costs(project_path)
+        simulation = simulate(project_path, measured, jobs)
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+
+    report = {
+        'benchmark': 'scheduling',
+        'jobs': jobs,
+        'generator': generator.get_settings(),
+        'project': stats,
+        'largest_file_seconds': round(max(measured['seconds'], default=0.0), 6),
+        'total_file_seconds': round(sum(measured['seconds']), 6),
+        'simulated': simulation
+    }
+
+    if measure:
+        wall = {schedule: measure_parallel(generator, jobs, schedule, repeat) for schedule in ('fifo', 'lpt')}
+        report['measured'] = {
+            'wall_seconds': wall,
+            'improvement': round(wall['fifo'] / wall['lpt'], 2) if wall['lpt'] else None
+        }
+
+    return report
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='并行调度（fifo / lpt）基准测试')
+    parser.add_argument('--jobs', type=int, default=4, help='工作进程数')
+    parser.add_argument('--activities', type=int, default=20, help='Activity数')
+    parser.add_argument('--fragments', type=int, default=10, help='Fragment数')
+    parser.add_argument('--adapters', type=int, default=20, help='Adapter数')
+    parser.add_argument('--plain', type=int, default=400, help='不含ButterKnife的类数')
+    parser.add_argument('--sizes', default='97:2,3:256', help='文件大小分布（权重:大小KB）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--repeat', type=int, default=1, help='实测重复次数（取最快一次）')
+    parser.add_argument('--simulate-only', action='store_true', help='只模拟，不实测并行迁移')
+    parser.add_argument('--json', help='将结果保存为JSON文件')
+    args = parser.parse_args()
+
+    generator = AndroidProjectGenerator(
+        activities=args.activities, fragments=args.fragments, adapters=args.adapters, plain=args.plain,
+        size_distribution=parse_size_distribution(args.sizes), seed=args.seed
+    )
+    report = run(generator, args.jobs, args.repeat, not args.simulate_only)
+
+    simulated = report['simulated']
+    print("=" * 50)
+    print(f"并行调度基准测试（{args.jobs} 个工作进程）")
+    print("=" * 50)
+    print(f"文件数: {report['project']['files']}，最大文件耗时 {report['largest_file_seconds']:.4f}s，"
+          f"总耗时 {report['total_file_seconds']:.4f}s")
+    print(f"理论下界: {simulated['lower_bound_seconds']:.4f}s")
+    for name, makespan in simulated['makespan_seconds'].items():
+        improvement = simulated['improvement'].get(name)
+        suffix = f"  ({improvement}x)" if improvement else ""
+        print(f"  模拟 {name:>11}: {makespan:.4f}s{suffix}")
+    if 'measured' in report:
+        for schedule, seconds in report['measured']['wall_seconds'].items():
+            print(f"  实测 {schedule:>11}: {seconds:.4f}s")
+        print(f"  实测提升: {report['measured']['improvement']}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
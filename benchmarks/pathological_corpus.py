@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+病态输入语料
+针对解析器、转换器、注入器中正则表达式的回溯弱点构造的Java文本：
+超长空白、未闭合的括号和注解、重复的方法签名、没有类体的类声明等
+每种输入按给定大小重复一个片段生成，用于检查正则匹配耗时是否随文件大小线性增长
+"""
+
+from typing import Callable, Dict, Iterator, Tuple
+
+
+def _repeat(unit: str, prefix: str = '', suffix: str = '') -> Callable[[int], str]:
+    """生成器：prefix + 重复unit直到约size个字符 + suffix"""
+    def build(size: int) -> str:
+        return prefix + unit * max(1, size // len(unit)) + suffix
+    return build
+
+
+# 输入名称 -> 生成函数(size) -> 文本
+PATHOLOGICAL_INPUTS: Dict[str, Callable[[int], str]] = {
+    # 空白
+    'space_run': _repeat(' ', suffix='x'),
+    'tab_run': _repeat('\t', suffix='x'),
+    'blank_lines': _repeat('\n', suffix='x'),
+    'indented_lines': _repeat('\n    ', suffix='x'),
+    'space_before_brace': _repeat(' ', suffix='}x'),
+    'braces_with_spaces': _repeat('}    '),
+    # 单词和标识符
+    'long_identifier': _repeat('a', suffix=' '),
+    'word_run': _repeat('a '),
+    'word_lines': _repeat('a\n'),
+    'declaration_run': _repeat('int a '),
+    # 未闭合的括号
+    'open_parens': _repeat('('),
+    'unclosed_calls': _repeat('a b('),
+    'unclosed_signatures': _repeat('void f(int a '),
+    'unclosed_oncreate': _repeat('protected void onCreate('),
+    'unclosed_onviewcreated': _repeat('@Override\npublic void onViewCreated('),
+    'unclosed_override_methods': _repeat('@Override\nprotected void onPause('),
+    'unclosed_setcontentview': _repeat('setContentView('),
+    'unclosed_super': _repeat('super('),
+    'unclosed_constructors': _repeat('public A(View v '),
+    # 注解
+    'unclosed_onclick': _repeat('@OnClick('),
+    'unclosed_onlongclick': _repeat('@OnLongClick('),
+    'unclosed_bindview': _repeat('@BindView('),
+    'onclick_without_body': _repeat('@OnClick(R.id.a) void f('),
+    'onclick_id_list': _repeat('R.id.a, ', prefix='@OnClick({'),
+    'bindview_then_words': _repeat('T ', prefix='@BindView(R.id.a) '),
+    'override_spaces': _repeat(' ', prefix='@Override', suffix='x'),
+    'override_blank_lines': _repeat('\n', prefix='@Override', suffix='x'),
+    'override_run': _repeat('@Override\n'),
+    # 类声明和调用
+    'class_without_body': _repeat('class A implements B '),
+    'implements_list': _repeat('B, ', prefix='class A implements '),
+    'implements_run': _repeat('implements '),
+    'bind_call_spaces': _repeat(' ', suffix='ButterKnife.bind(that);'),
+    'unclosed_bind_calls': _repeat('ButterKnife.bind('),
+    # 注释和字符串
+    'unclosed_block_comment': _repeat('a ', prefix='/*'),
+    'unclosed_string': _repeat('a ', prefix='"'),
+    'comment_run': _repeat('// a\n'),
+}
+
+# 生成可迁移文件时使用的外壳：让输入经过完整的解析 → 转换 → 注入流程
+SOURCE_TEMPLATE = '''package com.example.fuzz;
+
+import android.os.Bundle;
+import android.view.View;
+import android.widget.TextView;
+import butterknife.BindView;
+import butterknife.ButterKnife;
+import butterknife.OnClick;
+
+public class FuzzActivity extends Activity {{
+    @BindView(R.id.title)
+    TextView title;
+
+{body}
+
+    @Override
+    protected void onCreate(Bundle savedInstanceState) {{
+        super.onCreate(savedInstanceState);
+        setContentView(R.layout.activity_fuzz);
+        ButterKnife.bind(this);
+    }}
+
+    @OnClick(R.id.title)
+    public void onTitleClick(View view) {{
+    }}
+}}
+'''
+
+
+def build_input(name: str, size: int) -> str:
+    """生成大约size个字符的病态输入"""
+    return PATHOLOGICAL_INPUTS[name](size)
+
+
+def build_source(name: str, size: int) -> str:
+    """把病态输入嵌入一个完整的ButterKnife Activity中"""
+    return SOURCE_TEMPLATE.format(body=build_input(name, size))
+
+
+def iter_corpus(size: int) -> Iterator[Tuple[str, str]]:
+    """按名称产出所有病态输入"""
+    for name in PATHOLOGICAL_INPUTS:
+        yield name, build_input(name, size)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成Android项目生成器
+按给定数量生成 Activity、Fragment、带 ViewHolder 内部类的 Adapter 以及不含ButterKnife的普通类，
+包含 @BindView 字段、@OnClick({...}) 多ID方法，文件大小按权重分布随机抽取
+相同参数和随机种子生成的项目逐字节相同，便于在不同版本之间比较基准测试结果
+"""
+
+import os
+import random
+from typing import Dict, Any, List, Tuple
+
+
+# 源码根目录（相对于项目根目录），与默认扫描目录一致
+SOURCE_ROOT = os.path.join("app", "src", "main", "java")
+PACKAGE = "com.example.bench"
+
+# 默认文件大小分布: (权重, 大约大小KB)
+DEFAULT_SIZE_DISTRIBUTION = ((70, 2), (25, 16), (5, 96))
+
+VIEW_TYPES = ('TextView', 'Button', 'ImageView', 'EditText', 'RecyclerView', 'View')
+
+HEADER_TEMPLATE = '''package {package};
+
+import android.os.Bundle;
+import android.view.LayoutInflater;
+import android.view.View;
+import android.view.ViewGroup;
+import android.widget.Button;
+import android.widget.EditText;
+import android.widget.ImageView;
+import android.widget.TextView;
+import androidx.recyclerview.widget.RecyclerView;
+{imports}
+'''
+
+BUTTERKNIFE_IMPORTS = '''import butterknife.BindView;
+import butterknife.ButterKnife;
+import butterknife.OnClick;
+'''
+
+ACTIVITY_TEMPLATE = '''public class {name} extends AppCompatActivity {{
+{fields}
+    private String mTitle = "{name} {{ title }}";
+
+    @Override
+    protected void onCreate(Bundle savedInstanceState) {{
+        super.onCreate(savedInstanceState);
+        setContentView(R.layout.{layout});
+        ButterKnife.bind(this);
+        if (savedInstanceState != null) {{
+            mTitle = savedInstanceState.getString("title");
+        }}
+    }}
+{clicks}{filler}}}
+'''
+
+FRAGMENT_TEMPLATE = '''public class {name} extends Fragment {{
+{fields}
+    @Override
+    public View onCreateView(LayoutInflater inflater, ViewGroup container, Bundle savedInstanceState) {{
+        View view = inflater.inflate(R.layout.{layout}, container, false);
+        ButterKnife.bind(this, view);
+        return view;
+    }}
+{clicks}{filler}}}
+'''
+
+ADAPTER_TEMPLATE = '''public class {name} extends RecyclerView.Adapter<{name}.ViewHolder> {{
+    private final java.util.List<String> mItems = new java.util.ArrayList<>();
+
+    @Override
+    public ViewHolder onCreateViewHolder(ViewGroup parent, int viewType) {{
+        View view = LayoutInflater.from(parent.getContext()).inflate(R.layout.{layout}, parent, false);
+        return new ViewHolder(view);
+    }}
+
+    @Override
+    public void onBindViewHolder(ViewHolder holder, int position) {{
+        holder.{first_field}.setTag(mItems.get(position));
+    }}
+
+    @Override
+    public int getItemCount() {{
+        return mItems.size();
+    }}
+{filler}
+    static class ViewHolder extends RecyclerView.ViewHolder {{
+{fields}
+        ViewHolder(View itemView) {{
+            super(itemView);
+            ButterKnife.bind(this, itemView);
+        }}
+    }}
+}}
+'''
+
+PLAIN_TEMPLATE = '''public class {name} {{
+    private final java.util.Map<String, String> mValues = new java.util.HashMap<>();
+
+    public String get(String key) {{
+        return mValues.get(key);
+    }}
+{filler}}}
+'''
+
+MULTI_CLICK_TEMPLATE = '''
+    @OnClick({{{ids}}})
+    public void onMultiClick{index}(View view) {{
+        switch (view.getId()) {{
+{cases}
+            default:
+                break;
+        }}
+    }}
+'''
+
+SINGLE_CLICK_TEMPLATE = '''
+    @OnClick({view_id})
+    void onClick{index}() {{
+        // 单个ID的点击事件
+        mTitle = "clicked {index}";
+    }}
+'''
+
+FRAGMENT_SINGLE_CLICK_TEMPLATE = '''
+    @OnClick({view_id})
+    void onClick{index}() {{
+        // 单个ID的点击事件
+        getActivity().finish();
+    }}
+'''
+
+FILLER_TEMPLATE = '''
+    /**
+     * 填充方法 {index}，用于控制文件大小
+     */
+    private int compute{index}(int value) {{
+        String label = "value {{" + value + "}} // not a comment";
+        int result = value * {index} + label.length();
+        for (int i = 0; i < {index} % 7 + 1; i++) {{
+            result += i; /* 块注释中的 }} 不是类结束 */
+        }}
+        return result;
+    }}
+'''
+
+
+def parse_size_distribution(text: str) -> Tuple[Tuple[int, int], ...]:
+    """
+    解析文件大小分布字符串
+
+    Args:
+        text: 形如 "70:2,25:16,5:96" 的字符串，每项为 权重:大小KB
+
+    Returns:
+        (权重, 大小KB) 元组
+    """
+    distribution = []
+    for item in text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        weight, size_kb = item.split(':')
+        distribution.append((int(weight), int(size_kb)))
+
+    if not distribution:
+        raise ValueError(f"无效的文件大小分布: {text}")
+    return tuple(distribution)
+
+
+class AndroidProjectGenerator:
+    """合成Android项目生成器类"""
+
+    def __init__(self, activities: int = 40, fragments: int = 20, adapters: int = 20, plain: int = 120,
+                 views_per_class: int = 6, clicks_per_class: int = 3, ids_per_click: int = 3,
+                 size_distribution=DEFAULT_SIZE_DISTRIBUTION, seed: int = 0):
+        self.activities = activities
+        self.fragments = fragments
+        self.adapters = adapters
+        self.plain = plain
+        self.views_per_class = views_per_class
+        self.clicks_per_class = clicks_per_class
+        self.ids_per_click = ids_per_click
+        self.size_distribution = tuple(size_distribution)
+        self.seed = seed
+
+    def get_settings(self) -> Dict[str, Any]:
+        """返回生成参数（写入基准测试结果）"""
+        return {
+            'activities': self.activities,
+            'fragments': self.fragments,
+            'adapters': self.adapters,
+            'plain': self.plain,
+            'views_per_class': self.views_per_class,
+            'clicks_per_class': self.clicks_per_class,
+            'ids_per_click': self.ids_per_click,
+            'size_distribution': [list(item) for item in self.size_distribution],
+            'seed': self.seed
+        }
+
+    def generate(self, project_path: str) -> Dict[str, Any]:
+        """
+        在project_path下生成项目
+
+        Returns:
+            统计信息: 文件数、总字节数、各类文件数以及注解数量
+        """
+        rng = random.Random(self.seed)
+        source_dir = os.path.join(project_path, SOURCE_ROOT, *PACKAGE.split('.'))
+        statistics = {
+            'files': 0,
+            'total_bytes': 0,
+            'butterknife_files': 0,
+            'bind_views': 0,
+            'on_clicks': 0,
+            'by_kind': {}
+        }
+
+        plan = [
+            ('activity', self.activities, self._activity_source),
+            ('fragment', self.fragments, self._fragment_source),
+            ('adapter', self.adapters, self._adapter_source),
+            ('plain', self.plain, self._plain_source)
+        ]
+
+        for kind, count, build_source in plan:
+            kind_dir = os.path.join(source_dir, kind)
+            os.makedirs(kind_dir, exist_ok=True)
+
+            for index in range(count):
+                target_bytes = self._pick_size(rng) * 1024
+                name, source, counts = build_source(index, target_bytes, rng)
+                data = source.encode('utf-8')
+                with open(os.path.join(kind_dir, f"{name}.java"), 'wb') as f:
+                    f.write(data)
+
+                statistics['files'] += 1
+                statistics['total_bytes'] += len(data)
+                statistics['bind_views'] += counts[0]
+                statistics['on_clicks'] += counts[1]
+                if kind != 'plain':
+                    statistics['butterknife_files'] += 1
+            statistics['by_kind'][kind] = count
+
+        return statistics
+
+    def _pick_size(self, rng: random.Random) -> int:
+        """按权重抽取目标文件大小(KB)"""
+        weights = [weight for weight, _ in self.size_distribution]
+        sizes = [size_kb for _, size_kb in self.size_distribution]
+        return rng.choices(sizes, weights=weights)[0]
+
+    def _header(self, kind: str, butterknife: bool) -> str:
+        """生成包声明和导入语句"""
+        return HEADER_TEMPLATE.format(
+            package=f"{PACKAGE}.{kind}",
+            imports=BUTTERKNIFE_IMPORTS if butterknife else ''
+        )
+
+    def _fields(self, prefix: str, rng: random.Random) -> List[Tuple[str, str, str]]:
+        """生成 (视图ID, 类型, 字段名) 列表"""
+        fields = []
+        for index in range(self.views_per_class):
+            view_type = rng.choice(VIEW_TYPES)
+            fields.append((f"R.id.{prefix}_view_{index}", view_type, f"m{view_type}{index}"))
+        return fields
+
+    def _field_source(self, fields: List[Tuple[str, str, str]], indent: str, rng: random.Random) -> str:
+        """生成 @BindView 字段声明"""
+        lines = []
+        for view_id, view_type, field_name in fields:
+            modifier = rng.choice(('', '', 'public ', 'private '))
+            lines.append(f"{indent}@BindView({view_id})")
+            lines.append(f"{indent}{modifier}{view_type} {field_name};")
+        return '\n'.join(lines) + '\n'
+
+    def _click_source(self, fields: List[Tuple[str, str, str]], single_template: str) -> Tuple[str, int]:
+        """生成 @OnClick 方法：第一个为多ID方法，其余为单ID方法"""
+        if not fields or self.clicks_per_class <= 0:
+            return '', 0
+
+        view_ids = [view_id for view_id, _, _ in fields]
+        multi_ids = view_ids[:max(1, min(self.ids_per_click, len(view_ids)))]
+        cases = '\n'.join(
+            f"            case {view_id}:\n                break;" for view_id in multi_ids
+        )
+        sources = [MULTI_CLICK_TEMPLATE.format(ids=', '.join(multi_ids), index=0, cases=cases)]
+
+        for index in range(1, self.clicks_per_class):
+            view_id = view_ids[index % len(view_ids)]
+            sources.append(single_template.format(view_id=view_id, index=index))
+
+        return ''.join(sources), self.clicks_per_class
+
+    def _filler(self, current_bytes: int, target_bytes: int) -> str:
+        """生成填充方法直到接近目标大小"""
+        methods = []
+        length = current_bytes
+        while length < target_bytes:
+            method = FILLER_TEMPLATE.format(index=len(methods))
+            methods.append(method)
+            length += len(method.encode('utf-8'))
+        return ''.join(methods)
+
+    def _activity_source(self, index: int, target_bytes: int, rng: random.Random):
+        """生成Activity源码"""
+        name = f"Bench{index}Activity"
+        fields = self._fields(f"activity_{index}", rng)
+        clicks, click_count = self._click_source(fields, SINGLE_CLICK_TEMPLATE)
+        values = {
+            'name': name,
+            'layout': f"activity_bench_{index}",
+            'fields': self._field_source(fields, '    ', rng),
+            'clicks': clicks
+        }
+        return name, self._render('activity', ACTIVITY_TEMPLATE, values, target_bytes), (len(fields), click_count)
+
+    def _fragment_source(self, index: int, target_bytes: int, rng: random.Random):
+        """生成Fragment源码"""
+        name = f"Bench{index}Fragment"
+        fields = self._fields(f"fragment_{index}", rng)
+        clicks, click_count = self._click_source(fields, FRAGMENT_SINGLE_CLICK_TEMPLATE)
+        values = {
+            'name': name,
+            'layout': f"fragment_bench_{index}",
+            'fields': self._field_source(fields, '    ', rng),
+            'clicks': clicks
+        }
+        return name, self._render('fragment', FRAGMENT_TEMPLATE, values, target_bytes), (len(fields), click_count)
+
+    def _adapter_source(self, index: int, target_bytes: int, rng: random.Random):
+        """生成带ViewHolder内部类的Adapter源码"""
+        name = f"Bench{index}Adapter"
+        fields = self._fields(f"item_{index}", rng)
+        values = {
+            'name': name,
+            'layout': f"item_bench_{index}",
+            'first_field': fields[0][2] if fields else 'itemView',
+            'fields': self._field_source(fields, '        ', rng)
+        }
+        return name, self._render('adapter', ADAPTER_TEMPLATE, values, target_bytes), (len(fields), 0)
+
+    def _plain_source(self, index: int, target_bytes: int, rng: random.Random):
+        """生成不含ButterKnife的普通类源码"""
+        name = f"Bench{index}Helper"
+        return name, self._render('plain', PLAIN_TEMPLATE, {'name': name}, target_bytes), (0, 0)
+
+    def _render(self, kind: str, template: str, values: Dict[str, str], target_bytes: int) -> str:
+        """渲染模板并用填充方法补足目标大小"""
+        header = self._header(kind, kind != 'plain')
+        skeleton = header + template.format(filler='', **values)
+        filler = self._filler(len(skeleton.encode('utf-8')), target_bytes)
+        return header + template.format(filler=filler, **values)
+
+
+def generate_project(project_path: str, **settings) -> Dict[str, Any]:
+    """
+    生成合成Android项目
+
+    Args:
+        project_path: 项目根目录
+        **settings: AndroidProjectGenerator 的构造参数
+
+    Returns:
+        生成统计信息
+    """
+    return AndroidProjectGenerator(**settings).generate(project_path)
@@ -4,6 +4,8 @@
 ButterKnife解析器模块
 """
 
-from .butterknife_parser import ButterKnifeParser, ParsingResult
+from .butterknife_parser import ButterKnifeParser, ParsingResult, PARSER_MODES
+from .parse_records import ParseResult, BindView, OnClickBinding, ClassInfo
 
-__all__ = ['ButterKnifeParser', 'ParsingResult']
+__all__ = ['ButterKnifeParser', 'ParsingResult', 'PARSER_MODES', 'ParseResult', 'BindView', 'OnClickBinding',
+           'ClassInfo']
@@ -7,108 +7,139 @@ ButterKnife注解解析器
 """
 
 import re
+from collections.abc import Mapping
 from typing import Dict, List, Optional, Tuple
+from utils.java_lexer import tokenize_java, mask_java
+from utils.pattern_registry import SharedPattern
+from .parse_records import ParseResult, BindView, OnClickBinding, ClassInfo
+
+
+# 解析方式：multi 每类信息各扫描一遍；single 用一个组合正则在屏蔽后的文本上一次扫描收集全部信息
+PARSER_MODES = ('multi', 'single')
+
+# import语句中的类名 -> imports字段
+IMPORT_KEYS = {
+    'BindView': 'bindview',
+    'OnClick': 'onclick',
+    'OnLongClick': 'onlongclick',
+    'ButterKnife': 'butterknife'
+}
 
 
 class ButterKnifeParser:
     """ButterKnife注解解析器类"""
     
-    def __init__(self):
-        # 编译正则表达式以提高性能
-        # 支持同一行和多行格式的@BindView注解
-        self.bind_view_pattern = re.compile(
-            r'@BindView\s*\(\s*(R2?\.id\.\w+)\s*\)\s+(?:public\s+|private\s+|protected\s+)?(\w+)\s+(\w+)\s*;',
-            re.MULTILINE
-        )
-        
-        self.on_click_pattern = re.compile(
-            r'@OnClick\s*\(\s*(?:\{\s*)?((?:R2?\.id\.\w+(?:\s*,\s*R2?\.id\.\w+)*)?)(?:\s*\})?\s*\)\s*(?:public\s+)?(?:void\s+)?(\w+)\s*\([^)]*\)',
-            re.MULTILINE
-        )
-        
-        self.on_long_click_pattern = re.compile(
-            r'@OnLongClick\s*\(\s*([^)]+)\s*\)\s*(?:public\s+)?(?:boolean\s+)?(\w+)\s*\([^)]*\)',
-            re.MULTILINE
-        )
-        
-        self.bind_call_pattern = re.compile(
-            r'ButterKnife\.bind\s*\(\s*this\s*\)\s*;',
-            re.MULTILINE
-        )
-        
-        self.import_pattern = re.compile(
-            r'import\s+butterknife\.BindView\s*;',
-            re.MULTILINE
-        )
-        
-        self.onclick_import_pattern = re.compile(
-            r'import\s+butterknife\.OnClick\s*;',
-            re.MULTILINE
-        )
-        
-        self.onlongclick_import_pattern = re.compile(
-            r'import\s+butterknife\.OnLongClick\s*;',
-            re.MULTILINE
-        )
-        
-        self.butterknife_import_pattern = re.compile(
-            r'import\s+butterknife\.ButterKnife\s*;',
-            re.MULTILINE
-        )
-        
-        self.class_pattern = re.compile(
-            r'class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?',
-            re.MULTILINE
-        )
-        
-        self.method_pattern = re.compile(
-            r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?\w+\s+(\w+)\s*\([^)]*\)\s*\{',
-            re.MULTILINE
-        )
+    # 支持同一行和多行格式的@BindView注解
+    bind_view_pattern = SharedPattern(
+        r'@BindView\s*\(\s*(R2?\.id\.\w+)\s*\)\s+(?:public\s+|private\s+|protected\s+)?(\w+)\s+(\w+)\s*;',
+        re.MULTILINE
+    )
     
-    def parse(self, content: str) -> Dict:
-        """解析Java文件内容，提取ButterKnife注解信息"""
-        result = {
-            'has_butterknife': False,
-            'bind_views': [],
-            'on_clicks': [],
-            'on_long_clicks': [],
-            'bind_call': False,
-            'imports': {
-                'bindview': False,
-                'onclick': False,
-                'onlongclick': False,
-                'butterknife': False
-            },
-            'class_info': {},
-            'methods': []
-        }
+    on_click_pattern = SharedPattern(
+        r'@OnClick\s*\(\s*(?:\{\s*)?((?:R2?\.id\.\w+(?:\s*,\s*R2?\.id\.\w+)*)?)(?:\s*\})?\s*\)\s*(?:public\s+)?(?:void\s+)?(\w+)\s*\([^()]*\)',
+        re.MULTILINE
+    )
+    
+    on_long_click_pattern = SharedPattern(
+        r'@OnLongClick\s*\(\s*([^()\s][^()]*|\s)\)\s*(?:public\s+)?(?:boolean\s+)?(\w+)\s*\([^()]*\)',
+        re.MULTILINE
+    )
+    
+    bind_call_pattern = SharedPattern(
+        r'ButterKnife\.bind\s*\(\s*this\s*\)\s*;',
+        re.MULTILINE
+    )
+    
+    import_pattern = SharedPattern(
+        r'import\s+butterknife\.BindView\s*;',
+        re.MULTILINE
+    )
+    
+    onclick_import_pattern = SharedPattern(
+        r'import\s+butterknife\.OnClick\s*;',
+        re.MULTILINE
+    )
+    
+    onlongclick_import_pattern = SharedPattern(
+        r'import\s+butterknife\.OnLongClick\s*;',
+        re.MULTILINE
+    )
+    
+    butterknife_import_pattern = SharedPattern(
+        r'import\s+butterknife\.ButterKnife\s*;',
+        re.MULTILINE
+    )
+    
+    class_pattern = SharedPattern(
+        r'class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?',
+        re.MULTILINE
+    )
+    
+    method_pattern = SharedPattern(
+        r'(?<!\w)\w+\s+(\w+)\s*\([^()]*\)\s*\{',
+        re.MULTILINE
+    )
+    
+    # 方法签名中的参数列表（锚定在第一个左括号，与不锚定时的匹配相同，但不会在每个左括号处重试）
+    parameter_list_pattern = SharedPattern(r'^[^(]*\(([^)]*)\)')
+    
+    # 单次扫描：各分支与上面的正则一致，只在单词或@开头处尝试匹配（避免在每个字符处回溯）；
+    # 注解后的方法签名放在前瞻中，不占用文本，方法分支仍能匹配到同一个方法
+    single_pass_pattern = SharedPattern(
+        r'(?<!\w)(?=[\w@])(?:'
+        r'(?P<bind_view>@BindView\s*\(\s*(?P<bind_view_id>R2?\.id\.\w+)\s*\)\s+'
+        r'(?:public\s+|private\s+|protected\s+)?(?P<bind_view_type>\w+)\s+(?P<bind_view_name>\w+)\s*;)'
+        r'|(?P<on_click>@OnClick\s*\(\s*(?:\{\s*)?(?P<on_click_ids>(?:R2?\.id\.\w+(?:\s*,\s*R2?\.id\.\w+)*)?)'
+        r'(?:\s*\})?\s*\)\s*(?=(?:public\s+)?(?:void\s+)?(?P<on_click_method>\w+)\s*\([^()]*\)))'
+        r'|(?P<on_long_click>@OnLongClick\s*\(\s*(?P<on_long_click_ids>[^()\s][^()]*|\s)\)\s*'
+        r'(?=(?:public\s+)?(?:boolean\s+)?(?P<on_long_click_method>\w+)\s*\([^()]*\)))'
+        r'|(?P<bind_call>ButterKnife\.bind\s*\(\s*this\s*\)\s*;)'
+        r'|(?P<import>import\s+butterknife\.(?P<import_name>BindView|OnClick|OnLongClick|ButterKnife)\s*;)'
+        r'|(?P<class>class\s+(?P<class_name>\w+)(?:\s+extends\s+(?P<class_extends>\w+))?'
+        r'(?:\s+implements\s+(?P<class_implements>[^{]+))?)'
+        # 修饰符是可选前缀，不影响捕获的方法名
+        r'|(?P<method>\w+\s+(?P<method_name>\w+)\s*\([^()]*\)\s*\{)'
+        r')'
+    )
+    
+    def __init__(self, mode: str = 'multi'):
+        if mode not in PARSER_MODES:
+            raise ValueError(f"无效的解析方式: {mode}")
+        self.mode = mode
+    
+    def parse(self, content: str) -> ParseResult:
+        """解析Java文件内容，提取ButterKnife注解信息（结果可按字典方式访问）"""
+        result = ParseResult.empty()
         
         try:
             # 检查是否包含ButterKnife注解
             if self._has_butterknife_annotations(content):
-                result['has_butterknife'] = True
+                result.has_butterknife = True
+                
+                if self.mode == 'single':
+                    self._parse_single_pass(content, result)
+                    return result
                 
                 # 解析@BindView注解
-                result['bind_views'] = self._parse_bind_views(content)
+                result.bind_views = self._parse_bind_views(content)
                 
                 # 解析@OnClick注解
-                result['on_clicks'] = self._parse_on_clicks(content)
+                result.on_clicks = self._parse_on_clicks(content)
                 
                 # 解析@OnLongClick注解
-                result['on_long_clicks'] = self._parse_on_long_clicks(content)
+                result.on_long_clicks = self._parse_on_long_clicks(content)
                 
                 # 检查ButterKnife.bind调用
-                result['bind_call'] = self._has_bind_call(content)
+                result.bind_call = self._has_bind_call(content)
                 
                 # 检查import语句
-                result['imports'] = self._parse_imports(content)
+                result.imports = self._parse_imports(content)
                 
                 # 解析类信息
-                result['class_info'] = self._parse_class_info(content)
+                result.class_info = self._parse_class_info(content)
                 
                 # 解析方法信息
-                result['methods'] = self._parse_methods(content)
+                result.methods = self._parse_methods(content)
         
         except Exception as e:
             print(f"解析ButterKnife注解时出错: {e}")
@@ -124,86 +155,131 @@ class ButterKnifeParser:
             'ButterKnife.bind' in content
         )
     
-    def _parse_bind_views(self, content: str) -> List[Dict]:
+    def _parse_bind_views(self, content: str) -> List[BindView]:
         """解析@BindView注解"""
         bind_views = []
         # 过滤掉注释掉的代码
         filtered_content = self._remove_commented_code(content)
         matches = self.bind_view_pattern.findall(filtered_content)
         
-        for match in matches:
-            resource_id, field_type, field_name = match
-            bind_views.append({
-                'id': resource_id.strip(),
-                'type': field_type.strip(),
-                'name': field_name.strip(),
-                'original_line': self._find_original_line(content, match[0])
-            })
+        for resource_id, field_type, field_name in matches:
+            bind_views.append(self._build_bind_view(content, resource_id, field_type, field_name))
         
         return bind_views
     
-    def _parse_on_clicks(self, content: str) -> List[Dict]:
+    def _build_bind_view(self, content: str, resource_id: str, field_type: str, field_name: str) -> BindView:
+        """生成@BindView注解信息"""
+        return BindView(
+            resource_id.strip(),
+            field_type.strip(),
+            field_name.strip(),
+            self._find_original_line(content, resource_id)
+        )
+    
+    def _parse_on_clicks(self, content: str) -> List[OnClickBinding]:
         """解析@OnClick注解"""
         on_clicks = []
         # 过滤掉注释掉的代码
         filtered_content = self._remove_commented_code(content)
         matches = self.on_click_pattern.findall(filtered_content)
         
-        for match in matches:
-            resource_ids_str, method_name = match
-            
-            # 解析资源ID列表
-            if resource_ids_str.strip():
-                resource_ids = [
-                    rid.strip() for rid in resource_ids_str.split(',')
-                ]
-            else:
-                resource_ids = []
-            
-            # 检测方法是否有View参数
-            has_view_param, param_type = self._check_method_has_view_param(content, method_name.strip())
-            
-            on_clicks.append({
-                'ids': resource_ids,
-                'method': method_name.strip(),
-                'has_view_param': has_view_param,
-                'param_type': param_type,
-                'original_line': self._find_original_line(content, match[0])
-            })
+        for resource_ids_str, method_name in matches:
+            on_clicks.append(self._build_on_click(content, resource_ids_str, method_name))
         
         return on_clicks
     
-    def _parse_on_long_clicks(self, content: str) -> List[Dict]:
+    def _build_on_click(self, content: str, resource_ids_str: str, method_name: str) -> OnClickBinding:
+        """生成@OnClick注解信息"""
+        # 解析资源ID列表
+        if resource_ids_str.strip():
+            resource_ids = [
+                rid.strip() for rid in resource_ids_str.split(',')
+            ]
+        else:
+            resource_ids = []
+        
+        # 检测方法是否有View参数
+        has_view_param, param_type = self._check_method_has_view_param(content, method_name.strip())
+        
+        return OnClickBinding(
+            resource_ids,
+            method_name.strip(),
+            has_view_param,
+            param_type,
+            self._find_original_line(content, resource_ids_str)
+        )
+    
+    def _parse_on_long_clicks(self, content: str) -> List[OnClickBinding]:
         """解析@OnLongClick注解"""
         on_long_clicks = []
-        matches = self.on_long_click_pattern.findall(content)
+        # 过滤掉注释掉的代码
+        filtered_content = self._remove_commented_code(content)
+        matches = self.on_long_click_pattern.findall(filtered_content)
         
-        for match in matches:
-            resource_ids_str, method_name = match
-            
-            # 解析资源ID列表
-            if resource_ids_str.strip():
-                # 处理单个ID或多个ID的情况
-                if ',' in resource_ids_str:
-                    resource_ids = [rid.strip() for rid in resource_ids_str.split(',')]
-                else:
-                    resource_ids = [resource_ids_str.strip()]
-            else:
-                resource_ids = []
-            
-            # 检测方法是否有View参数
-            has_view_param, param_type = self._check_method_has_view_param(content, method_name.strip())
-            
-            on_long_clicks.append({
-                'ids': resource_ids,
-                'method': method_name.strip(),
-                'has_view_param': has_view_param,
-                'param_type': param_type,
-                'original_line': self._find_original_line(content, match[0])
-            })
+        for resource_ids_str, method_name in matches:
+            on_long_clicks.append(self._build_on_long_click(content, resource_ids_str, method_name))
         
         return on_long_clicks
     
+    def _build_on_long_click(self, content: str, resource_ids_str: str, method_name: str) -> OnClickBinding:
+        """生成@OnLongClick注解信息"""
+        # 解析资源ID列表
+        if resource_ids_str.strip():
+            # 处理单个ID或多个ID的情况
+            if ',' in resource_ids_str:
+                resource_ids = [rid.strip() for rid in resource_ids_str.split(',')]
+            else:
+                resource_ids = [resource_ids_str.strip()]
+        else:
+            resource_ids = []
+        
+        # 检测方法是否有View参数
+        has_view_param, param_type = self._check_method_has_view_param(content, method_name.strip())
+        
+        return OnClickBinding(
+            resource_ids,
+            method_name.strip(),
+            has_view_param,
+            param_type,
+            self._find_original_line(content, resource_ids_str)
+        )
+    
+    def _parse_single_pass(self, content: str, result: ParseResult):
+        """在屏蔽注释和字符串后的文本上一次扫描，收集注解、bind调用、import、类和方法信息"""
+        masked = mask_java(content)
+        methods = result.methods
+        
+        for match in self.single_pass_pattern.finditer(masked):
+            kind = match.lastgroup
+            if kind == 'bind_view':
+                result.bind_views.append(self._build_bind_view(
+                    content, match.group('bind_view_id'), match.group('bind_view_type'), match.group('bind_view_name')
+                ))
+            elif kind == 'on_click':
+                result.on_clicks.append(self._build_on_click(
+                    content, match.group('on_click_ids'), match.group('on_click_method')
+                ))
+            elif kind == 'on_long_click':
+                result.on_long_clicks.append(self._build_on_long_click(
+                    content, match.group('on_long_click_ids'), match.group('on_long_click_method')
+                ))
+            elif kind == 'bind_call':
+                result.bind_call = True
+            elif kind == 'import':
+                result.imports[IMPORT_KEYS[match.group('import_name')]] = True
+            elif kind == 'class':
+                if result.class_info is None:
+                    implements = match.group('class_implements')
+                    result.class_info = ClassInfo(
+                        match.group('class_name'),
+                        match.group('class_extends'),
+                        implements.strip() if implements else None
+                    )
+            else:
+                method_name = match.group('method_name')
+                if method_name not in methods:
+                    methods.append(method_name)
+    
     def _check_method_has_view_param(self, content: str, method_name: str) -> Tuple[bool, str]:
         """检查方法是否有View参数，并返回参数类型"""
         # 查找主类中的方法定义，使用更严谨的方法边界检测
@@ -213,7 +289,7 @@ class ButterKnifeParser:
             # 提取方法签名
             method_signature = content[method_start:method_end].split('{')[0]
             # 提取参数部分
-            param_match = re.search(r'\(([^)]*)\)', method_signature)
+            param_match = self.parameter_list_pattern.search(method_signature)
             if param_match:
                 params = param_match.group(1).strip()
                 if params:
@@ -230,83 +306,39 @@ class ButterKnifeParser:
     
     def _find_method_boundaries(self, content: str, method_name: str) -> Tuple[int, int]:
         """查找方法的开始和结束位置，使用严谨的大括号匹配算法"""
-        lines = content.split('\n')
+        # 在屏蔽注释和字符串后的文本上逐行匹配，偏移量与原文一致
+        signature_pattern = re.compile(
+            rf'^\s*(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(?:void\s+|boolean\s+)?{re.escape(method_name)}\s*\([^()]*\)\s*{{'
+        )
         
         # 查找方法开始位置
         method_start = -1
-        for i, line in enumerate(lines):
+        line_start = 0
+        for line in mask_java(content).split('\n'):
             # 查找主类中的方法定义（不在匿名内部类中）
-            if re.match(rf'^\s*(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(?:void\s+|boolean\s+)?{re.escape(method_name)}\s*\([^)]*\)\s*{{', line):
-                method_start = sum(len(lines[j]) + 1 for j in range(i))
+            if signature_pattern.match(line):
+                method_start = line_start
                 break
+            line_start += len(line) + 1
         
         if method_start == -1:
             return -1, -1
         
-        # 使用严谨的大括号匹配算法查找方法结束位置
-        brace_count = 0
-        in_method = False
+        # 使用词法分析得到的大括号配对查找方法结束位置（忽略字符串和注释中的括号）
+        tokens = tokenize_java(content)
         method_end = -1
         
-        for i, char in enumerate(content[method_start:], method_start):
-            if char == '{':
-                brace_count += 1
-                if brace_count == 1:
-                    in_method = True
-            elif char == '}':
-                brace_count -= 1
-                if in_method and brace_count == 0:
-                    method_end = i + 1
-                    break
+        open_brace = tokens.find_open_brace(method_start)
+        if open_brace != -1:
+            close_brace = tokens.matching_brace(open_brace)
+            if close_brace != -1:
+                method_end = close_brace + 1
         
         return method_start, method_end
     
     def _remove_commented_code(self, content: str) -> str:
-        """移除注释掉的代码，使用更严谨的注释处理"""
-        lines = content.split('\n')
-        filtered_lines = []
-        in_block_comment = False
-        
-        for line in lines:
-            # 处理块注释
-            if '/*' in line and '*/' in line:
-                # 单行块注释，跳过
-                continue
-            elif '/*' in line:
-                # 块注释开始
-                in_block_comment = True
-                # 保留块注释前的代码
-                before_comment = line.split('/*')[0]
-                if before_comment.strip():
-                    filtered_lines.append(before_comment)
-                continue
-            elif '*/' in line:
-                # 块注释结束
-                in_block_comment = False
-                # 保留块注释后的代码
-                after_comment = line.split('*/')[1]
-                if after_comment.strip():
-                    filtered_lines.append(after_comment)
-                continue
-            elif in_block_comment:
-                # 在块注释中，跳过
-                continue
-            
-            # 处理行注释
-            if '//' in line:
-                # 保留注释前的代码
-                before_comment = line.split('//')[0]
-                if before_comment.strip():
-                    filtered_lines.append(before_comment)
-            else:
-                # 检查是否是注释行
-                stripped = line.strip()
-                if stripped.startswith('//') or stripped.startswith('*'):
-                    # 跳过注释行
-                    continue
-                filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
+        """屏蔽注释和字符串内容（替换为空格），结果与原文等长，匹配位置可直接对应原文"""
+        return mask_java(content)
     
     def _extract_view_param_type(self, params: str) -> str:
         """从参数中提取View类型"""
@@ -330,7 +362,7 @@ class ButterKnifeParser:
     
     def _has_bind_call(self, content: str) -> bool:
         """检查是否包含ButterKnife.bind调用"""
-        return bool(self.bind_call_pattern.search(content))
+        return bool(self.bind_call_pattern.search(self._remove_commented_code(content)))
     
     def _parse_imports(self, content: str) -> Dict[str, bool]:
         """解析import语句"""
@@ -341,17 +373,17 @@ class ButterKnifeParser:
             'butterknife': bool(self.butterknife_import_pattern.search(content))
         }
     
-    def _parse_class_info(self, content: str) -> Dict:
-        """解析类信息"""
-        class_info = {}
+    def _parse_class_info(self, content: str) -> Optional[ClassInfo]:
+        """解析类信息，未找到类声明时返回None"""
+        class_info = None
         match = self.class_pattern.search(content)
         
         if match:
-            class_info = {
-                'name': match.group(1),
-                'extends': match.group(2) if match.group(2) else None,
-                'implements': match.group(3).strip() if match.group(3) else None
-            }
+            class_info = ClassInfo(
+                match.group(1),
+                match.group(2) if match.group(2) else None,
+                match.group(3).strip() if match.group(3) else None
+            )
         
         return class_info
     
@@ -368,16 +400,18 @@ class ButterKnifeParser:
         return methods
     
     def _find_original_line(self, content: str, pattern: str) -> Optional[str]:
-        """查找原始行内容"""
-        lines = content.split('\n')
+        """查找原始行内容（第一次出现pattern的行）"""
+        if '\n' in pattern:
+            return None
         
-        for line in lines:
-            if pattern in line:
-                return line.strip()
+        position = content.find(pattern)
+        if position == -1:
+            return None
         
-        return None
+        line_end = content.find('\n', position)
+        return content[content.rfind('\n', 0, position) + 1:line_end if line_end != -1 else len(content)].strip()
     
-    def get_parsing_statistics(self, parsed_data: Dict) -> Dict:
+    def get_parsing_statistics(self, parsed_data: Mapping) -> Dict:
         """获取解析统计信息"""
         stats = {
             'total_bind_views': len(parsed_data.get('bind_views', [])),
@@ -389,7 +423,7 @@ class ButterKnifeParser:
         
         return stats
     
-    def _determine_class_type(self, class_info: Dict) -> str:
+    def _determine_class_type(self, class_info: Optional[Mapping]) -> str:
         """确定类类型"""
         if not class_info:
             return 'unknown'
@@ -408,7 +442,7 @@ class ButterKnifeParser:
         else:
             return 'Other'
     
-    def validate_parsed_data(self, parsed_data: Dict) -> Tuple[bool, List[str]]:
+    def validate_parsed_data(self, parsed_data: Mapping) -> Tuple[bool, List[str]]:
         """验证解析的数据"""
         errors = []
         
@@ -432,7 +466,7 @@ class ButterKnifeParser:
 class ParsingResult:
     """解析结果类"""
     
-    def __init__(self, parsed_data: Dict):
+    def __init__(self, parsed_data: Mapping):
         self.data = parsed_data
         self.parser = ButterKnifeParser()
     
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析结果记录
+ButterKnifeParser.parse 的结果使用带 __slots__ 的数据类保存，比嵌套字典占用更少的内存，
+pickle（传给工作进程）和缓存序列化时只保存字段值，不重复保存字段名
+记录同时实现只读的 Mapping 接口（record['name']、record.get('ids')、与字典比较相等），
+原有按字典访问解析结果的代码无需修改
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+# import标志的固定顺序（紧凑格式中按此顺序保存）
+IMPORT_FLAGS = ('bindview', 'onclick', 'onlongclick', 'butterknife')
+
+
+def empty_imports() -> Dict[str, bool]:
+    """所有import标志均为False"""
+    return {flag: False for flag in IMPORT_FLAGS}
+
+
+class _Record(Mapping):
+    """字段即键的只读映射视图，pickle时只保存字段值"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __reduce__(self):
+        return self.__class__, tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典（嵌套记录也一并转换）"""
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+
+def _plain(value: Any) -> Any:
+    """把记录及其中的列表转换为普通字典和列表"""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+@dataclass(eq=False)
+class BindView(_Record):
+    """@BindView字段"""
+
+    __slots__ = ('id', 'type', 'name', 'original_line')
+
+    id: str
+    type: str
+    name: str
+    original_line: Optional[str]
+
+
+@dataclass(eq=False)
+class OnClickBinding(_Record):
+    """@OnClick / @OnLongClick方法"""
+
+    __slots__ = ('ids', 'method', 'has_view_param', 'param_type', 'original_line')
+
+    ids: List[str]
+    method: str
+    has_view_param: bool
+    param_type: str
+    original_line: Optional[str]
+
+
+@dataclass(eq=False)
+class ClassInfo(_Record):
+    """第一个类声明"""
+
+    __slots__ = ('name', 'extends', 'implements')
+
+    name: str
+    extends: Optional[str]
+    implements: Optional[str]
+
+
+@dataclass(eq=False)
+class ParseResult(_Record):
+    """单个文件的解析结果，未找到类声明时 class_info 为None"""
+
+    __slots__ = ('has_butterknife', 'bind_views', 'on_clicks', 'on_long_clicks', 'bind_call', 'imports',
+                 'class_info', 'methods')
+
+    has_butterknife: bool
+    bind_views: List[BindView]
+    on_clicks: List[OnClickBinding]
+    on_long_clicks: List[OnClickBinding]
+    bind_call: bool
+    imports: Dict[str, bool]
+    class_info: Optional[ClassInfo]
+    methods: List[str]
+
+    def __reduce__(self):
+        # 整个结果以一个只含字段值的嵌套列表pickle，不再逐个调用内部记录的 __reduce__
+        return _from_compact, (self.to_compact(),)
+
+    @classmethod
+    def empty(cls) -> 'ParseResult':
+        """不含ButterKnife的空结果"""
+        return cls(False, [], [], [], False, empty_imports(), None, [])
+
+    def to_compact(self) -> list:
+        """紧凑的可JSON序列化形式：只保存字段值，字段顺序与 __slots__ 一致"""
+        return [
+            self.has_butterknife,
+            [list(bind_view.values()) for bind_view in self.bind_views],
+            [list(on_click.values()) for on_click in self.on_clicks],
+            [list(on_click.values()) for on_click in self.on_long_clicks],
+            self.bind_call,
+            [self.imports.get(flag, False) for flag in IMPORT_FLAGS],
+            list(self.class_info.values()) if self.class_info else None,
+            self.methods
+        ]
+
+    @classmethod
+    def from_compact(cls, data: list) -> 'ParseResult':
+        """从 to_compact 的结果还原"""
+        has_butterknife, bind_views, on_clicks, on_long_clicks, bind_call, imports, class_info, methods = data
+        return cls(
+            has_butterknife,
+            [BindView(*values) for values in bind_views],
+            [OnClickBinding(*values) for values in on_clicks],
+            [OnClickBinding(*values) for values in on_long_clicks],
+            bind_call,
+            dict(zip(IMPORT_FLAGS, imports)),
+            ClassInfo(*class_info) if class_info else None,
+            methods
+        )
+
+    @classmethod
+    def from_mapping(cls, data: Mapping) -> 'ParseResult':
+        """从字典形式的解析结果（如旧版本缓存或手工构造的数据）创建记录"""
+        if isinstance(data, cls):
+            return data
+
+        class_info = data.get('class_info')
+        return cls(
+            bool(data.get('has_butterknife', False)),
+            [BindView(item['id'], item['type'], item['name'], item.get('original_line'))
+             for item in data.get('bind_views', [])],
+            [_on_click_from_mapping(item) for item in data.get('on_clicks', [])],
+            [_on_click_from_mapping(item) for item in data.get('on_long_clicks', [])],
+            bool(data.get('bind_call', False)),
+            {**empty_imports(), **data.get('imports', {})},
+            ClassInfo(class_info['name'], class_info.get('extends'), class_info.get('implements'))
+            if class_info else None,
+            list(data.get('methods', []))
+        )
+
+
+def _on_click_from_mapping(item: Mapping) -> OnClickBinding:
+    """从字典形式的@OnClick信息创建记录"""
+    return OnClickBinding(list(item['ids']), item['method'], item.get('has_view_param', False),
+                          item.get('param_type', ''), item.get('original_line'))
+
+
+def _from_compact(data: list) -> ParseResult:
+    """pickle还原入口"""
+    return ParseResult.from_compact(data)
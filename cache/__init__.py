@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存模块
+"""
+
+from .parse_cache import ParseCache, parser_fingerprint
+from .scan_manifest import ScanManifest, scan_settings_key
+from .cost_history import CostHistory
+
+__all__ = ['ParseCache', 'parser_fingerprint', 'ScanManifest', 'scan_settings_key', 'CostHistory']
\ No newline at end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件处理耗时历史
+记录上次运行中每个文件的大小和处理耗时（解析 + 转换 + 注入），
+供并行调度估算文件的处理成本
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+
+# 历史文件名
+COST_HISTORY_NAME = "file_costs.json"
+
+# 历史格式版本
+COST_HISTORY_VERSION = 1
+
+
+class CostHistory:
+    """文件处理耗时历史类"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.history_path = os.path.join(cache_dir, COST_HISTORY_NAME)
+        # 文件相对路径 -> {'size': 字节数, 'seconds': 处理耗时}
+        self.files = {}
+        self._updated = {}
+
+        self._load()
+
+    def _load(self):
+        """加载历史，版本不一致时丢弃"""
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') == COST_HISTORY_VERSION:
+            self.files = data.get('files', {})
+
+    def estimate_seconds(self, file_key: str, size: int) -> Optional[float]:
+        """按上次的耗时估算本次耗时（文件大小变化时按比例缩放），没有记录时返回None"""
+        entry = self.files.get(file_key)
+        if entry is None:
+            return None
+        if entry['size'] and size != entry['size']:
+            return entry['seconds'] * size / entry['size']
+        return entry['seconds']
+
+    def record(self, file_key: str, size: int, seconds: float):
+        """记录本次运行中文件的处理耗时"""
+        self._updated[file_key] = {'size': size, 'seconds': round(seconds, 6)}
+
+    def save(self):
+        """保存历史（本次未处理的文件保留上次的记录）"""
+        files = dict(self.files)
+        files.update(self._updated)
+        data = {'version': COST_HISTORY_VERSION, 'files': files}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self.history_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.history_path)
+
+        self.files = files
+        self._updated = {}
+
+    def get_statistics(self) -> Dict[str, int]:
+        """获取历史统计"""
+        return {'files': len(self.files), 'updated': len(self._updated)}
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+持久化解析缓存
+以 (文件路径, 大小, mtime_ns, 内容哈希, 工具版本) 为键保存 ButterKnifeParser.parse 的结果
+未修改的文件直接复用缓存结果，无需再次运行正则解析
+解析器的正则表达式变化时缓存自动失效
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from collections.abc import Mapping
+from typing import Dict, Any, Optional
+from config import TOOL_VERSION
+from butterknife_parser_module.parse_records import ParseResult
+from utils.pattern_registry import compiled_patterns
+
+
+# 缓存数据库文件名
+CACHE_DB_NAME = "parse_cache.sqlite3"
+
+# 数据库结构版本，结构变化时整体重建
+SCHEMA_VERSION = 2
+
+
+def parser_fingerprint(parser) -> str:
+    """
+    计算解析器指纹：工具版本 + 解析器的所有正则表达式（共享的和实例上覆盖的）的模式和标志 + 解析方式等字符串设置
+    任意一个正则表达式或设置改变都会得到不同的指纹
+    """
+    digest = hashlib.sha256(TOOL_VERSION.encode('utf-8'))
+    patterns = compiled_patterns(parser)
+    for name in sorted(patterns):
+        value = patterns[name]
+        digest.update(f"\0{name}\0{value.flags}\0".encode('utf-8'))
+        digest.update(value.pattern.encode('utf-8'))
+    for name in sorted(vars(parser)):
+        value = getattr(parser, name)
+        if isinstance(value, str):
+            digest.update(f"\0{name}\0{value}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def content_hash(data: bytes) -> str:
+    """计算文件内容哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """持久化解析缓存类"""
+    
+    def __init__(self, cache_dir: str, fingerprint: str, max_entries: int = 100000):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, CACHE_DB_NAME)
+        self.connection = sqlite3.connect(self.db_path)
+        self._prepare_database()
+    
+    def _prepare_database(self):
+        """创建数据表，指纹或结构版本不一致时清空缓存"""
+        cursor = self.connection.cursor()
+        cursor.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        cursor.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'path TEXT PRIMARY KEY, '
+            'size INTEGER NOT NULL, '
+            'mtime_ns INTEGER NOT NULL, '
+            'content_hash TEXT NOT NULL, '
+            'tool_version TEXT NOT NULL, '
+            'has_butterknife INTEGER NOT NULL, '
+            'payload BLOB, '
+            'last_used INTEGER NOT NULL)'
+        )
+        
+        stored = dict(cursor.execute('SELECT key, value FROM meta').fetchall())
+        expected = {'schema': str(SCHEMA_VERSION), 'fingerprint': self.fingerprint}
+        if stored != expected:
+            cursor.execute('DELETE FROM entries')
+            cursor.execute('DELETE FROM meta')
+            cursor.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', expected.items())
+        
+        # 最近使用序号，用于淘汰最久未使用的条目
+        row = cursor.execute('SELECT MAX(last_used) FROM entries').fetchone()
+        self.clock = (row[0] or 0) + 1
+        self.connection.commit()
+    
+    def lookup(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        查找文件的缓存解析结果
+        
+        大小和mtime_ns都未变化时直接命中；仅mtime变化时比较内容哈希
+        
+        Returns:
+            {'has_butterknife': bool, 'parsed_data': ParseResult或None}，未命中返回None
+        """
+        key = os.path.abspath(file_path)
+        row = self.connection.execute(
+            'SELECT size, mtime_ns, content_hash, tool_version, has_butterknife, payload '
+            'FROM entries WHERE path = ?', (key,)
+        ).fetchone()
+        
+        if row is None or row[3] != TOOL_VERSION:
+            self.misses += 1
+            return None
+        
+        size, mtime_ns, stored_hash, _, has_butterknife, payload = row
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self.misses += 1
+            return None
+        
+        if stat.st_size != size:
+            self.misses += 1
+            return None
+        
+        if stat.st_mtime_ns != mtime_ns:
+            # 文件被touch过，内容哈希相同仍视为命中
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                self.misses += 1
+                return None
+            
+            if content_hash(data) != stored_hash:
+                self.misses += 1
+                return None
+            
+            self.connection.execute(
+                'UPDATE entries SET mtime_ns = ? WHERE path = ?', (stat.st_mtime_ns, key)
+            )
+        
+        self._touch(key)
+        self.hits += 1
+        return {
+            'has_butterknife': bool(has_butterknife),
+            'parsed_data': self._decode(payload) if has_butterknife else None
+        }
+    
+    def store(self, file_path: str, size: int, mtime_ns: int, file_hash: str,
+              parsed_data: Mapping):
+        """保存文件的解析结果（不含ButterKnife的文件只保存判定结果）"""
+        has_butterknife = bool(parsed_data.get('has_butterknife'))
+        payload = self._encode(parsed_data) if has_butterknife else None
+        
+        self.connection.execute(
+            'INSERT OR REPLACE INTO entries '
+            '(path, size, mtime_ns, content_hash, tool_version, has_butterknife, payload, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (os.path.abspath(file_path), size, mtime_ns, file_hash, TOOL_VERSION,
+             int(has_butterknife), payload, self.clock)
+        )
+        self.clock += 1
+    
+    def _touch(self, key: str):
+        """更新条目的最近使用序号"""
+        self.connection.execute('UPDATE entries SET last_used = ? WHERE path = ?', (self.clock, key))
+        self.clock += 1
+    
+    def _encode(self, parsed_data: Mapping) -> bytes:
+        """序列化解析结果（只含字段值的紧凑JSON + zlib压缩）"""
+        compact = ParseResult.from_mapping(parsed_data).to_compact()
+        text = json.dumps(compact, ensure_ascii=False, separators=(',', ':'))
+        return zlib.compress(text.encode('utf-8'))
+    
+    def _decode(self, payload: bytes) -> ParseResult:
+        """反序列化解析结果"""
+        return ParseResult.from_compact(json.loads(zlib.decompress(payload).decode('utf-8')))
+    
+    def close(self):
+        """淘汰超出上限的条目并提交"""
+        if self.connection is None:
+            return
+        
+        self.connection.execute(
+            'DELETE FROM entries WHERE path NOT IN '
+            '(SELECT path FROM entries ORDER BY last_used DESC LIMIT ?)',
+            (self.max_entries,)
+        )
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """获取缓存命中统计"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描清单
+记录每个目录的mtime和目录项，以及每个文件的 mtime/大小/inode/上次处理结果
+增量模式下只重新列出mtime变化的目录，只处理新增或修改过的文件
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+from config import Config, TOOL_VERSION
+
+
+# 清单文件名
+MANIFEST_NAME = "scan_manifest.json"
+
+# 清单格式版本
+MANIFEST_VERSION = 1
+
+# 处理结果：这些结果的文件在未修改时不需要重新处理
+SETTLED_OUTCOMES = frozenset(['no_butterknife', 'migrated', 'unchanged'])
+
+
+def scan_settings_key(config: Config, parser_key: str = '') -> str:
+    """计算影响扫描和处理结果的配置摘要，配置变化时清单失效"""
+    settings = {
+        'tool_version': TOOL_VERSION,
+        'parser': parser_key,
+        'scan_directories': config.SCAN_DIRECTORIES,
+        'scan_extensions': config.SCAN_EXTENSIONS,
+        'exclude_directories': config.EXCLUDE_DIRECTORIES,
+        'exclude_patterns': config.EXCLUDE_PATTERNS
+    }
+    text = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ScanManifest:
+    """扫描清单类"""
+    
+    def __init__(self, cache_dir: str, settings_key: str):
+        self.cache_dir = cache_dir
+        self.settings_key = settings_key
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        # 目录路径 -> {'mtime_ns', 'files', 'subdirs'}
+        self.directories = {}
+        # 文件路径 -> {'mtime_ns', 'size', 'inode', 'outcome'}
+        self.files = {}
+        # 本次扫描看到的目录和文件，保存时删除已不存在的条目
+        self._seen_directories = set()
+        self._seen_files = set()
+        
+        self._load()
+    
+    def _load(self):
+        """加载清单，版本或配置不一致时丢弃"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if data.get('version') != MANIFEST_VERSION or data.get('settings') != self.settings_key:
+            return
+        
+        self.directories = data.get('directories', {})
+        self.files = data.get('files', {})
+    
+    def get_directory(self, directory: str, mtime_ns: int) -> Optional[Tuple[List[str], List[str]]]:
+        """目录mtime未变化时返回上次记录的 (文件名列表, 子目录名列表)，否则返回None"""
+        self._seen_directories.add(directory)
+        entry = self.directories.get(directory)
+        if entry is None or entry['mtime_ns'] != mtime_ns:
+            return None
+        return entry['files'], entry['subdirs']
+    
+    def set_directory(self, directory: str, mtime_ns: int, files: List[str], subdirs: List[str]):
+        """记录目录的mtime和目录项"""
+        self._seen_directories.add(directory)
+        self.directories[directory] = {'mtime_ns': mtime_ns, 'files': files, 'subdirs': subdirs}
+    
+    def is_changed(self, file_path: str) -> bool:
+        """判断文件是否为新增、修改过或上次未成功处理"""
+        self._seen_files.add(file_path)
+        entry = self.files.get(file_path)
+        if entry is None or entry['outcome'] not in SETTLED_OUTCOMES:
+            return True
+        
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return True
+        
+        return (
+            stat.st_mtime_ns != entry['mtime_ns'] or
+            stat.st_size != entry['size'] or
+            stat.st_ino != entry['inode']
+        )
+    
+    def record(self, file_path: str, outcome: str):
+        """记录文件的处理结果（使用处理后的文件状态）"""
+        self._seen_files.add(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self.files.pop(file_path, None)
+            return
+        
+        self.files[file_path] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'inode': stat.st_ino,
+            'outcome': outcome
+        }
+    
+    def get_outcome(self, file_path: str) -> Optional[str]:
+        """获取文件上次的处理结果"""
+        entry = self.files.get(file_path)
+        return entry['outcome'] if entry else None
+    
+    def save(self):
+        """保存清单（删除本次扫描中已不存在的目录和文件）"""
+        data = {
+            'version': MANIFEST_VERSION,
+            'settings': self.settings_key,
+            'directories': {
+                path: entry for path, entry in self.directories.items()
+                if path in self._seen_directories
+            },
+            'files': {
+                path: entry for path, entry in self.files.items()
+                if path in self._seen_files
+            }
+        }
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.manifest_path)
@@ -9,6 +9,10 @@ import os
 from pathlib import Path
 
 
+# 工具版本（变化时解析缓存自动失效）
+TOOL_VERSION = "1.0.0"
+
+
 class Config:
     """配置类"""
     
@@ -25,12 +29,37 @@ class Config:
         # 备份文件扩展名
         self.BACKUP_EXTENSION = ".bak"
         
+        # 分片执行 "INDEX/COUNT"（如 "1/4"），None表示处理所有文件
+        self.SHARD = None
+        
+        # 预览模式：执行完整流程但不写入文件、不创建备份，输出统一差异
+        self.DRY_RUN = False
+        
+        # 预览模式的补丁文件路径（None表示输出到标准输出）
+        self.DIFF_OUTPUT = None
+        
+        # 备份方式: store（内容寻址对象目录）、tar 或 zip（追加写入单个归档，适合文件很多的项目）
+        self.BACKUP_MODE = "store"
+        
+        # 备份内容使用zlib压缩
+        self.BACKUP_COMPRESS = False
+        
         # 日志级别
         self.LOG_LEVEL = "INFO"
         
         # 日志文件路径
         self.LOG_FILE = "butterknife_migration.log"
         
+        # 控制台日志全部输出到标准错误（默认只有错误输出到标准错误）
+        self.LOG_STDERR = False
+        
+        # 日志由后台线程批量写入（关闭后每条日志同步写入并刷新）
+        self.LOG_ASYNC = True
+        
+        # 后台写入的刷新间隔（秒）和每批最多条数
+        self.LOG_FLUSH_INTERVAL = 0.5
+        self.LOG_BATCH_SIZE = 256
+        
         # 扫描的文件类型
         self.SCAN_EXTENSIONS = [".java"]
         
@@ -71,6 +100,36 @@ class Config:
         self.ADD_FINDVIEWBYID_IMPORTS = True
         self.PRESERVE_COMMENTS = True
         
+        # 解析方式: multi（每类信息各扫描一遍）或 single（组合正则一次扫描）
+        self.PARSER_MODE = "multi"
+        
+        # 并行进程数（1为串行，0表示使用全部CPU核心）
+        self.JOBS = 1
+        
+        # 并行分发顺序: lpt（按上次耗时或文件大小估算成本，从大到小）或 fifo（扫描顺序）
+        self.SCHEDULE = "lpt"
+        
+        # 缓存目录（相对于项目根目录）
+        self.CACHE_DIR = ".butterknife_cache"
+        
+        # 是否启用持久化解析缓存
+        self.PARSE_CACHE_ENABLED = True
+        
+        # 解析缓存最多保存的文件数
+        self.PARSE_CACHE_MAX_ENTRIES = 100000
+        
+        # 增量模式：只处理自上次成功运行以来新增或修改的文件
+        self.INCREMENTAL = False
+        
+        # 迁移报告中列出的耗时最长文件数
+        self.REPORT_SLOWEST_FILES = 10
+        
+        # 是否记录写前日志（进程中途退出后可使用 --resume 继续）
+        self.JOURNAL_ENABLED = True
+        
+        # 继续上次未完成的运行：跳过已提交的文件，完成或回滚写入中的文件
+        self.RESUME = False
+        
     @classmethod
     def from_file(cls, config_path: str) -> 'Config':
         """从配置文件加载配置"""
@@ -121,6 +180,10 @@ class Config:
         
         return scan_paths
     
+    def get_cache_dir(self) -> str:
+        """获取缓存目录的完整路径"""
+        return os.path.join(self.PROJECT_PATH, self.CACHE_DIR)
+    
     def get_exclude_patterns(self) -> list:
         """获取排除模式列表"""
         patterns = []
@@ -149,6 +212,14 @@ class Config:
             print(f"错误: 无效的日志级别: {self.LOG_LEVEL}")
             return False
         
+        if self.BACKUP_MODE not in ["store", "tar", "zip"]:
+            print(f"错误: 无效的备份方式: {self.BACKUP_MODE}")
+            return False
+        
+        if self.PARSER_MODE not in ["multi", "single"]:
+            print(f"错误: 无效的解析方式: {self.PARSER_MODE}")
+            return False
+        
         return True
     
     def __str__(self) -> str:
@@ -8,52 +8,105 @@
 
 import re
 from typing import Dict, Any, List, Optional, Tuple
+from utils.java_lexer import tokenize_java, mask_java
+from utils.java_model import build_file_model
+from utils.edit_buffer import EditBuffer
+from utils.logger import Logger
+from utils.pattern_registry import SharedPattern
+
+
+# 注入分支（写入迁移报告）
+BRANCH_HOLDER = 'holder'
+BRANCH_GENERAL_ACTIVITY = 'general_activity'
+BRANCH_NEWBASE = 'newbase'
+BRANCH_ONCREATE_ONLY = 'oncreate_only'
 
 
 class CodeInjector:
     """代码注入器类"""
     
-    def __init__(self):
-        # 编译正则表达式
-        self.onCreate_pattern = re.compile(
-            r'(\s*@Override\s*\n?\s*protected\s+void\s+onCreate\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
-        
-        self.onViewCreated_pattern = re.compile(
-            r'(\s*@Override\s*\n\s*public\s+void\s+onViewCreated\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
-        
-        self.method_body_pattern = re.compile(
-            r'(\s*@Override\s*\n\s*(?:public|private|protected)\s+(?:static\s+)?\w+\s+\w+\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
+    onCreate_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override\s*protected\s+void\s+onCreate\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
+    onViewCreated_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override[^\S\n]*\n\s*public\s+void\s+onViewCreated\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
+    method_body_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override[^\S\n]*\n\s*(?:public|private|protected)\s+(?:static\s+)?\w+\s+\w+\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
+    class_end_pattern = SharedPattern(
+        r'(?<!\s)(\s*)\}\s*$',
+        re.MULTILINE
+    )
+    
+    # onCreate方法声明（不要求@Override）
+    oncreate_declaration_pattern = SharedPattern(r'protected\s+void\s+onCreate\s*\([^()]*\)\s*\{')
+    
+    setcontentview_pattern = SharedPattern(r'setContentView\s*\([^()]*\)\s*;', re.MULTILINE)
+    
+    setcontentview_call_pattern = SharedPattern(r'setContentView\s*\(')
+    
+    # 无参数的getLayoutId方法（NewBaseActivity的典型特征）
+    get_layout_id_pattern = SharedPattern(r'public\s+int\s+getLayoutId\s*\(\s*\)')
+    
+    # 直接继承或实现NewBaseActivity/NewBaseFragment
+    newbase_direct_pattern = SharedPattern(
+        r'extends\s+\w*NewBase(?:Activity|Fragment)'
+        r'|implements\s+(?:(?!implements\s)[^\n])*NewBase(?:Activity|Fragment)',
+        re.MULTILINE
+    )
+    
+    # 第一个public类的类名和父类
+    public_class_pattern = SharedPattern(r'public\s+class\s+(\w+)(?:\s+extends\s+([^\{]+))?')
+    
+    public_class_extends_pattern = SharedPattern(r'public\s+class\s+\w+\s+extends\s+(\w+)')
+    
+    class_extends_pattern = SharedPattern(r'class\s+\w+\s+extends\s+(\w+)')
+    
+    super_call_pattern = SharedPattern(r'super\s*\([^()]*\)\s*;')
+    
+    # View类型的参数
+    view_parameter_pattern = SharedPattern(r'View\s+\w+')
+    
+    # 不适合注入初始化代码的方法：getter/setter、构造器、私有方法
+    accessor_pattern = SharedPattern(r'get[A-Z]|set[A-Z]')
+    constructor_declaration_pattern = SharedPattern(r'public\s+\w+\s*\(')
+    private_method_pattern = SharedPattern(r'private\s+\w+\s+\w+\s*\(')
+    
+    def __init__(self, logger: Optional[Logger] = None):
+        # 调试信息只在日志级别为DEBUG时输出，未提供日志记录器时不输出
+        self.logger = logger
+        self.debug_enabled = logger is not None and logger.is_debug_enabled()
         
-        self.class_end_pattern = re.compile(
-            r'(\s*)\}\s*$',
-            re.MULTILINE
-        )
+        # 最近一次注入所选择的分支，未注入时为None
+        self.last_branch = None
     
     def inject(self, code: str, parsed_data: Dict[str, Any]) -> str:
         """注入初始化代码"""
+        self.last_branch = None
         if not parsed_data.get('has_butterknife', False):
             return code
         
         # 首先移除ButterKnife相关的import语句
         code = self._remove_butterknife_imports(code)
         
-        # 检查是否是Holder类（优先级最高）
-        if self._is_holder_class(code):
-            print("DEBUG: 检测到Holder类，使用Holder特殊处理")
+        branch = self.select_branch(code)
+        self.last_branch = branch
+        
+        if branch == BRANCH_HOLDER:
+            self._debug("检测到Holder类，使用Holder特殊处理")
             code = self._inject_for_holder_class(code, parsed_data)
-        # 检查是否有setContentView（优先级第二，即使继承BaseActivity也要按通用原则处理）
-        elif self._has_setcontentview(code):
-            print("DEBUG: 检测到有setContentView，使用通用迁移处理")
+        elif branch == BRANCH_GENERAL_ACTIVITY:
+            self._debug("检测到有setContentView，使用通用迁移处理")
             code = self._inject_for_general_activity(code, parsed_data)
-        # 检查是否继承自NewBaseActivity或NewBaseFragment（但没有setContentView）
-        elif self._is_newbase_activity(code):
-            print("DEBUG: 检测到继承自NewBaseActivity或NewBaseFragment，使用定制化处理")
+        elif branch == BRANCH_NEWBASE:
+            self._debug("检测到继承自NewBaseActivity或NewBaseFragment，使用定制化处理")
             code = self._inject_for_newbase_activity(code, parsed_data)
         else:
             # 获取需要注入的代码
@@ -68,6 +121,29 @@ class CodeInjector:
         
         return code
     
+    def _debug(self, message: str, *args):
+        """输出调试信息（参数只在启用调试时格式化）"""
+        if self.debug_enabled:
+            self.logger.debug("CodeInjector: " + message, *args)
+    
+    def select_branch(self, code: str) -> str:
+        """
+        选择注入分支
+        
+        Returns:
+            holder / general_activity / newbase / oncreate_only
+        """
+        # 检查是否是Holder类（优先级最高）
+        if self._is_holder_class(code):
+            return BRANCH_HOLDER
+        # 检查是否有setContentView（优先级第二，即使继承BaseActivity也要按通用原则处理）
+        if self._has_setcontentview(code):
+            return BRANCH_GENERAL_ACTIVITY
+        # 检查是否继承自NewBaseActivity或NewBaseFragment（但没有setContentView）
+        if self._is_newbase_activity(code):
+            return BRANCH_NEWBASE
+        return BRANCH_ONCREATE_ONLY
+    
     def _generate_injection_code(self, parsed_data: Dict[str, Any]) -> str:
         """生成需要注入的代码"""
         lines = []
@@ -250,22 +326,12 @@ class CodeInjector:
     def _is_newbase_activity(self, code: str) -> bool:
         """检查是否继承自NewBaseActivity或NewBaseFragment（递归检查继承链）"""
         # 首先检查直接继承
-        direct_patterns = [
-            r'extends\s+NewBaseActivity',
-            r'extends\s+\w*NewBaseActivity',
-            r'extends\s+NewBaseFragment',
-            r'extends\s+\w*NewBaseFragment',
-            r'implements\s+.*NewBaseActivity',
-            r'implements\s+.*NewBaseFragment'
-        ]
-        
-        for pattern in direct_patterns:
-            if re.search(pattern, code, re.MULTILINE):
-                return True
+        if self.newbase_direct_pattern.search(code):
+            return True
         
         # 检查是否有getLayoutId方法（NewBaseActivity的典型特征）
         # 必须是无参数的getLayoutId方法，不是getLayoutId(int viewType)
-        if re.search(r'public\s+int\s+getLayoutId\s*\(\s*\)', code, re.MULTILINE):
+        if self.get_layout_id_pattern.search(code):
             return True
         
         # 如果没有直接继承，递归检查继承链
@@ -274,7 +340,7 @@ class CodeInjector:
     def _is_holder_class(self, code: str) -> bool:
         """检查是否是Holder类（继承自BaseHolder或RecyclerView.ViewHolder）"""
         # 只检查最外层的类（第一个class声明）
-        first_class_match = re.search(r'public\s+class\s+(\w+)(?:\s+extends\s+([^\{]+))?', code)
+        first_class_match = self.public_class_pattern.search(code)
         if not first_class_match:
             return False
         
@@ -407,68 +473,29 @@ class CodeInjector:
     
     def _inject_for_holder_class(self, code: str, parsed_data: Dict[str, Any]) -> str:
         """为Holder类注入初始化代码"""
-        # 首先移除ButterKnife注解
-        code = self._remove_butterknife_annotations(code, parsed_data)
+        # 移除ButterKnife注解和构造器中的注入都针对原始代码记录，最后一次性拼接
+        buffer = EditBuffer(code)
+        self._record_annotation_removals(buffer, code, parsed_data)
         
         # 生成Holder类的初始化代码
         holder_code = self._generate_holder_injection_code(parsed_data)
         
         if not holder_code:
-            return code
-        
-        # 查找构造器方法
-        constructor_pattern = re.compile(
-            r'public\s+\w+\s*\([^)]*View\s+\w+[^)]*\)\s*\{',
-            re.MULTILINE
-        )
+            return buffer.apply()
         
-        match = constructor_pattern.search(code)
-        if match:
-            # 找到构造器，在构造器内部注入代码
-            constructor_start = match.end()
-            
-            # 查找构造器的结束位置
-            brace_count = 1
-            constructor_end = constructor_start
-            
-            for i, char in enumerate(code[constructor_start:], constructor_start):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        constructor_end = i
-                        break
-            
-            # 在构造器内部注入代码
-            before_constructor = code[:constructor_start]
-            after_constructor = code[constructor_end:]
-            
-            # 检查构造器内部是否已经有初始化代码
-            constructor_content = code[constructor_start:constructor_end]
-            
-            # 查找super调用
-            super_call_pattern = re.compile(r'super\s*\([^)]*\)\s*;')
-            super_match = super_call_pattern.search(constructor_content)
-            
-            if super_match:
-                # 如果有super调用，在super调用后添加初始化代码
-                super_end = super_match.end()
-                return (before_constructor + 
-                       constructor_content[:super_end] + 
-                       '\n' + holder_code + 
-                       constructor_content[super_end:] + 
-                       after_constructor)
-            else:
-                # 如果没有super调用，直接在构造器开始后添加
-                return before_constructor + '\n' + holder_code + constructor_content + after_constructor
+        # 在Holder类带View参数的构造器中注入代码（super调用之后或构造器开头）
+        holder_class = build_file_model(code).main_class
+        if holder_class is not None:
+            insert_position = self._find_holder_constructor_insertion(code, holder_class['start'], holder_class['end'])
+            if insert_position != -1 and not buffer.conflicts(insert_position):
+                buffer.insert(insert_position, '\n' + holder_code)
         
-        return code
+        return buffer.apply()
     
     def _check_inheritance_chain(self, code: str) -> bool:
         """递归检查继承链中是否包含NewBaseActivity或NewBaseFragment"""
         # 查找当前类的extends声明
-        extends_match = re.search(r'class\s+\w+\s+extends\s+(\w+)', code)
+        extends_match = self.class_extends_pattern.search(code)
         if not extends_match:
             return False
         
@@ -531,39 +558,37 @@ class CodeInjector:
         # 检查方法是否已存在，如果存在则更新，否则创建
         if injection_codes['init_view']:
             if self._has_init_view_method(code):
-                print("DEBUG: initView方法已存在，更新其内容")
+                self._debug("initView方法已存在，更新其内容")
                 code = self._update_init_view_method(code, injection_codes['init_view'])
             else:
-                print("DEBUG: 创建新的initView方法")
+                self._debug("创建新的initView方法")
                 code = self._create_init_view_method(code, injection_codes['init_view'])
         
         if injection_codes['init_listener']:
             if self._has_init_listener_method(code):
-                print("DEBUG: initListener方法已存在，更新其内容")
+                self._debug("initListener方法已存在，更新其内容")
                 code = self._update_init_listener_method(code, injection_codes['init_listener'])
             else:
-                print("DEBUG: 创建新的initListener方法")
+                self._debug("创建新的initListener方法")
                 code = self._create_init_listener_method(code, injection_codes['init_listener'])
         
         return code
     
     def _remove_butterknife_annotations(self, code: str, parsed_data: Dict[str, Any]) -> str:
         """移除ButterKnife注解"""
-        import re
-        
-        # 移除@BindView注解
-        bind_views = parsed_data.get('bind_views', [])
-        for bind_view in bind_views:
-            original_line = bind_view.get('original_line', '')
-            if original_line in code:
-                code = code.replace(original_line, '')
-        
-        # 移除@OnClick注解
-        on_clicks = parsed_data.get('on_clicks', [])
-        for on_click in on_clicks:
-            original_line = on_click.get('original_line', '')
-            if original_line in code:
-                code = code.replace(original_line, '')
+        # 所有删除都针对原始代码记录，最后一次性拼接
+        buffer = EditBuffer(code)
+        self._record_annotation_removals(buffer, code, parsed_data)
+        return buffer.apply()
+    
+    def _record_annotation_removals(self, buffer: EditBuffer, code: str, parsed_data: Dict[str, Any]):
+        """在编辑缓冲区中记录ButterKnife注解的删除"""
+        # 移除@BindView注解和@OnClick注解
+        for key in ('bind_views', 'on_clicks'):
+            for annotation in parsed_data.get(key, []):
+                original_line = annotation.get('original_line', '')
+                if original_line:
+                    self._delete_matches(buffer, re.finditer(re.escape(original_line), code))
         
         # 移除@OnLongClick注解
         on_long_clicks = parsed_data.get('on_long_clicks', [])
@@ -571,18 +596,23 @@ class CodeInjector:
             original_line = on_long_click.get('original_line', '')
             # 使用正则表达式匹配，忽略缩进，并删除整行包括换行符
             pattern = re.escape(original_line.strip())
-            code = re.sub(r'^\s*' + pattern + r'\s*\n?', '', code, flags=re.MULTILINE)
-        
-        return code
+            self._delete_matches(buffer, re.finditer(r'^\s*' + pattern + r'\s*\n?', code, flags=re.MULTILINE))
+    
+    def _delete_matches(self, buffer: EditBuffer, matches):
+        """删除匹配到的文本，跳过已被其它编辑覆盖的位置"""
+        for match in matches:
+            length = match.end() - match.start()
+            if length and not buffer.conflicts(match.start(), length):
+                buffer.delete(match.start(), length)
     
     def _has_setcontentview(self, code: str) -> bool:
         """检查是否有setContentView调用（本地或父类中）"""
         # 检查本地是否有setContentView
-        if re.search(r'setContentView\s*\(', code):
+        if self.setcontentview_call_pattern.search(code):
             return True
         
         # 检查父类是否有setContentView（通过检查是否有getLayoutId方法）
-        if re.search(r'public\s+int\s+getLayoutId\s*\(\s*\)', code):
+        if self.get_layout_id_pattern.search(code):
             return True
         
         # 检查是否是常见的基类（这些基类通常有setContentView）
@@ -592,7 +622,7 @@ class CodeInjector:
         ]
         
         # 查找类定义
-        class_match = re.search(r'public\s+class\s+\w+\s+extends\s+(\w+)', code)
+        class_match = self.public_class_extends_pattern.search(code)
         if class_match:
             parent_class = class_match.group(1)
             if parent_class in common_activity_classes:
@@ -616,25 +646,25 @@ class CodeInjector:
         # 原则1: View初始化必须在initViews方法中
         if init_views_code:
             if has_existing_initviews:
-                print("DEBUG: initViews方法已存在，更新其内容")
+                self._debug("initViews方法已存在，更新其内容")
                 code = self._update_method(code, 'initViews', init_views_code)
             else:
-                print("DEBUG: 创建新的initViews方法")
+                self._debug("创建新的initViews方法")
                 code = self._create_method(code, 'initViews', init_views_code, 'protected')
         
         # 原则2: 监听器设置必须在initListener方法中
         if init_listener_code:
             if has_existing_initlistener:
-                print("DEBUG: initListener方法已存在，更新其内容")
+                self._debug("initListener方法已存在，更新其内容")
                 code = self._update_method(code, 'initListener', init_listener_code)
             else:
-                print("DEBUG: 创建新的initListener方法")
+                self._debug("创建新的initListener方法")
                 code = self._create_method(code, 'initListener', init_listener_code, 'public')
         
         # 原则3: 如果有setContentView，initViews和initListener的调用需要在setContentView下面
         # 原则4: 确保不会在onCreate中直接注入View初始化和监听器代码
         if init_views_code or init_listener_code:
-            print("DEBUG: 在onCreate中注入initViews和initListener方法调用")
+            self._debug("在onCreate中注入initViews和initListener方法调用")
             code = self._inject_method_calls_in_oncreate(code)
         
         # 清理onCreate方法中可能存在的重复findViewById代码和监听器设置
@@ -644,29 +674,20 @@ class CodeInjector:
     
     def _clean_duplicate_findview_in_oncreate(self, code: str, parsed_data: Dict[str, Any]) -> str:
         """清理onCreate方法中重复的findViewById代码和OnClickListener设置"""
-        print("DEBUG: 开始清理onCreate方法中重复的UI初始化代码")
+        self._debug("开始清理onCreate方法中重复的UI初始化代码")
         
         # 查找onCreate方法
-        onCreate_pattern = r'protected\s+void\s+onCreate\s*\([^)]*\)\s*\{'
-        match = re.search(onCreate_pattern, code)
+        match = self.oncreate_declaration_pattern.search(mask_java(code))
         
         if not match:
-            print("DEBUG: 没有找到onCreate方法")
+            self._debug("没有找到onCreate方法")
             return code
         
         # 查找onCreate方法的结束位置
         start_pos = match.end()
-        brace_count = 1
-        end_pos = start_pos
-        
-        for i in range(start_pos, len(code)):
-            if code[i] == '{':
-                brace_count += 1
-            elif code[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_pos = i
-                    break
+        end_pos = tokenize_java(code).find_balance_point(start_pos, depth=1)
+        if end_pos == -1:
+            end_pos = start_pos
         
         # 获取onCreate方法的内容
         onCreate_content = code[start_pos:end_pos]
@@ -695,7 +716,7 @@ class CodeInjector:
                 # 检查是否是UI变量
                 if var_name in ui_variables:
                     lines_to_remove.append(i)
-                    print(f"DEBUG: 标记删除重复的findViewById行: {line_stripped}")
+                    self._debug("标记删除重复的findViewById行: %s", line_stripped)
             
             # 检查是否是重复的findViewById调用（精确匹配）
             elif 'findViewById(' in line_stripped and '=' in line_stripped:
@@ -705,7 +726,7 @@ class CodeInjector:
                     # 检查是否是UI变量
                     if var_name in ui_variables:
                         lines_to_remove.append(i)
-                        print(f"DEBUG: 标记删除重复的findViewById行: {line_stripped}")
+                        self._debug("标记删除重复的findViewById行: %s", line_stripped)
             
             # 检查是否是重复的findViewById调用（处理各种缩进格式）
             elif 'findViewById(' in line and '=' in line:
@@ -714,7 +735,7 @@ class CodeInjector:
                 # 检查是否是UI变量
                 if var_name in ui_variables:
                     lines_to_remove.append(i)
-                    print(f"DEBUG: 标记删除重复的findViewById行: {line_stripped}")
+                    self._debug("标记删除重复的findViewById行: %s", line_stripped)
             
             # 检查是否是重复的OnClickListener设置
             elif 'setOnClickListener(' in line_stripped:
@@ -737,7 +758,7 @@ class CodeInjector:
                                     for k in range(i, j + 1):
                                         if k not in lines_to_remove:
                                             lines_to_remove.append(k)
-                                            print(f"DEBUG: 标记删除OnClickListener行: {lines[k].strip()}")
+                                            self._debug("标记删除OnClickListener行: %s", lines[k].strip())
                                     i = j  # 跳过已处理的块
                                     break
                             j += 1
@@ -760,7 +781,7 @@ class CodeInjector:
                                 for k in range(i, j + 1):
                                     if k not in lines_to_remove:
                                         lines_to_remove.append(k)
-                                        print(f"DEBUG: 标记删除OnClickListener行: {lines[k].strip()}")
+                                        self._debug("标记删除OnClickListener行: %s", lines[k].strip())
                                 i = j  # 跳过已处理的块
                                 break
                         j += 1
@@ -778,9 +799,9 @@ class CodeInjector:
                     
                     if not is_onclick_brace:
                         lines_to_remove.append(i)
-                        print(f"DEBUG: 标记删除多余的结束括号: {line_stripped}")
+                        self._debug("标记删除多余的结束括号: %s", line_stripped)
                     else:
-                        print(f"DEBUG: 保留OnClickListener的闭括号: {line_stripped}")
+                        self._debug("保留OnClickListener的闭括号: %s", line_stripped)
             
             i += 1
         
@@ -790,12 +811,12 @@ class CodeInjector:
                 del lines[i]
         
         if lines_to_remove:
-            print(f"DEBUG: 删除了 {len(lines_to_remove)} 行重复的UI初始化代码")
+            self._debug("删除了 %s 行重复的UI初始化代码", len(lines_to_remove))
             # 重新构建onCreate方法
             new_oncreate_content = '\n'.join(lines)
             return code[:start_pos] + new_oncreate_content + code[end_pos:]
         else:
-            print("DEBUG: 没有找到需要清理的重复UI初始化代码")
+            self._debug("没有找到需要清理的重复UI初始化代码")
             return code
     
     def _generate_init_views_for_general_activity(self, parsed_data: Dict[str, Any]) -> str:
@@ -855,10 +876,19 @@ class CodeInjector:
         
         return '\n'.join(lines)
     
+    @staticmethod
+    def _method_declaration_pattern(method_name: str) -> str:
+        """
+        方法声明的正则：修饰符 ... 方法名(
+        修饰符与方法名之间的部分不跨行，遇到下一个修饰符就停止并由那里的匹配接手，长行上不会反复回溯
+        """
+        return (r'(public|protected|private)'
+                r'(?:\s+\S(?:(?:(?!(?:public|protected|private)\s)[^\n])*\S)?\s+|\s\s+)'
+                rf'{re.escape(method_name)}\s*\(')
+    
     def _has_method(self, code: str, method_name: str) -> bool:
         """检查方法是否存在"""
-        pattern = rf'(public|protected|private)\s+.*\s+{re.escape(method_name)}\s*\('
-        return bool(re.search(pattern, code))
+        return bool(re.search(self._method_declaration_pattern(method_name), code))
     
     def _update_method(self, code: str, method_name: str, new_content: str) -> str:
         """更新现有方法的内容 - 在现有代码末尾追加"""
@@ -868,9 +898,10 @@ class CodeInjector:
         brace_count = 0
         in_method = False
         
+        declaration_pattern = re.compile(self._method_declaration_pattern(method_name))
         for i, line in enumerate(lines):
             # 查找方法开始
-            if re.search(rf'(public|protected|private)\s+.*\s+{re.escape(method_name)}\s*\(', line):
+            if declaration_pattern.search(line):
                 method_start = i
                 in_method = True
                 # 开始计算大括号
@@ -896,7 +927,7 @@ class CodeInjector:
         if method_start != -1 and method_end != -1:
             # 对于initListener方法，完全替换内容以避免重复代码
             if method_name == 'initListener':
-                print(f"DEBUG: 完全替换{method_name}方法内容")
+                self._debug("完全替换%s方法内容", method_name)
                 new_content_lines = new_content.split('\n')
                 new_lines = lines[:method_start+1] + new_content_lines + lines[method_end:]
                 return '\n'.join(new_lines)
@@ -905,7 +936,7 @@ class CodeInjector:
             # 检查是否已经有ButterKnife迁移的注释，避免重复添加
             existing_content = '\n'.join(lines[method_start + 1:method_end])
             if "// 初始化View绑定 - 替换@BindView注解" in existing_content or "// 初始化点击事件 - 替换@OnClick注解" in existing_content:
-                print(f"DEBUG: {method_name}方法中已存在ButterKnife迁移代码，跳过追加")
+                self._debug("%s方法中已存在ButterKnife迁移代码，跳过追加", method_name)
                 return code
             
             # 检查是否已经有相同的findViewById代码，避免重复添加
@@ -914,7 +945,7 @@ class CodeInjector:
                 new_lines_list = new_content.split('\n')
                 for new_line in new_lines_list:
                     if 'findViewById(' in new_line and new_line.strip() in existing_content:
-                        print(f"DEBUG: {method_name}方法中已存在相同的findViewById调用，跳过重复添加")
+                        self._debug("%s方法中已存在相同的findViewById调用，跳过重复添加", method_name)
                         return code
             
             # 在方法结束前追加新内容，保持原有代码
@@ -927,21 +958,21 @@ class CodeInjector:
         """创建新方法"""
         # 查找类的结束位置
         class_end = self._find_class_end(code)
-        print(f"DEBUG: 查找类结束位置: {class_end}")
+        self._debug("查找类结束位置: %s", class_end)
         if class_end == -1:
-            print("DEBUG: 未找到类结束位置，尝试使用备用方法")
+            self._debug("未找到类结束位置，尝试使用备用方法")
             # 备用方法：查找最后一个独立的}
             last_brace = code.rfind('}')
             if last_brace != -1:
                 class_end = last_brace + 1
-                print(f"DEBUG: 使用备用方法找到类结束位置: {class_end}")
+                self._debug("使用备用方法找到类结束位置: %s", class_end)
             else:
-                print("DEBUG: 无法找到类结束位置，无法创建方法")
+                self._debug("无法找到类结束位置，无法创建方法")
                 return code
         
         # 生成方法
         method = f"\n    {visibility} void {method_name}() {{\n{content}\n    }}"
-        print(f"DEBUG: 创建方法: {method}")
+        self._debug("创建方法: %s", method)
         
         # 在类结束前插入方法（在最后一个}之前）
         # 使用字符位置而不是行号，更精确
@@ -952,119 +983,33 @@ class CodeInjector:
     
     def _find_class_end(self, code: str) -> int:
         """查找主类的结束位置（排除内部类）"""
-        # 首先找到主类的开始位置（支持public和默认访问修饰符）
-        main_class_match = re.search(r'(?:public\s+)?class\s+\w+.*?\{', code, re.DOTALL)
-        print(f"DEBUG: 主类匹配结果: {main_class_match}")
-        if not main_class_match:
-            print("DEBUG: 未找到主类定义")
+        # 主类（支持public和默认访问修饰符）的区间来自结构模型，内部类已被正确嵌套
+        main_class = build_file_model(code).main_class
+        self._debug("主类匹配结果: %s", main_class['name'] if main_class else None)
+        if not main_class or main_class['body_end'] >= len(code):
+            self._debug("未找到主类定义")
             return -1
         
-        # 从主类开始位置开始计算大括号
-        start_pos = main_class_match.end() - 1  # 回到开括号位置
-        print(f"DEBUG: 主类开始位置: {start_pos}")
-        brace_count = 1
-        in_string = False
-        string_char = None
-        in_comment = False
-        in_single_line_comment = False
-        
-        for i in range(start_pos + 1, len(code)):
-            char = code[i]
-            
-            # 处理单行注释
-            if not in_string and not in_comment and not in_single_line_comment:
-                if i < len(code) - 1 and code[i:i+2] == '//':
-                    in_single_line_comment = True
-                    continue
-            elif in_single_line_comment:
-                if char == '\n':
-                    in_single_line_comment = False
-                continue
-            
-            # 处理多行注释
-            if not in_string and not in_comment and not in_single_line_comment:
-                if i < len(code) - 1 and code[i:i+2] == '/*':
-                    in_comment = True
-                    continue
-            elif in_comment:
-                if i < len(code) - 1 and code[i:i+2] == '*/':
-                    in_comment = False
-                    continue
-                continue
-            
-            # 处理字符串字面量
-            if char == '"' or char == "'":
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-                continue
-            
-            if in_string or in_comment or in_single_line_comment:
-                continue
-            
-            # 检查是否遇到内部类定义
-            if char == '}':
-                # 检查这个}是否是主类的结束
-                if brace_count == 1:
-                    print(f"DEBUG: 找到可能的类结束位置: {i}, 剩余代码: {code[i+1:i+50]}")
-                    # 检查}后面是否还有内容（内部类）
-                    remaining_code = code[i+1:].strip()
-                    if remaining_code and not remaining_code.startswith('}'):
-                        # 如果还有内容，检查是否是内部类
-                        # 跳过空白字符和注释
-                        j = i + 1
-                        while j < len(code) and code[j] in ' \t\n\r':
-                            j += 1
-                        
-                        # 检查是否是内部类定义
-                        if j < len(code) - 1:
-                            # 检查是否是class关键字
-                            if (code[j:j+5] == 'class' or 
-                                (j < len(code) - 10 and 'class' in code[j:j+10])):
-                                print(f"DEBUG: 发现内部类，继续寻找主类结束")
-                                # 这是内部类，继续寻找主类结束
-                                brace_count -= 1
-                                continue
-                    
-                    # 找到主类结束位置
-                    print(f"DEBUG: 找到主类结束位置: {i + 1}")
-                    return i + 1
-                else:
-                    brace_count -= 1
-            elif char == '{':
-                brace_count += 1
-        
-        return -1
+        self._debug("找到主类结束位置: %s", main_class['end'])
+        return main_class['end']
     
     def _inject_method_calls_in_oncreate(self, code: str) -> str:
         """在onCreate方法中注入initViews和initListener调用"""
-        print("DEBUG: 开始注入initViews和initListener调用")
+        self._debug("开始注入initViews和initListener调用")
         # 查找onCreate方法
-        onCreate_pattern = r'protected\s+void\s+onCreate\s*\([^)]*\)\s*\{'
-        match = re.search(onCreate_pattern, code)
+        match = self.oncreate_declaration_pattern.search(mask_java(code))
         
         if not match:
-            print("DEBUG: 没有找到onCreate方法")
+            self._debug("没有找到onCreate方法")
             return code
         
-        print(f"DEBUG: 找到onCreate方法，位置: {match.start()}-{match.end()}")
+        self._debug("找到onCreate方法，位置: %s-%s", match.start(), match.end())
         
         # 查找onCreate方法的结束位置
         start_pos = match.end()
-        brace_count = 1
-        end_pos = start_pos
-        
-        for i in range(start_pos, len(code)):
-            if code[i] == '{':
-                brace_count += 1
-            elif code[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_pos = i
-                    break
+        end_pos = tokenize_java(code).find_balance_point(start_pos, depth=1)
+        if end_pos == -1:
+            end_pos = start_pos
         
         # 检查onCreate方法中是否已经存在调用
         onCreate_content = code[start_pos:end_pos]
@@ -1072,21 +1017,20 @@ class CodeInjector:
         has_initviews = 'initViews();' in onCreate_content
         has_initlistener = 'initListener();' in onCreate_content
         if has_initviews and has_initlistener:
-            print("DEBUG: onCreate方法中initViews和initListener调用已存在，跳过注入")
+            self._debug("onCreate方法中initViews和initListener调用已存在，跳过注入")
             return code
         
         # 查找setContentView调用，确保initViews和initListener调用在setContentView下面
-        setcontentview_pattern = re.compile(r'setContentView\s*\([^)]*\)\s*;', re.MULTILINE)
-        setcontentview_match = setcontentview_pattern.search(code, start_pos, end_pos)
+        setcontentview_match = self.setcontentview_pattern.search(mask_java(code), start_pos, end_pos)
         
         if setcontentview_match:
             # 在setContentView之后注入方法调用
             injection_position = setcontentview_match.end()
-            print(f"DEBUG: 在setContentView之后注入方法调用，位置: {injection_position}")
+            self._debug("在setContentView之后注入方法调用，位置: %s", injection_position)
         else:
             # 如果没有找到setContentView，在onCreate方法末尾注入
             injection_position = end_pos
-            print("DEBUG: 没有找到setContentView，在onCreate方法末尾注入")
+            self._debug("没有找到setContentView，在onCreate方法末尾注入")
         
         # 在onCreate方法中添加调用
         if has_initviews and not has_initlistener:
@@ -1111,8 +1055,9 @@ class CodeInjector:
         """处理内部类中的@BindView注解"""
         bind_views = parsed_data.get('bind_views', [])
         
-        # 查找所有内部类
+        # 查找所有内部类（注入位置都基于同一份代码记录在编辑缓冲区中）
         inner_classes = self._find_inner_classes(code)
+        buffer = EditBuffer(code)
         
         for inner_class in inner_classes:
             class_name = inner_class['name']
@@ -1134,9 +1079,11 @@ class CodeInjector:
                     holder_code = self._generate_holder_injection_code({'bind_views': holder_bind_views, 'on_clicks': []})
                     
                     # 在Holder类的构造器中注入代码
-                    code = self._inject_in_holder_constructor(code, class_start, class_end, holder_code)
+                    insert_position = self._find_holder_constructor_insertion(code, class_start, class_end)
+                    if insert_position != -1:
+                        buffer.insert(insert_position, '\n' + holder_code)
         
-        return code
+        return buffer.apply()
     
     def _get_holder_specific_fields(self, code: str, class_name: str, class_start: int, class_end: int, bind_views: List[Dict]) -> List[Dict]:
         """获取特定Holder类中的字段"""
@@ -1160,91 +1107,48 @@ class CodeInjector:
         """查找所有内部类"""
         inner_classes = []
         
-        # 查找所有class声明
-        class_pattern = re.compile(r'class\s+(\w+)(?:\s+extends\s+([\w.]+))?', re.MULTILINE)
-        matches = class_pattern.finditer(code)
-        
-        for match in matches:
-            class_name = match.group(1)
-            extends = match.group(2) if match.group(2) else ''
-            
-            # 跳过最外层的类（查找第一个class声明）
-            first_class_match = re.search(r'public\s+class\s+\w+', code)
-            if first_class_match and match.start() <= first_class_match.end():
-                continue
-            
-            # 查找类的结束位置
-            brace_count = 0
-            class_end = match.end()
-            in_class = False
-            
-            for i, char in enumerate(code[match.end():], match.end()):
-                if char == '{':
-                    brace_count += 1
-                    in_class = True
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0 and in_class:
-                        class_end = i + 1
-                        break
-            
+        # 结构模型中主类之后声明的具名类即为内部类
+        for member in build_file_model(code).inner_classes:
             inner_classes.append({
-                'name': class_name,
-                'extends': extends,
-                'start': match.start(),
-                'end': class_end
+                'name': member['name'],
+                'extends': member['extends'],
+                'start': member['start'],
+                'end': member['end']
             })
         
         return inner_classes
     
-    def _inject_in_holder_constructor(self, code: str, class_start: int, class_end: int, holder_code: str) -> str:
-        """在Holder类的构造器中注入代码"""
+    def _find_holder_constructor_insertion(self, code: str, class_start: int, class_end: int) -> int:
+        """查找Holder类构造器中的注入位置（super调用之后或构造器开头），不需要注入时返回-1"""
         class_content = code[class_start:class_end]
         
         # 检查是否已经注入了代码
         if '// 初始化View绑定 - 替换@BindView注解' in class_content:
-            return code
+            return -1
         
-        # 查找构造器
-        constructor_pattern = re.compile(r'public\s+\w+\s*\([^)]*View\s+\w+[^)]*\)\s*\{', re.MULTILINE)
-        constructor_match = constructor_pattern.search(class_content)
+        # 查找带View参数的public构造器
+        model = build_file_model(code)
+        holder_class = model.member_at(class_start)
+        constructors = []
+        if holder_class is not None:
+            constructors = [
+                constructor for constructor in model.children_of(holder_class, ('constructor',))
+                if 'public' in constructor['modifiers'] and self.view_parameter_pattern.search(constructor['parameters'])
+            ]
+        
+        if not constructors:
+            return -1
         
-        if constructor_match:
-            constructor_start = class_start + constructor_match.end()
-            
-            # 查找构造器的结束位置
-            brace_count = 1
-            constructor_end = constructor_start
-            
-            for i, char in enumerate(code[constructor_start:], constructor_start):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        constructor_end = i
-                        break
-            
-            # 在构造器内部注入代码
-            before_constructor = code[:constructor_start]
-            after_constructor = code[constructor_end:]
-            
-            # 查找super调用
-            constructor_content = code[constructor_start:constructor_end]
-            super_call_pattern = re.compile(r'super\s*\([^)]*\)\s*;')
-            super_match = super_call_pattern.search(constructor_content)
-            
-            if super_match:
-                super_end = constructor_start + super_match.end()
-                return (before_constructor + 
-                       constructor_content[:super_match.end()] + 
-                       '\n' + holder_code + 
-                       constructor_content[super_match.end():] + 
-                       after_constructor)
-            else:
-                return before_constructor + '\n' + holder_code + constructor_content + after_constructor
+        constructor_start = constructors[0]['body_start'] + 1
+        constructor_end = constructors[0]['body_end']
         
-        return code
+        # 查找super调用
+        constructor_content = code[constructor_start:constructor_end]
+        super_match = self.super_call_pattern.search(constructor_content)
+        
+        if super_match:
+            return constructor_start + super_match.end()
+        return constructor_start
     
     def _has_init_view_method(self, code: str) -> bool:
         """检查是否已存在initViews方法"""
@@ -1470,31 +1374,9 @@ class CodeInjector:
     
     def _find_method_end(self, code: str, start_pos: int) -> int:
         """查找方法体结束位置"""
-        brace_count = 0
-        in_string = False
-        string_char = None
-        
-        for i, char in enumerate(code[start_pos:], start_pos):
-            # 处理字符串字面量
-            if char == '"' or char == "'":
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-                continue
-            
-            if in_string:
-                continue
-            
-            # 处理大括号
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    return i + 1
+        balance_point = tokenize_java(code).find_balance_point(start_pos)
+        if balance_point != -1:
+            return balance_point + 1
         
         # 如果没有找到匹配的结束大括号，返回代码末尾
         return len(code)
@@ -1502,27 +1384,12 @@ class CodeInjector:
     def _find_oncreate_method_end(self, code: str, start_pos: int) -> int:
         """专门查找onCreate方法的结束位置，使用更精确的算法"""
         brace_count = 0
-        in_string = False
-        string_char = None
-        
-        for i, char in enumerate(code[start_pos:], start_pos):
-            # 处理字符串字面量
-            if char == '"' or char == "'":
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-                continue
-            
-            if in_string:
-                continue
-            
+        
+        for i, is_open in tokenize_java(code).iter_braces(start_pos):
             # 处理大括号
-            if char == '{':
+            if is_open:
                 brace_count += 1
-            elif char == '}':
+            else:
                 brace_count -= 1
                 if brace_count == 0:
                     # 找到onCreate方法结束位置
@@ -1538,15 +1405,15 @@ class CodeInjector:
     def _is_suitable_method_for_injection(self, method_content: str) -> bool:
         """检查方法是否适合注入初始化代码"""
         # 排除getter/setter方法
-        if re.search(r'get[A-Z]|set[A-Z]', method_content):
+        if self.accessor_pattern.search(method_content):
             return False
         
         # 排除构造函数
-        if re.search(r'public\s+\w+\s*\(', method_content):
+        if self.constructor_declaration_pattern.search(method_content):
             return False
         
         # 排除私有方法
-        if re.search(r'private\s+\w+\s+\w+\s*\(', method_content):
+        if self.private_method_pattern.search(method_content):
             return False
         
         return True
@@ -1590,54 +1457,54 @@ class CodeInjector:
     
     def _inject_in_oncreate_only(self, code: str, injection_code: str) -> str:
         """只在onCreate方法中注入代码，不创建新方法"""
-        print(f"DEBUG: 尝试在onCreate方法中注入代码")
-        print(f"DEBUG: 注入代码长度: {len(injection_code)}")
+        self._debug("尝试在onCreate方法中注入代码")
+        self._debug("注入代码长度: %s", len(injection_code))
         
-        match = self.onCreate_pattern.search(code)
+        match = self.onCreate_pattern.search(mask_java(code))
         if not match:
-            print(f"DEBUG: 没有找到onCreate方法")
+            self._debug("没有找到onCreate方法")
             return code
         
-        print(f"DEBUG: 找到onCreate方法，位置: {match.start()}-{match.end()}")
-        print(f"DEBUG: onCreate方法内容: {repr(match.group(0))}")
+        self._debug("找到onCreate方法，位置: %s-%s", match.start(), match.end())
+        if self.debug_enabled:
+            self._debug("onCreate方法内容: %r", code[match.start():match.end()])
         
         method_start = match.end()
         
         # 查找setContentView之后的位置，在那里注入代码
-        setcontentview_pattern = re.compile(r'setContentView\s*\([^)]*\)\s*;', re.MULTILINE)
-        setcontentview_match = setcontentview_pattern.search(code, method_start)
+        setcontentview_match = self.setcontentview_pattern.search(mask_java(code), method_start)
         
         if setcontentview_match:
             # 在setContentView之后注入代码
             injection_position = setcontentview_match.end()
-            print(f"DEBUG: 在setContentView之后注入代码，位置: {injection_position}")
+            self._debug("在setContentView之后注入代码，位置: %s", injection_position)
             
             before_injection = code[:injection_position]
             after_injection = code[injection_position:]
             
             if not self._has_injection_code(before_injection, injection_code):
-                print(f"DEBUG: 注入代码到setContentView之后")
+                self._debug("注入代码到setContentView之后")
                 result = before_injection + '\n' + injection_code + '\n' + after_injection
-                print(f"DEBUG: 注入后的代码长度: {len(result)}")
+                self._debug("注入后的代码长度: %s", len(result))
                 return result
             else:
-                print(f"DEBUG: 代码已经存在，跳过注入")
+                self._debug("代码已经存在，跳过注入")
         else:
             # 如果没有找到setContentView，在onCreate方法末尾注入
             method_end = self._find_oncreate_method_end(code, method_start)
-            print(f"DEBUG: 没有找到setContentView，在onCreate方法末尾注入，位置: {method_end}")
+            self._debug("没有找到setContentView，在onCreate方法末尾注入，位置: %s", method_end)
             
             if method_end > method_start:
                 before_end = code[:method_end]
                 after_end = code[method_end:]
                 
                 if not self._has_injection_code(before_end, injection_code):
-                    print(f"DEBUG: 注入代码到onCreate方法末尾")
+                    self._debug("注入代码到onCreate方法末尾")
                     result = before_end + '\n' + injection_code + '\n    ' + after_end
-                    print(f"DEBUG: 注入后的代码长度: {len(result)}")
+                    self._debug("注入后的代码长度: %s", len(result))
                     return result
                 else:
-                    print(f"DEBUG: 代码已经存在，跳过注入")
+                    self._debug("代码已经存在，跳过注入")
         
         return code
     
@@ -1670,7 +1537,7 @@ class CodeInjector:
             if stripped_line.startswith('import'):
                 # 精确匹配以import butterknife开头的语句
                 if stripped_line.startswith('import butterknife'):
-                    print(f"DEBUG: 移除ButterKnife import语句: {stripped_line}")
+                    self._debug("移除ButterKnife import语句: %s", stripped_line)
                     continue
                 # 也检查其他ButterKnife相关的import（以防有变体）
                 elif ('butterknife' in stripped_line.lower() or 
@@ -1680,7 +1547,7 @@ class CodeInjector:
                           'BindFloat', 'BindBoolean', 'BindArray', 'BindFont', 
                           'BindAnim', 'BindAnimator', 'BindBool'
                       ])):
-                    print(f"DEBUG: 移除ButterKnife相关import语句: {stripped_line}")
+                    self._debug("移除ButterKnife相关import语句: %s", stripped_line)
                     continue
             filtered_lines.append(line)
         
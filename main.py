@@ -6,7 +6,9 @@ ButterKnife迁移工具主控制文件
 """
 
 import argparse
+import copy
 import json
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -17,13 +19,20 @@ sys.path.insert(0, current_dir)
 
 from config import Config
 from scanner.file_scanner import FileScanner
-from butterknife_parser_module.butterknife_parser import ButterKnifeParser
-from transformer.findview_transformer import FindViewTransformer
-from transformer.onclick_transformer import OnClickTransformer
-from transformer.bindcall_remover import BindCallRemover
-from injector.code_injector import CodeInjector
+from scanner.shard import parse_shard, filter_shard
 from writer.file_writer import FileWriter
+from writer.write_journal import WriteJournal, JOURNAL_FILE_NAME, recover_in_flight
+from writer.rollback import rollback_run
+from writer.diff_writer import DiffWriter
 from utils.logger import Logger
+from pipeline.file_pipeline import FilePipeline
+from pipeline.worker_pool import MigrationWorkerPool, resolve_jobs
+from pipeline.stage_timings import StageTimings, measure, round_timings
+from pipeline.scheduler import order_by_cost
+from cache.parse_cache import ParseCache, parser_fingerprint
+from cache.scan_manifest import ScanManifest, scan_settings_key
+from cache.cost_history import CostHistory
+from utils.report_merge import load_reports, merge_reports
 
 
 class ButterKnifeMigrator:
@@ -31,128 +40,172 @@ class ButterKnifeMigrator:
     
     def __init__(self, config: Config):
         self.config = config
-        self.logger = Logger()
+        self.logger = Logger(self._logger_config(config))
         self.scanner = FileScanner(config)
-        self.parser = ButterKnifeParser()
-        self.transformers = [
-            FindViewTransformer(),
-            OnClickTransformer(),
-            BindCallRemover()
-        ]
-        self.injector = CodeInjector()
+        self.pipeline = FilePipeline(config, self.logger)
+        self.parser = self.pipeline.parser
+        self.transformers = self.pipeline.transformers
+        self.injector = self.pipeline.injector
         self.writer = FileWriter(config)
+        self.parse_cache = None
+        self.scan_manifest = None
+        self.timings = None
+        self.journal = None
+        self.diff_writer = None
+        self.cost_history = None
+        # --resume 时上次运行已提交的文件（相对路径）
+        self.resume_committed = set()
         
+    @staticmethod
+    def _logger_config(config: Config) -> Config:
+        """日志配置：预览模式不在项目中写日志文件，控制台日志输出到标准错误，不与输出到标准输出的差异交错"""
+        if not config.DRY_RUN:
+            return config
+        
+        log_config = copy.copy(config)
+        log_config.LOG_FILE = None
+        log_config.LOG_STDERR = True
+        return log_config
+    
     def migrate(self):
         """执行完整的迁移流程"""
         try:
             self.logger.info("开始ButterKnife迁移流程...")
+            self.timings = StageTimings(self.config.REPORT_SLOWEST_FILES)
             
             # 1. 扫描文件
             self.logger.info("步骤1: 扫描项目文件...")
-            java_files = self.scanner.scan_files()
-            self.logger.info(f"找到 {len(java_files)} 个Java文件")
+            if self.config.INCREMENTAL:
+                self.scan_manifest = ScanManifest(
+                    self.config.get_cache_dir(),
+                    scan_settings_key(self.config, parser_fingerprint(self.parser))
+                )
+                with self.timings.stage('scan'):
+                    java_files = self.scanner.scan_changed_files(self.scan_manifest)
+                self.logger.info(
+                    f"增量模式: 共 {len(self.scanner.java_files_cache)} 个Java文件，"
+                    f"其中 {len(java_files)} 个新增或修改"
+                )
+                
+                if not java_files:
+                    if not self.config.DRY_RUN:
+                        self.scan_manifest.save()
+                    self.logger.info("自上次运行以来没有新增或修改的文件，无需迁移")
+                    return
+            else:
+                with self.timings.stage('scan'):
+                    java_files = self.scanner.scan_files()
+                self.logger.info(f"找到 {len(java_files)} 个Java文件")
             
             if not java_files:
                 self.logger.warning("未找到任何Java文件，请检查项目路径配置")
                 return
             
-            # 2. 解析ButterKnife注解
-            self.logger.info("步骤2: 解析ButterKnife注解...")
-            parsed_files = []
-            for file_path in java_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    parsed_data = self.parser.parse(content)
-                    if parsed_data['has_butterknife']:
-                        parsed_files.append({
-                            'path': file_path,
-                            'content': content,
-                            'parsed_data': parsed_data
-                        })
-                        self.logger.info(f"解析文件: {Path(file_path).name}")
-                except Exception as e:
-                    self.logger.error(f"解析文件 {file_path} 时出错: {e}")
-            
-            self.logger.info(f"找到 {len(parsed_files)} 个包含ButterKnife的文件")
+            # 分片执行：只处理按相对路径哈希划分到本分片的文件
+            shard = None
+            if self.config.SHARD:
+                index, count = parse_shard(self.config.SHARD)
+                scanned_count = len(java_files)
+                java_files = filter_shard(java_files, self.config.PROJECT_PATH, index, count)
+                shard = {'index': index, 'count': count, 'files': len(java_files)}
+                self.logger.info(f"分片 {index}/{count}: 处理 {len(java_files)}/{scanned_count} 个文件")
             
-            if not parsed_files:
-                self.logger.info("未找到包含ButterKnife注解的文件，无需迁移")
-                return
+            # 2-5. 逐文件流式处理：每个文件完成解析、转换、注入后立即写入，
+            # 再读取下一个文件，内存中只保留很小的摘要记录
+            jobs = resolve_jobs(self.config.JOBS)
+            if jobs > 1:
+                self.logger.info(f"步骤2-5: 使用 {jobs} 个进程并行解析、转换、注入并写入...")
+            else:
+                self.logger.info("步骤2-5: 逐文件解析、转换、注入并写入...")
             
-            # 3. 转换代码
-            self.logger.info("步骤3: 转换代码...")
-            transformed_files = []
-            for file_info in parsed_files:
-                try:
-                    transformed_content = file_info['content']
-                    for transformer in self.transformers:
-                        transformed_content = transformer.transform(
-                            file_info['parsed_data'], 
-                            transformed_content
-                        )
-                    
-                    transformed_files.append({
-                        'path': file_info['path'],
-                        'original_content': file_info['content'],
-                        'transformed_content': transformed_content,
-                        'parsed_data': file_info['parsed_data']
-                    })
-                except Exception as e:
-                    self.logger.error(f"转换文件 {file_info['path']} 时出错: {e}")
-            
-            # 4. 注入代码
-            self.logger.info("步骤4: 注入初始化代码...")
-            for file_info in transformed_files:
-                try:
-                    final_content = self.injector.inject(
-                        file_info['transformed_content'],
-                        file_info['parsed_data']
-                    )
-                    file_info['final_content'] = final_content
-                except Exception as e:
-                    self.logger.error(f"注入代码到文件 {file_info['path']} 时出错: {e}")
-                    file_info['final_content'] = file_info['transformed_content']
-            
-            # 5. 写入文件
-            self.logger.info("步骤5: 写入转换后的文件...")
             migration_report = {
-                'total_files': len(transformed_files),
+                'total_files': 0,
                 'successful_migrations': 0,
+                'unchanged_files': 0,
                 'failed_migrations': 0,
                 'details': []
             }
             
-            for file_info in transformed_files:
-                try:
-                    success = self.writer.write_file(
-                        file_info['path'],
-                        file_info['final_content']
-                    )
+            if self.config.DRY_RUN:
+                # 预览模式：不读写缓存和写前日志，只输出差异
+                # 并行时文件按完成顺序到达，差异排序后输出，保证结果可复现
+                self.diff_writer = DiffWriter(self.config.PROJECT_PATH, self.config.DIFF_OUTPUT, ordered=jobs > 1)
+            else:
+                self.parse_cache = self._open_parse_cache()
+                self.journal = self._open_journal()
+                if self.config.SCHEDULE == 'lpt':
+                    self.cost_history = CostHistory(self.config.get_cache_dir())
+                self.writer.journal = self.journal
+            details = []
+            try:
+                for record in self._migrate_files(java_files, jobs):
+                    migration_report['total_files'] += 1
                     
-                    if success:
+                    if record['status'] == 'success':
                         migration_report['successful_migrations'] += 1
-                        self.logger.info(f"成功迁移文件: {Path(file_info['path']).name}")
+                    elif record['status'] == 'unchanged':
+                        migration_report['unchanged_files'] += 1
                     else:
                         migration_report['failed_migrations'] += 1
-                        self.logger.error(f"迁移文件失败: {Path(file_info['path']).name}")
-                    
-                    # 记录迁移详情
-                    migration_report['details'].append({
-                        'file': Path(file_info['path']).name,
-                        'status': 'success' if success else 'failed',
-                        'bind_views_count': len(file_info['parsed_data'].get('bind_views', [])),
-                        'on_clicks_count': len(file_info['parsed_data'].get('on_clicks', [])),
-                        'has_bind_call': file_info['parsed_data'].get('bind_call', False)
-                    })
                     
+                    # 写入异常的文件不记录详情
+                    if record['status'] != 'error':
+                        details.append({
+                            'file': Path(record['path']).name,
+                            'path': Path(os.path.relpath(record['path'], self.config.PROJECT_PATH)).as_posix(),
+                            'status': record['status'],
+                            'bind_views_count': record['bind_views_count'],
+                            'on_clicks_count': record['on_clicks_count'],
+                            'has_bind_call': record['has_bind_call'],
+                            'transformers': record['transformers'],
+                            'injector_branch': record['injector_branch'],
+                            'timings': round_timings(record['timings'])
+                        })
+                
+                # 并行时文件的完成顺序不固定，按路径排序保证报告可复现
+                migration_report['details'] = sorted(details, key=lambda detail: detail['path'])
+                
+                if self.journal is not None:
+                    self.journal.end()
+            finally:
+                self._close_parse_cache()
+                self._close_journal()
+                self.writer.close()
+                if self.diff_writer is not None:
+                    self.diff_writer.close()
+            
+            # 整个流程完成后才保存清单，失败的运行不会影响下一次增量判断
+            if self.scan_manifest is not None and not self.config.DRY_RUN:
+                self.scan_manifest.save()
+            if self.cost_history is not None:
+                try:
+                    self.cost_history.save()
                 except Exception as e:
-                    migration_report['failed_migrations'] += 1
-                    self.logger.error(f"写入文件 {file_info['path']} 时出错: {e}")
+                    self.logger.warning(f"保存文件耗时历史时出错: {e}")
+            
+            self.logger.info(f"找到 {migration_report['total_files']} 个包含ButterKnife的文件")
+            
+            if not migration_report['total_files']:
+                self.logger.info("未找到包含ButterKnife注解的文件，无需迁移")
+                # 分片仍然输出报告，合并时可以确认所有分片都已完成
+                if shard is None:
+                    return
             
             # 6. 生成迁移报告
             self.logger.info("步骤6: 生成迁移报告...")
+            if shard is not None:
+                migration_report['shard'] = shard
+            if self.resume_committed:
+                migration_report['resumed_committed_files'] = len(self.resume_committed)
+            backup_store = self.writer.backup_store
+            if backup_store is not None and backup_store.statistics['files']:
+                # 回滚本次运行: python main.py rollback --run <backup_run>
+                migration_report['backup_run'] = backup_store.run_id
+            if self.diff_writer is not None:
+                migration_report['dry_run'] = dict(self.diff_writer.statistics)
+            migration_report['injector_branches'] = dict(sorted(self.timings.branches.items()))
+            migration_report['timings'] = self.timings.to_report()
+            migration_report['slowest_files'] = self.timings.slowest_files()
             self._generate_migration_report(migration_report)
             
             self.logger.info("ButterKnife迁移流程完成!")
@@ -161,15 +214,252 @@ class ButterKnifeMigrator:
             self.logger.error(f"迁移过程中发生错误: {e}")
             raise
     
+    def _open_parse_cache(self):
+        """打开持久化解析缓存，未启用或打开失败时返回None"""
+        if not self.config.PARSE_CACHE_ENABLED:
+            return None
+        
+        try:
+            return ParseCache(
+                self.config.get_cache_dir(),
+                parser_fingerprint(self.parser),
+                self.config.PARSE_CACHE_MAX_ENTRIES
+            )
+        except Exception as e:
+            self.logger.warning(f"无法打开解析缓存，将重新解析所有文件: {e}")
+            return None
+    
+    def _close_parse_cache(self):
+        """关闭解析缓存并输出命中统计"""
+        if self.parse_cache is None:
+            return
+        
+        statistics = self.parse_cache.get_statistics()
+        try:
+            self.parse_cache.close()
+        except Exception as e:
+            self.logger.warning(f"保存解析缓存时出错: {e}")
+        self.parse_cache = None
+        
+        self.logger.info(f"解析缓存: 命中 {statistics['hits']} 个文件，未命中 {statistics['misses']} 个文件")
+    
+    def _open_journal(self):
+        """打开写前日志；--resume 时先处理上次运行中未提交的文件"""
+        if not self.config.JOURNAL_ENABLED:
+            return None
+        
+        journal_path = os.path.join(self.config.get_cache_dir(), JOURNAL_FILE_NAME)
+        try:
+            state = WriteJournal.load(journal_path)
+        except Exception as e:
+            self.logger.warning(f"无法读取写前日志: {e}")
+            state = None
+        
+        resume = self.config.RESUME and state is not None
+        if self.config.RESUME and state is None:
+            self.logger.warning("没有找到上次运行的写前日志，将处理所有文件")
+        elif resume and state['complete']:
+            self.logger.info("上次运行已正常结束，没有需要继续的文件")
+        elif resume:
+            recovery = recover_in_flight(state, self.config.PROJECT_PATH)
+            self.resume_committed = set(recovery['committed'] + recovery['finished'])
+            self.logger.info(
+                f"继续上次运行: 跳过 {len(self.resume_committed)} 个已提交的文件，"
+                f"完成 {len(recovery['finished'])} 个、回滚 {len(recovery['rolled_back'])} 个写入中的文件"
+            )
+            for file_key in recovery['unresolved']:
+                self.logger.warning(f"文件在上次运行后被修改且没有备份，无法回滚: {file_key}")
+        elif state is not None and not state['complete']:
+            self.logger.warning("上次运行没有正常结束，可以使用 --resume 继续")
+        
+        try:
+            journal = WriteJournal(journal_path)
+            # 上次运行已正常结束时重新开始记录
+            journal.begin(resume=resume and not state['complete'])
+            return journal
+        except Exception as e:
+            self.logger.warning(f"无法打开写前日志，本次运行不可恢复: {e}")
+            return None
+    
+    def _close_journal(self):
+        """关闭写前日志"""
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = None
+        self.writer.journal = None
+    
+    def _iter_tasks(self, java_files: list):
+        """
+        生成流水线任务 (文件路径, 缓存的解析结果)
+        缓存判定为不含ButterKnife的未修改文件直接跳过，不再读取和解析
+        --resume 时上次运行已提交的文件直接跳过
+        """
+        for file_path in java_files:
+            if self.resume_committed and self.writer.get_relative_path(file_path) in self.resume_committed:
+                self._record_outcome(file_path, 'migrated')
+                continue
+            
+            cached = self.parse_cache.lookup(file_path) if self.parse_cache else None
+            if cached is None:
+                yield file_path, None
+            elif cached['has_butterknife']:
+                yield file_path, cached['parsed_data']
+            else:
+                self._record_outcome(file_path, 'no_butterknife')
+    
+    def _iter_pipeline_results(self, java_files: list, jobs: int):
+        """按文件产出流水线处理结果（串行或并行）"""
+        tasks = self._iter_tasks(java_files)
+        if jobs > 1:
+            if self.config.SCHEDULE == 'lpt':
+                # 最长处理时间优先：按上次耗时或文件大小估算成本，大文件先分发
+                tasks = order_by_cost(tasks, self.config.PROJECT_PATH, self.cost_history)
+            return MigrationWorkerPool(self.config, jobs).imap_unordered(tasks)
+        
+        return (self.pipeline.process_file(file_path, cached_parse) for file_path, cached_parse in tasks)
+    
+    def _migrate_files(self, java_files: list, jobs: int):
+        """
+        逐文件执行迁移并立即写入
+        
+        Yields:
+            每个包含ButterKnife的文件的摘要记录（不含文件内容）
+        """
+        for result in self._iter_pipeline_results(java_files, jobs):
+            file_path = result['path']
+            
+            # 新解析的结果写入缓存
+            if self.parse_cache is not None and result['parsed_data'] is not None:
+                self.parse_cache.store(
+                    file_path, result['size'], result['mtime_ns'],
+                    result['content_hash'], result['parsed_data']
+                )
+            
+            if result['error_stage'] == 'worker':
+                # 工作进程异常退出，文件未处理：计为失败，不中断迁移
+                self.logger.error("处理文件 %s 时工作进程出错: %s", file_path, result['error'])
+                self._record_outcome(file_path, 'failed')
+                yield {
+                    'path': file_path,
+                    'status': 'error',
+                    'bind_views_count': 0,
+                    'on_clicks_count': 0,
+                    'has_bind_call': False,
+                    'transformers': [],
+                    'injector_branch': None,
+                    'timings': result['timings']
+                }
+                continue
+            
+            if result['error_stage'] == 'parse':
+                self.logger.error("解析文件 %s 时出错: %s", file_path, result['error'])
+                self._record_outcome(file_path, 'parse_error')
+                self._record_timings(result)
+                continue
+            
+            if not result['has_butterknife']:
+                self._record_outcome(file_path, 'no_butterknife')
+                self._record_timings(result)
+                continue
+            
+            self.logger.info("解析文件: %s", Path(file_path).name)
+            
+            if result['error_stage'] == 'transform':
+                self.logger.error("转换文件 %s 时出错: %s", file_path, result['error'])
+                self._record_outcome(file_path, 'failed')
+                self._record_timings(result)
+                continue
+            
+            if result['error_stage'] == 'inject':
+                self.logger.error("注入代码到文件 %s 时出错: %s", file_path, result['error'])
+            
+            if result['unchanged']:
+                # 迁移后内容与原文件相同：不备份也不写入，保留文件的修改时间
+                self.logger.info("文件内容未变化，跳过写入: %s", Path(file_path).name)
+                status = 'unchanged'
+                self._record_outcome(file_path, 'unchanged')
+            elif self.diff_writer is not None:
+                with measure(result['timings'], result['cpu_times'], 'write'):
+                    status = self._write_diff(file_path, result['final_content'])
+            else:
+                with measure(result['timings'], result['cpu_times'], 'write'):
+                    status = self._write_migrated_file(
+                        file_path, result['final_content'], result['content_hash'], (result['size'], result['mtime_ns'])
+                    )
+                self._record_outcome(file_path, 'migrated' if status == 'success' else 'failed')
+            self._record_timings(result)
+            
+            yield {
+                'path': file_path,
+                'status': status,
+                'bind_views_count': result['bind_views_count'],
+                'on_clicks_count': result['on_clicks_count'],
+                'has_bind_call': result['has_bind_call'],
+                'transformers': result['transformers'],
+                'injector_branch': result['injector_branch'],
+                'timings': result['timings']
+            }
+    
+    def _record_timings(self, result: dict):
+        """累计单个文件的各阶段耗时"""
+        if self.timings is None:
+            return
+        
+        file_path = os.path.relpath(result['path'], self.config.PROJECT_PATH)
+        self.timings.add_file(file_path, result['timings'], result['cpu_times'], result['injector_branch'])
+        
+        if self.cost_history is not None and result['size'] is not None:
+            seconds = sum(elapsed for stage, elapsed in result['timings'].items() if stage != 'write')
+            self.cost_history.record(file_path, result['size'], seconds)
+    
+    def _record_outcome(self, file_path: str, outcome: str):
+        """在增量模式下记录文件的处理结果"""
+        if self.scan_manifest is not None:
+            self.scan_manifest.record(file_path, outcome)
+    
+    def _write_migrated_file(self, file_path: str, final_content: str, original_hash: str = None,
+                             original_stat: tuple = None) -> str:
+        """写入迁移后的文件，返回写入状态: success / failed / error"""
+        try:
+            success = self.writer.write_file(file_path, final_content, original_hash, original_stat)
+            
+            if success:
+                self.logger.info("成功迁移文件: %s", Path(file_path).name)
+                return 'success'
+            
+            self.logger.error("迁移文件失败: %s", Path(file_path).name)
+            return 'failed'
+            
+        except Exception as e:
+            self.logger.error("写入文件 %s 时出错: %s", file_path, e)
+            return 'error'
+    
+    def _write_diff(self, file_path: str, final_content: str) -> str:
+        """预览模式：输出迁移前后的差异，不写入文件，返回状态: success / error"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                original_content = f.read()
+            self.diff_writer.write_diff(file_path, original_content, final_content)
+            return 'success'
+            
+        except Exception as e:
+            self.logger.error("生成文件 %s 的差异时出错: %s", file_path, e)
+            return 'error'
+    
     def _generate_migration_report(self, report: dict):
         """生成迁移报告"""
         report_path = os.path.join(self.config.PROJECT_PATH, 'butterknife_migration_report.json')
         
         try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
-            
-            self.logger.info(f"迁移报告已保存到: {report_path}")
+            if self.config.DRY_RUN:
+                self.logger.info("预览模式: 未写入任何文件，也未保存迁移报告")
+            else:
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
+                
+                self.logger.info(f"迁移报告已保存到: {report_path}")
+            # 先写出已提交的日志，避免与下面的摘要交错
+            self.logger.flush()
             
             # 控制台输出摘要
             print("\n" + "="*50)
@@ -177,27 +467,122 @@ class ButterKnifeMigrator:
             print("="*50)
             print(f"总文件数: {report['total_files']}")
             print(f"成功迁移: {report['successful_migrations']}")
+            print(f"内容未变化: {report['unchanged_files']}")
             print(f"迁移失败: {report['failed_migrations']}")
-            print(f"成功率: {report['successful_migrations']/report['total_files']*100:.1f}%")
+            succeeded = report['successful_migrations'] + report['unchanged_files']
+            if report['total_files']:
+                print(f"成功率: {succeeded/report['total_files']*100:.1f}%")
+            
+            dry_run = report.get('dry_run')
+            if dry_run:
+                print(f"预览差异: {dry_run['files']} 个文件，+{dry_run['added_lines']} -{dry_run['removed_lines']} 行"
+                      + (f"，已保存到 {self.config.DIFF_OUTPUT}" if self.config.DIFF_OUTPUT else ""))
+            
+            timings = report.get('timings')
+            if timings:
+                print("-"*50)
+                print(f"总耗时: {timings['total']['wall_seconds']:.3f}s (CPU {timings['total']['cpu_seconds']:.3f}s)")
+                for stage, stage_timings in timings['stages'].items():
+                    print(f"  {stage}: {stage_timings['wall_seconds']:.3f}s (CPU {stage_timings['cpu_seconds']:.3f}s)")
+            
+            slowest_files = report.get('slowest_files')
+            if slowest_files:
+                print("耗时最长的文件:")
+                for entry in slowest_files[:5]:
+                    print(f"  {entry['total_seconds']:.3f}s  {entry['file']}  [{entry['injector_branch'] or '-'}]")
             print("="*50)
             
         except Exception as e:
             self.logger.error(f"生成迁移报告时出错: {e}")
 
 
+def rollback(config: Config, run_id: str = None, workers: int = None) -> bool:
+    """回滚一次迁移运行，输出恢复结果和吞吐量"""
+    result = rollback_run(config, run_id, workers)
+    
+    print("\n" + "="*50)
+    print("ButterKnife迁移回滚")
+    print("="*50)
+    print(f"运行: {result['run_id']}")
+    print(f"恢复文件: {result['restored_files']}/{result['total_files']}")
+    print(f"耗时: {result['seconds']:.3f}s  "
+          f"({result['files_per_second'] or 0} 个文件/s, {result['mb_per_second'] or 0} MB/s)")
+    for failure in result['failed_files']:
+        print(f"恢复失败: {failure['file']}: {failure['error']}")
+    print("="*50)
+    
+    return not result['failed_files']
+
+
+def merge_report_files(report_paths: list, output_path: str) -> bool:
+    """合并分片报告并保存，输出合并结果摘要"""
+    merged = merge_reports(load_reports(report_paths))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+    
+    print("\n" + "="*50)
+    print("ButterKnife迁移报告合并")
+    print("="*50)
+    print(f"合并报告: {len(report_paths)} 个 -> {output_path}")
+    print(f"总文件数: {merged['total_files']}")
+    print(f"成功迁移: {merged['successful_migrations']}")
+    print(f"内容未变化: {merged['unchanged_files']}")
+    print(f"迁移失败: {merged['failed_migrations']}")
+    if merged.get('timings'):
+        print(f"最慢分片耗时: {merged['timings']['total']['wall_seconds']:.3f}s")
+    if merged.get('missing_shards'):
+        print(f"缺少分片: {', '.join(str(index) for index in merged['missing_shards'])}")
+    print("="*50)
+    
+    return not merged.get('missing_shards')
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='ButterKnife迁移工具')
+    parser.add_argument('command', nargs='?', default='migrate', choices=['migrate', 'rollback', 'merge-reports'],
+                       help='migrate: 执行迁移（默认）；rollback: 从备份恢复一次运行修改的所有文件；'
+                            'merge-reports: 合并各分片的迁移报告')
+    parser.add_argument('reports', nargs='*', help='merge-reports: 要合并的分片报告文件')
     parser.add_argument('--config', '-c', help='配置文件路径')
     parser.add_argument('--project-path', '-p', help='Android项目路径')
     parser.add_argument('--binding-mode', '-b', choices=['findViewById', 'viewBinding'], 
                        help='绑定模式')
     parser.add_argument('--backup', action='store_true', help='启用备份')
+    parser.add_argument('--backup-mode', choices=['store', 'tar', 'zip'],
+                       help='备份方式：store为内容寻址对象目录，tar/zip为追加写入单个归档')
+    parser.add_argument('--parser-mode', choices=['multi', 'single'],
+                       help='解析方式：multi 每类信息各扫描一遍（默认），single 组合正则一次扫描')
     parser.add_argument('--verbose', '-v', action='store_true', help='详细输出')
+    parser.add_argument('--jobs', '-j', type=int,
+                       help='并行进程数（0表示使用全部CPU核心，默认1为串行）')
+    parser.add_argument('--schedule', choices=['lpt', 'fifo'],
+                       help='并行分发顺序：lpt 按估算成本从大到小（默认），fifo 按扫描顺序')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量模式：只处理自上次成功运行以来新增或修改的文件')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='禁用持久化解析缓存，重新解析所有文件')
+    parser.add_argument('--resume', action='store_true',
+                       help='继续上次中途退出的运行：跳过已写入的文件，完成或回滚写入中的文件')
+    parser.add_argument('--report-slowest', type=int,
+                       help='迁移报告中列出的耗时最长文件数（默认10）')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='预览模式：执行完整流程但不写入文件、不创建备份，输出每个文件的统一差异')
+    parser.add_argument('--diff-output', help='预览模式的补丁文件路径（默认输出到标准输出）')
+    parser.add_argument('--shard', help='分片执行：INDEX/COUNT（如 1/4），按文件相对路径的哈希只处理其中一个分片')
+    parser.add_argument('--output', '-o', help='merge-reports: 合并后的报告路径（默认 butterknife_migration_report.json）')
+    parser.add_argument('--run', help='rollback: 要回滚的运行ID（默认最近一次运行）')
     
     args = parser.parse_args()
     
     try:
+        if args.command == 'merge-reports':
+            if not args.reports:
+                parser.error("merge-reports 需要至少一个报告文件")
+            if not merge_report_files(args.reports, args.output or 'butterknife_migration_report.json'):
+                sys.exit(1)
+            return
+        
         # 加载配置
         if args.config:
             config = Config.from_file(args.config)
@@ -211,6 +596,29 @@ def main():
             config.BINDING_MODE = args.binding_mode
         if args.backup is not None:
             config.BACKUP_ENABLED = args.backup
+        if args.backup_mode:
+            config.BACKUP_MODE = args.backup_mode
+        if args.parser_mode:
+            config.PARSER_MODE = args.parser_mode
+        if args.jobs is not None:
+            config.JOBS = args.jobs
+        if args.schedule:
+            config.SCHEDULE = args.schedule
+        if args.incremental:
+            config.INCREMENTAL = True
+        if args.no_cache:
+            config.PARSE_CACHE_ENABLED = False
+        if args.resume:
+            config.RESUME = True
+        if args.shard:
+            parse_shard(args.shard)
+            config.SHARD = args.shard
+        if args.dry_run:
+            config.DRY_RUN = True
+        if args.diff_output:
+            config.DIFF_OUTPUT = args.diff_output
+        if args.report_slowest is not None:
+            config.REPORT_SLOWEST_FILES = args.report_slowest
         
         # 验证配置
         if not os.path.exists(config.PROJECT_PATH):
@@ -221,6 +629,13 @@ def main():
         if args.verbose:
             config.LOG_LEVEL = 'DEBUG'
         
+        if args.command == 'rollback':
+            # --jobs 指定恢复线程数
+            workers = resolve_jobs(args.jobs) if args.jobs is not None else None
+            if not rollback(config, args.run, workers):
+                sys.exit(1)
+            return
+        
         # 执行迁移
         migrator = ButterKnifeMigrator(config)
         migrator.migrate()
@@ -234,4 +649,5 @@ def main():
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+迁移流水线模块
+"""
+
+from .file_pipeline import FilePipeline
+from .worker_pool import MigrationWorkerPool
+from .stage_timings import StageTimings
+from .scheduler import order_by_cost
+
+__all__ = ['FilePipeline', 'MigrationWorkerPool', 'StageTimings', 'order_by_cost']
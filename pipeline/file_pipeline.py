@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单文件迁移流水线
+对单个文件依次执行：解析 → 转换 → 注入
+串行模式与并行工作进程共用同一套逻辑，保证输出完全一致
+"""
+
+import hashlib
+import os
+from typing import Dict, Any, List, Optional
+from config import Config
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+from transformer.findview_transformer import FindViewTransformer
+from transformer.onclick_transformer import OnClickTransformer
+from transformer.bindcall_remover import BindCallRemover
+from injector.code_injector import CodeInjector
+from utils.logger import Logger
+from scanner.prefilter import has_butterknife_signature, map_file
+from .stage_timings import measure
+
+
+class FilePipeline:
+    """单文件迁移流水线类"""
+
+    def __init__(self, config: Config, logger: Optional[Logger] = None):
+        self.config = config
+        self.parser = ButterKnifeParser(config.PARSER_MODE)
+        self.transformers = [
+            FindViewTransformer(),
+            OnClickTransformer(),
+            BindCallRemover()
+        ]
+        self.injector = CodeInjector(logger)
+
+    def parse(self, content: str) -> Dict[str, Any]:
+        """解析ButterKnife注解"""
+        return self.parser.parse(content)
+
+    def transform(self, parsed_data: Dict[str, Any], content: str, applied: Optional[List[str]] = None) -> str:
+        """
+        依次应用所有转换器
+
+        Args:
+            applied: 提供时记录实际修改了代码的转换器名称
+        """
+        transformed_content = content
+        for transformer in self.transformers:
+            previous_content = transformed_content
+            transformed_content = transformer.transform(parsed_data, transformed_content)
+            if applied is not None and transformed_content != previous_content:
+                applied.append(transformer.name)
+        return transformed_content
+
+    def inject(self, content: str, parsed_data: Dict[str, Any]) -> str:
+        """注入初始化代码"""
+        return self.injector.inject(content, parsed_data)
+
+    @staticmethod
+    def new_result(file_path: str) -> Dict[str, Any]:
+        """创建空的处理结果（不含ButterKnife的文件即为此结果）"""
+        return {
+            'path': file_path,
+            'has_butterknife': False,
+            'final_content': None,
+            'error': None,
+            'error_stage': None,
+            'bind_views_count': 0,
+            'on_clicks_count': 0,
+            'has_bind_call': False,
+            # 迁移后内容与原内容相同，无需备份和写入
+            'unchanged': False,
+            # 各阶段墙钟时间和CPU时间（秒），以及转换器和注入分支
+            'timings': {},
+            'cpu_times': {},
+            'transformers': [],
+            'injector_branch': None,
+            # 以下字段供解析缓存使用
+            'size': None,
+            'mtime_ns': None,
+            'content_hash': None,
+            'parsed_data': None
+        }
+
+    def process_file(self, file_path: str, cached_parse: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        对单个文件执行完整的解析、转换、注入流程
+
+        Args:
+            file_path: 文件路径
+            cached_parse: 缓存中的解析结果，提供时跳过解析
+
+        Returns:
+            处理结果字典，包含最终内容、各阶段耗时和用于报告的统计信息
+            重新解析时 parsed_data 为新的解析结果，供调用方写入缓存
+        """
+        result = self.new_result(file_path)
+        timings = result['timings']
+        cpu_times = result['cpu_times']
+
+        # 解析（包括读取文件和预过滤）
+        try:
+            with measure(timings, cpu_times, 'parse'):
+                with open(file_path, 'rb') as f:
+                    stat = os.fstat(f.fileno())
+                    result['size'] = stat.st_size
+                    result['mtime_ns'] = stat.st_mtime_ns
+
+                    with map_file(f, stat.st_size) as buffer:
+                        result['content_hash'] = hashlib.sha256(buffer).hexdigest()
+
+                        # 字节级预过滤：不含ButterKnife特征串的文件无需解码和解析
+                        if cached_parse is None and not has_butterknife_signature(buffer):
+                            result['parsed_data'] = {'has_butterknife': False}
+                            return result
+
+                        data = bytes(buffer)
+
+                # 与文本模式读取一致：统一换行符
+                content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+                if cached_parse is not None:
+                    parsed_data = cached_parse
+                else:
+                    parsed_data = self.parse(content)
+                    result['parsed_data'] = parsed_data
+        except Exception as e:
+            result['error'] = str(e)
+            result['error_stage'] = 'parse'
+            return result
+
+        if not parsed_data['has_butterknife']:
+            return result
+
+        result['has_butterknife'] = True
+        result['bind_views_count'] = len(parsed_data.get('bind_views', []))
+        result['on_clicks_count'] = len(parsed_data.get('on_clicks', []))
+        result['has_bind_call'] = parsed_data.get('bind_call', False)
+
+        # 转换
+        try:
+            with measure(timings, cpu_times, 'transform'):
+                transformed_content = self.transform(parsed_data, content, result['transformers'])
+        except Exception as e:
+            result['error'] = str(e)
+            result['error_stage'] = 'transform'
+            return result
+
+        # 注入（失败时回退为转换后的内容）
+        try:
+            with measure(timings, cpu_times, 'inject'):
+                result['final_content'] = self.inject(transformed_content, parsed_data)
+        except Exception as e:
+            result['error'] = str(e)
+            result['error_stage'] = 'inject'
+            result['final_content'] = transformed_content
+        result['injector_branch'] = self.injector.last_branch
+        result['unchanged'] = result['final_content'] == content
+
+        return result
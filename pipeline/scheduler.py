@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行调度：最长处理时间优先（LPT）
+按估算的处理成本从大到小分发文件，避免大文件排在最后，
+出现一个工作进程处理巨型文件而其他进程空闲的情况
+
+成本估算（统一换算为“字节当量”）：
+- 有上次运行耗时记录的文件：耗时 × 本批文件的平均处理速度（字节/秒）
+- 没有记录的文件：文件大小 + 缓存中的注解数 × ANNOTATION_COST_BYTES
+"""
+
+import heapq
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# 调度方式：lpt 按成本从大到小分发；fifo 按扫描顺序分发
+SCHEDULES = ('lpt', 'fifo')
+
+# 每个注解（生成一段初始化代码）相当于多少字节文本的处理成本
+ANNOTATION_COST_BYTES = 1024
+
+# 解析结果中按条计数的注解
+ANNOTATION_KEYS = ('bind_views', 'on_clicks', 'on_long_clicks')
+
+
+def count_annotations(parsed_data: Optional[Dict[str, Any]]) -> int:
+    """缓存的解析结果中的注解数"""
+    if not parsed_data:
+        return 0
+    return sum(len(parsed_data.get(key, [])) for key in ANNOTATION_KEYS)
+
+
+def estimate_costs(tasks: List[Tuple[str, Optional[Dict[str, Any]]]], project_path: str,
+                   history=None) -> List[float]:
+    """
+    估算每个任务的处理成本（字节当量）
+
+    Args:
+        tasks: (文件路径, 缓存的解析结果或None)
+        project_path: 项目根目录（历史记录使用相对路径）
+        history: 上次运行的耗时历史（CostHistory），可选
+    """
+    root = os.path.abspath(project_path)
+    sizes = []
+    seconds = []
+    for file_path, _ in tasks:
+        try:
+            size = os.stat(file_path).st_size
+        except OSError:
+            size = 0
+        sizes.append(size)
+        if history is None:
+            seconds.append(None)
+        else:
+            file_key = os.path.relpath(os.path.abspath(file_path), root)
+            seconds.append(history.estimate_seconds(file_key, size))
+
+    # 用有历史记录的文件换算 秒 → 字节当量
+    known = [(size, elapsed) for size, elapsed in zip(sizes, seconds) if elapsed]
+    bytes_per_second = sum(size for size, _ in known) / sum(elapsed for _, elapsed in known) if known else None
+
+    costs = []
+    for (_, cached_parse), size, elapsed in zip(tasks, sizes, seconds):
+        if elapsed is not None and bytes_per_second:
+            costs.append(elapsed * bytes_per_second)
+        else:
+            costs.append(size + count_annotations(cached_parse) * ANNOTATION_COST_BYTES)
+    return costs
+
+
+def order_by_cost(tasks, project_path: str, history=None) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    """按估算成本从大到小排序任务（成本相同时保持原顺序）"""
+    tasks = list(tasks)
+    costs = estimate_costs(tasks, project_path, history)
+    order = sorted(range(len(tasks)), key=lambda index: -costs[index])
+    return [tasks[index] for index in order]
+
+
+def simulate_makespan(costs: List[float], workers: int) -> float:
+    """模拟按给定顺序把任务分发给最先空闲的工作进程，返回全部完成的时间"""
+    finish_times = [0.0] * max(1, min(workers, len(costs)))
+    for cost in costs:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + cost)
+    return max(finish_times)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+迁移阶段计时
+累计每个阶段的墙钟时间和CPU时间，并保留耗时最长的N个文件
+只保存汇总和前N条记录，内存占用与文件数无关
+"""
+
+import heapq
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List
+
+
+# 迁移流程的各个阶段（扫描在主进程执行，其余阶段按文件计时）
+STAGES = ('scan', 'parse', 'transform', 'inject', 'write')
+FILE_STAGES = ('parse', 'transform', 'inject', 'write')
+
+
+@contextmanager
+def measure(timings: Dict[str, float], cpu_times: Dict[str, float], stage: str):
+    """记录代码块的墙钟时间和CPU时间（累加到对应阶段）"""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - wall_start
+        cpu_times[stage] = cpu_times.get(stage, 0.0) + time.process_time() - cpu_start
+
+
+class StageTimings:
+    """迁移阶段计时类"""
+
+    def __init__(self, slowest_count: int = 10):
+        self.slowest_count = slowest_count
+        self.wall = dict.fromkeys(STAGES, 0.0)
+        self.cpu = dict.fromkeys(STAGES, 0.0)
+        self.branches = {}
+        # (总耗时, 序号, 文件路径, 各阶段耗时, 注入分支) 最小堆，只保留最慢的N个文件
+        self._slowest = []
+        self._sequence = 0
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, stage: str):
+        """记录主进程中执行的阶段（扫描等）"""
+        with measure(self.wall, self.cpu, stage):
+            yield
+
+    def add_file(self, file_path: str, timings: Dict[str, float], cpu_times: Dict[str, float],
+                 branch: str = None):
+        """
+        累计单个文件的各阶段耗时
+
+        Args:
+            file_path: 文件路径
+            timings: 各阶段墙钟时间
+            cpu_times: 各阶段CPU时间
+            branch: 注入分支，未注入时为None
+        """
+        for stage, seconds in timings.items():
+            self.wall[stage] = self.wall.get(stage, 0.0) + seconds
+        for stage, seconds in cpu_times.items():
+            self.cpu[stage] = self.cpu.get(stage, 0.0) + seconds
+
+        if branch:
+            self.branches[branch] = self.branches.get(branch, 0) + 1
+
+        if self.slowest_count <= 0:
+            return
+
+        total = sum(timings.values())
+        entry = (total, self._sequence, file_path, timings, branch)
+        self._sequence += 1
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, entry)
+        elif total > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest_files(self) -> List[Dict[str, Any]]:
+        """返回耗时最长的文件，按耗时降序"""
+        return [
+            {
+                'file': file_path,
+                'total_seconds': round(total, 6),
+                'timings': round_timings(timings),
+                'injector_branch': branch
+            }
+            for total, _, file_path, timings, branch in sorted(self._slowest, key=lambda e: (-e[0], e[1]))
+        ]
+
+    def to_report(self) -> Dict[str, Any]:
+        """
+        生成报告中的计时部分
+
+        并行模式下各文件阶段的时间为所有工作进程的累计值，可能大于总墙钟时间；
+        total 中的CPU时间只统计主进程
+        """
+        return {
+            'total': {
+                'wall_seconds': round(time.perf_counter() - self._wall_start, 6),
+                'cpu_seconds': round(time.process_time() - self._cpu_start, 6)
+            },
+            'stages': {
+                stage: {
+                    'wall_seconds': round(self.wall.get(stage, 0.0), 6),
+                    'cpu_seconds': round(self.cpu.get(stage, 0.0), 6)
+                }
+                for stage in STAGES
+            }
+        }
+
+
+def round_timings(timings: Dict[str, float]) -> Dict[str, float]:
+    """按阶段顺序输出并保留6位小数"""
+    return {stage: round(timings[stage], 6) for stage in FILE_STAGES if stage in timings}
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行迁移工作进程池
+将每个文件的完整流水线分发到 ProcessPoolExecutor 中执行
+每个工作进程只构建一次解析器、转换器和注入器
+结果以流的方式返回父进程，写入与报告由父进程统一负责
+"""
+
+import copy
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+from config import Config
+from utils.logger import Logger
+from .file_pipeline import FilePipeline
+
+
+# 工作进程内的流水线实例（每个进程初始化一次）
+_worker_pipeline = None
+
+
+def _init_worker(config: Config):
+    """工作进程初始化函数"""
+    global _worker_pipeline
+    # 只有调试模式才需要在工作进程中输出注入器的调试信息
+    # 工作进程使用同步日志：逐条写出，进程池关闭工作进程时不会丢失未写出的批次
+    logger = None
+    if config.LOG_LEVEL.upper() == 'DEBUG':
+        worker_config = copy.copy(config)
+        worker_config.LOG_ASYNC = False
+        logger = Logger(worker_config)
+    _worker_pipeline = FilePipeline(config, logger)
+
+
+def _process_in_worker(file_path: str, cached_parse: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """在工作进程中处理单个文件"""
+    return _worker_pipeline.process_file(file_path, cached_parse)
+
+
+def _worker_error_result(file_path: str, error: BaseException) -> Dict[str, Any]:
+    """工作进程未能返回结果时的错误结果"""
+    result = FilePipeline.new_result(file_path)
+    result['error'] = str(error) or error.__class__.__name__
+    result['error_stage'] = 'worker'
+    return result
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """解析并行进程数，0或负数表示使用全部CPU核心"""
+    if jobs is None:
+        return 1
+
+    if jobs <= 0:
+        return os.cpu_count() or 1
+
+    return jobs
+
+
+class MigrationWorkerPool:
+    """并行迁移工作进程池类"""
+
+    def __init__(self, config: Config, jobs: int):
+        self.config = config
+        self.jobs = resolve_jobs(jobs)
+        # 同时在途的任务数上限，避免一次性提交全部文件
+        self.max_pending = self.jobs * 4
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """创建工作进程池"""
+        return ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(self.config,)
+        )
+
+    def imap_unordered(self, tasks: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> Iterator[Dict[str, Any]]:
+        """
+        并行处理文件，按完成顺序逐个返回结果
+
+        工作进程异常退出（被系统杀死、崩溃等）时进程池损坏，所有在途任务都会失败且无法判断是哪个文件导致的：
+        此时换用新的进程池，把这些任务逐个单独重新执行，只有再次导致进程退出的文件记为失败，
+        失败的文件返回与流水线相同格式的错误结果（error_stage 为 'worker'），不会中断整个迁移
+
+        Args:
+            tasks: 待处理的 (文件路径, 缓存的解析结果或None)
+
+        Returns:
+            处理结果迭代器
+        """
+        # 在途任务：future -> (任务, 是否为单独重新执行)
+        pending = {}
+        # 进程池损坏时在途的任务，逐个单独重新执行
+        retry = deque()
+        # 按需从任务迭代器中取任务，不预先展开生成器
+        task_iter = iter(tasks)
+        exhausted = False
+        executor = self._create_executor()
+
+        try:
+            while True:
+                broken = False
+                # 补充在途任务（有待重新执行的任务时，每次只执行一个）
+                try:
+                    if retry:
+                        if not pending:
+                            task = retry.popleft()
+                            pending[executor.submit(_process_in_worker, *task)] = (task, True)
+                    else:
+                        while not exhausted and len(pending) < self.max_pending:
+                            task = next(task_iter, None)
+                            if task is None:
+                                exhausted = True
+                            else:
+                                pending[executor.submit(_process_in_worker, *task)] = (task, False)
+                except BrokenProcessPool:
+                    # 提交前在途任务已导致进程池损坏：该任务未执行，稍后重新执行
+                    retry.appendleft(task)
+                    broken = True
+
+                if not pending and not broken:
+                    break
+
+                done = () if broken else wait(pending, return_when=FIRST_COMPLETED)[0]
+                for future in done:
+                    task, isolated = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool as e:
+                        broken = True
+                        if isolated:
+                            yield _worker_error_result(task[0], e)
+                        else:
+                            retry.append(task)
+                    except Exception as e:
+                        # 结果无法传回等单个任务的失败
+                        yield _worker_error_result(task[0], e)
+
+                if broken:
+                    # 其余在途任务随进程池一起失败，已完成的结果照常返回
+                    done, _ = wait(pending)
+                    for future in done:
+                        task, _ = pending.pop(future)
+                        try:
+                            yield future.result()
+                        except BrokenProcessPool:
+                            retry.append(task)
+                        except Exception as e:
+                            yield _worker_error_result(task[0], e)
+                    executor.shutdown(wait=True)
+                    executor = self._create_executor()
+        finally:
+            executor.shutdown(wait=True)
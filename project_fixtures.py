@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用临时项目
+各测试脚本共用：创建包含示例Java文件的临时Android项目，以及指向该项目的配置
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Optional
+from config import Config
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 项目中Java源码所在的相对目录
+JAVA_DIR = os.path.join("app", "src", "main", "java")
+
+# 默认复制到临时项目中的示例文件
+SAMPLE_FILES = ("TestActivity.java", "TestClass.java", "test_inner_class.java")
+
+
+def sample_copies(package: str = "", sources: Iterable[str] = SAMPLE_FILES) -> Dict[str, str]:
+    """示例文件依次复制为 package 下的 File0.java、File1.java ...（项目内相对路径 -> 示例文件）"""
+    return {os.path.join(JAVA_DIR, package, f"File{index}.java"): source for index, source in enumerate(sources)}
+
+
+def create_project(prefix: str, copies: Optional[Dict[str, str]] = None,
+                   contents: Optional[Dict[str, str]] = None) -> str:
+    """
+    创建临时项目
+
+    Args:
+        prefix: 临时目录名前缀
+        copies: 项目内相对路径 -> 仓库中的示例文件（两者均未提供时复制 SAMPLE_FILES）
+        contents: 项目内相对路径 -> 直接写入的文件内容
+
+    Returns:
+        项目目录
+    """
+    if copies is None and contents is None:
+        copies = sample_copies()
+
+    project_dir = tempfile.mkdtemp(prefix=prefix)
+    for target, source in (copies or {}).items():
+        path = os.path.join(project_dir, target)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy(os.path.join(BASE_DIR, source), path)
+
+    for target, content in (contents or {}).items():
+        path = os.path.join(project_dir, target)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    return project_dir
+
+
+def read_sources(project_dir: str) -> Dict[str, bytes]:
+    """读取项目 JAVA_DIR 中的所有Java文件（文件名 -> 内容）"""
+    java_dir = os.path.join(project_dir, JAVA_DIR)
+    contents = {}
+    for name in sorted(os.listdir(java_dir)):
+        with open(os.path.join(java_dir, name), 'rb') as f:
+            contents[name] = f.read()
+    return contents
+
+
+def create_config(project_dir: str, **settings) -> Config:
+    """指向临时项目的配置，settings 按名称覆盖配置项"""
+    config = Config()
+    config.PROJECT_PATH = project_dir
+    for name, value in settings.items():
+        if not hasattr(config, name):
+            raise AttributeError(f"未知的配置项: {name}")
+        setattr(config, name, value)
+    return config
@@ -5,5 +5,8 @@
 """
 
 from .file_scanner import FileScanner, FileScannerFactory
+from .prefilter import has_butterknife_signature, file_has_butterknife_signature
+from .shard import parse_shard, filter_shard
 
-__all__ = ['FileScanner', 'FileScannerFactory']
+__all__ = ['FileScanner', 'FileScannerFactory', 'has_butterknife_signature', 'file_has_butterknife_signature',
+           'parse_shard', 'filter_shard']
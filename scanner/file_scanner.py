@@ -58,6 +58,65 @@ class FileScanner:
         
         return java_files
     
+    def scan_changed_files(self, manifest) -> List[str]:
+        """
+        增量扫描：只重新列出mtime变化的目录，返回新增或修改过的Java文件
+        
+        Args:
+            manifest: 扫描清单（ScanManifest），扫描过程中会更新其中的目录记录
+        
+        Returns:
+            需要处理的文件路径列表
+        """
+        java_files = []
+        scan_paths = self.config.get_scan_paths()
+        
+        for scan_path in scan_paths:
+            if os.path.exists(scan_path):
+                java_files.extend(self._scan_directory_incremental(scan_path, manifest))
+        
+        # 去重并排序
+        java_files = sorted(list(set(java_files)))
+        self.java_files_cache = java_files
+        
+        return [file_path for file_path in java_files if manifest.is_changed(file_path)]
+    
+    def _scan_directory_incremental(self, directory: str, manifest) -> List[str]:
+        """扫描指定目录下的Java文件，mtime未变化的目录直接使用清单中的目录项"""
+        java_files = []
+        pending = [directory]
+        
+        while pending:
+            current = pending.pop()
+            try:
+                mtime_ns = os.stat(current).st_mtime_ns
+                listing = manifest.get_directory(current, mtime_ns)
+                
+                if listing is None:
+                    files = []
+                    subdirs = []
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            if entry.is_dir():
+                                # 与os.walk一致，不进入符号链接目录
+                                if not entry.is_symlink() and not self._should_exclude_directory(entry.name):
+                                    subdirs.append(entry.name)
+                            elif self._should_include_file(entry.name):
+                                files.append(entry.name)
+                    
+                    manifest.set_directory(current, mtime_ns, files, subdirs)
+                else:
+                    files, subdirs = listing
+                    
+            except Exception as e:
+                print(f"扫描目录 {current} 时出错: {e}")
+                continue
+            
+            java_files.extend(os.path.join(current, file) for file in files)
+            pending.extend(os.path.join(current, subdir) for subdir in subdirs)
+        
+        return java_files
+    
     def _should_exclude_directory(self, dir_name: str) -> bool:
         """判断是否应该排除目录"""
         exclude_dirs = self.config.EXCLUDE_DIRECTORIES
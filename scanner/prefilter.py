@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ButterKnife字节级预过滤器
+在解码和解析之前直接在原始字节上查找ButterKnife特征串
+未命中的文件（通常占绝大多数）无需解码为str，也无需运行正则解析
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+
+# 特征串，与 ButterKnifeParser._has_butterknife_annotations 的判断条件一致
+BUTTERKNIFE_SIGNATURES = (
+    b'@BindView',
+    b'@OnClick',
+    b'@OnLongClick',
+    b'ButterKnife.bind'
+)
+
+# 不小于该大小的文件使用mmap，更小的文件直接整块读取（mmap的系统调用开销更大）
+MMAP_THRESHOLD = 64 * 1024
+
+
+def has_butterknife_signature(buffer: Union[bytes, mmap.mmap]) -> bool:
+    """判断字节缓冲区（bytes或mmap）中是否包含ButterKnife特征串"""
+    return any(buffer.find(signature) != -1 for signature in BUTTERKNIFE_SIGNATURES)
+
+
+@contextmanager
+def map_file(file_obj, size: int) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    以只读方式映射已打开的二进制文件
+
+    大文件返回mmap对象，小文件和空文件返回读取到的bytes
+    """
+    if size < MMAP_THRESHOLD:
+        yield file_obj.read()
+        return
+
+    try:
+        mapped = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # 部分文件系统不支持mmap，退回整块读取
+        yield file_obj.read()
+        return
+
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+def file_has_butterknife_signature(file_path: str) -> bool:
+    """
+    判断文件是否可能包含ButterKnife代码（不解码文件内容）
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        是否包含特征串，读取失败时返回True以便后续流程报告错误
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            with map_file(f, os.fstat(f.fileno()).st_size) as buffer:
+                return has_butterknife_signature(buffer)
+    except OSError:
+        return True
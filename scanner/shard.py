@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片执行
+按文件相对路径的稳定哈希把扫描结果划分到多个分片，每台机器只处理自己的分片
+同一个文件在任何机器、任何扫描顺序下都落在同一个分片
+"""
+
+import hashlib
+import os
+from typing import List, Tuple
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    解析分片参数 "INDEX/COUNT"（INDEX从1开始）
+
+    Raises:
+        ValueError: 格式错误或超出范围
+    """
+    try:
+        index_text, count_text = value.split('/')
+        index, count = int(index_text), int(count_text)
+    except (AttributeError, ValueError):
+        raise ValueError(f"分片参数格式应为 INDEX/COUNT，例如 1/4: {value}")
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分片序号应在 1 到 {count} 之间: {value}")
+    return index, count
+
+
+def shard_of(relative_path: str, count: int) -> int:
+    """文件所属的分片（从1开始），路径统一使用 / 分隔，与操作系统无关"""
+    key = relative_path.replace(os.sep, '/').encode('utf-8')
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], 'big') % count + 1
+
+
+def filter_shard(file_paths: List[str], project_path: str, index: int, count: int) -> List[str]:
+    """保留属于指定分片的文件，保持原有顺序"""
+    root = os.path.abspath(project_path)
+    return [
+        file_path for file_path in file_paths
+        if shard_of(os.path.relpath(os.path.abspath(file_path), root), count) == index
+    ]
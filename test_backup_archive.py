@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试单文件归档备份（tar / zip）
+"""
+
+import sys
+import os
+import shutil
+import tarfile
+import zipfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from writer.file_writer import FileWriter
+from writer.backup_archive import BackupArchive, read_reference
+from project_fixtures import create_project, create_config
+
+
+def _create_project(count: int) -> str:
+    """创建包含多个Java文件的临时项目，其中两个文件内容相同"""
+    contents = {}
+    for index in range(count):
+        number = max(index, 1)
+        target = os.path.join(f"module{index % 3}", "src", "main", "java", f"File{index}.java")
+        contents[target] = f"public class File{number} {{\n    // {'x' * (number * 97)}\n}}\n"
+    return create_project("butterknife_backup_archive_", contents=contents)
+
+
+def _java_files(project_dir: str) -> list:
+    """项目中的所有Java文件"""
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(project_dir) for name in names if name.endswith(".java")
+    )
+
+
+def _read_all(paths: list) -> dict:
+    """读取文件内容"""
+    contents = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents[path] = f.read()
+    return contents
+
+
+def _create_writer(project_dir: str, mode: str, compress: bool) -> FileWriter:
+    """创建归档备份方式的写入器"""
+    return FileWriter(create_config(project_dir, BACKUP_ENABLED=True, BACKUP_MODE=mode, BACKUP_COMPRESS=compress))
+
+
+def _migrate_and_restore(mode: str, compress: bool):
+    """写入所有文件后分别单独恢复和批量恢复"""
+    project_dir = _create_project(8)
+    try:
+        paths = _java_files(project_dir)
+        originals = _read_all(paths)
+
+        writer = _create_writer(project_dir, mode, compress)
+        for path in paths:
+            assert writer.write_file(path, "public class Migrated {}\n")
+        writer.close()
+
+        backup_dir = os.path.join(project_dir, "butterknife_backup")
+        assert sorted(os.listdir(backup_dir)) == [f"backup.{mode}", f"backup.{mode}.index.jsonl"]
+        assert writer.backup_store.statistics == {'files': 8, 'stored_blobs': 7, 'deduplicated': 1}
+
+        # 归档可以被标准工具读取
+        archive_path = os.path.join(backup_dir, f"backup.{mode}")
+        if mode == 'tar':
+            with tarfile.open(archive_path) as archive:
+                assert len(archive.getnames()) == 7
+        else:
+            with zipfile.ZipFile(archive_path) as archive:
+                assert archive.testzip() is None
+                assert len(archive.namelist()) == 7
+
+        # 单个文件随机读取恢复
+        writer = _create_writer(project_dir, mode, compress)
+        assert writer.restore_from_backup(paths[3])
+        assert _read_all([paths[3]])[paths[3]] == originals[paths[3]]
+
+        # 批量恢复
+        restored = writer.restore_all()
+        assert len(restored) == 8
+        assert _read_all(paths) == originals
+
+        info = writer.get_backup_info()
+        assert info['backup_file_count'] == 8
+        assert info['blob_count'] == 7
+        print(f"✅ {mode} 归档备份{'（压缩）' if compress else ''}恢复正确")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_tar_archive():
+    """测试tar归档备份"""
+    _migrate_and_restore('tar', False)
+    _migrate_and_restore('tar', True)
+
+
+def test_zip_archive():
+    """测试zip归档备份"""
+    _migrate_and_restore('zip', False)
+    _migrate_and_restore('zip', True)
+
+
+def test_append_after_interrupted_run():
+    """测试上次运行未正常关闭归档时，下次运行继续追加且旧备份仍可读取"""
+    for mode in ('tar', 'zip'):
+        project_dir = _create_project(4)
+        try:
+            paths = _java_files(project_dir)
+            originals = _read_all(paths)
+            backup_dir = os.path.join(project_dir, "butterknife_backup")
+
+            # 第一次运行没有调用 close()，归档缺少结束标记
+            first = BackupArchive(backup_dir, mode)
+            reference = first.add("first", paths[0])
+            first._index_file.close()
+            if mode == 'tar':
+                first._archive_file.close()
+            else:
+                # 模拟进程退出：不写中央目录
+                first._archive.fp.close()
+                first._archive.fp = None
+
+            second = BackupArchive(backup_dir, mode)
+            second.add("second", paths[2])
+            second.close()
+
+            assert read_reference(reference) == originals[paths[0]]
+            entries = BackupArchive(backup_dir, mode).latest_entries()
+            assert sorted(entries) == ["first", "second"]
+            assert entries["second"]['run'] == second.run_id
+            print(f"✅ {mode} 归档在中断后继续追加")
+        finally:
+            shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_stale_hash_not_trusted():
+    """测试计算哈希后文件被修改时，不使用调用方提供的哈希，备份文件的实际内容"""
+    project_dir = _create_project(2)
+    try:
+        first, second = _java_files(project_dir)
+        archive = BackupArchive(os.path.join(project_dir, "butterknife_backup"), 'tar')
+        archive.add("first", first)
+        source_hash = archive.latest_entries()["first"]['hash']
+
+        stat = os.stat(second)
+        with open(second, 'w', encoding='utf-8') as f:
+            f.write("public class Changed {}\n")
+        reference = archive.add("second", second, source_hash, (stat.st_size, stat.st_mtime_ns))
+        archive.close()
+        assert read_reference(reference) == b"public class Changed {}\n"
+        print("✅ 归档不使用过期的哈希")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试归档备份...")
+    print("=" * 50)
+    test_tar_archive()
+    test_zip_archive()
+    test_append_after_interrupted_run()
+    test_stale_hash_not_trusted()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试内容寻址备份存储
+"""
+
+import sys
+import os
+import shutil
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from writer.file_writer import FileWriter
+from writer.backup_store import BackupStore, OBJECTS_DIR, read_blob
+from project_fixtures import create_project, create_config
+
+SOURCE = "public class Shared {\n    @BindView(R.id.title) TextView title;\n}\n"
+# 两个模块中内容相同的文件
+SHARED_FILES = {os.path.join(module, "src", "main", "java", "Shared.java"): SOURCE for module in ("app", "lib")}
+
+
+def _create_writer(project_dir: str, compress: bool = False) -> FileWriter:
+    """创建启用备份的写入器"""
+    return FileWriter(create_config(project_dir, BACKUP_ENABLED=True, BACKUP_COMPRESS=compress))
+
+
+def _count_blobs(project_dir: str) -> int:
+    """统计对象目录中的对象数"""
+    objects_dir = os.path.join(project_dir, "butterknife_backup", OBJECTS_DIR)
+    return sum(len(names) for _, _, names in os.walk(objects_dir))
+
+
+def _paths(project_dir: str) -> list:
+    """两个模块中的文件路径"""
+    return [os.path.join(project_dir, module, "src", "main", "java", "Shared.java") for module in ("app", "lib")]
+
+
+def test_deduplicated_across_modules_and_runs():
+    """测试相同内容的文件在不同模块和多次运行之间只保存一次"""
+    project_dir = create_project("butterknife_backup_store_", contents=SHARED_FILES)
+    try:
+        writer = _create_writer(project_dir)
+        for path in _paths(project_dir):
+            assert writer.write_file(path, "public class Shared {}\n")
+        writer.close()
+        assert _count_blobs(project_dir) == 1
+        assert writer.backup_store.statistics == {'files': 2, 'stored_blobs': 1, 'deduplicated': 1}
+
+        # 第二次运行：恢复原内容后再次迁移，不产生新对象
+        for path in _paths(project_dir):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(SOURCE)
+        writer = _create_writer(project_dir)
+        for path in _paths(project_dir):
+            assert writer.write_file(path, "public class Shared {}\n")
+        writer.close()
+        assert _count_blobs(project_dir) == 1
+
+        info = writer.get_backup_info()
+        assert info['run_count'] == 2
+        assert info['backup_file_count'] == 2
+        assert info['blob_count'] == 1
+        assert info['original_size'] == len(SOURCE.encode('utf-8'))
+        print("✅ 相同内容只保存一次")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_restore_compressed_backup():
+    """测试从压缩对象恢复文件内容和修改时间"""
+    project_dir = create_project("butterknife_backup_store_", contents=SHARED_FILES)
+    try:
+        path = _paths(project_dir)[0]
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        writer = _create_writer(project_dir, compress=True)
+        assert writer.write_file(path, "public class Shared {}\n")
+        writer.close()
+
+        blob_path = writer.backup_store.lookup(writer.get_relative_path(path))['blob']
+        assert blob_path.endswith(".z")
+
+        # 新的写入器从清单中查找备份
+        writer = _create_writer(project_dir, compress=True)
+        assert writer.restore_from_backup(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == SOURCE
+        assert os.stat(path).st_mtime_ns == 1_000_000_000
+        assert not writer.restore_from_backup(_paths(project_dir)[1])
+        print("✅ 从压缩备份恢复文件")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_restore_legacy_backup():
+    """测试按目录结构复制的旧版备份仍可恢复"""
+    project_dir = create_project("butterknife_backup_store_", contents=SHARED_FILES)
+    try:
+        path = _paths(project_dir)[0]
+        legacy_path = os.path.join(project_dir, "butterknife_backup", "app", "src", "main", "java", "Shared.java")
+        os.makedirs(os.path.dirname(legacy_path))
+        shutil.copy(path, legacy_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("public class Shared {}\n")
+
+        writer = _create_writer(project_dir)
+        assert writer.restore_from_backup(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == SOURCE
+        print("✅ 旧版备份可以恢复")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_stale_hash_not_trusted():
+    """测试计算哈希后文件被修改时，不使用调用方提供的哈希，备份文件的实际内容"""
+    project_dir = create_project("butterknife_backup_store_", contents=SHARED_FILES)
+    try:
+        first, second = _paths(project_dir)
+        store = BackupStore(os.path.join(project_dir, "butterknife_backup"))
+        store.add("first", first)
+        source_hash = store.lookup("first")['hash']
+
+        stat = os.stat(second)
+        with open(second, 'w', encoding='utf-8') as f:
+            f.write("public class Changed {}\n")
+        blob_path = store.add("second", second, source_hash, (stat.st_size, stat.st_mtime_ns))
+        assert read_blob(blob_path) == b"public class Changed {}\n"
+
+        # 文件未变化时直接使用已保存的对象
+        stat = os.stat(first)
+        store.add("third", first, source_hash, (stat.st_size, stat.st_mtime_ns))
+        store.close()
+        assert store.statistics == {'files': 3, 'stored_blobs': 2, 'deduplicated': 1}
+        print("✅ 过期的哈希不会被使用")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试备份存储...")
+    print("=" * 50)
+    test_deduplicated_across_modules_and_runs()
+    test_restore_compressed_backup()
+    test_restore_legacy_backup()
+    test_stale_hash_not_trusted()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试基准测试套件：合成项目生成器与分阶段计时
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.project_generator import AndroidProjectGenerator, parse_size_distribution
+from benchmarks import bench_migration
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+
+
+def _read_tree(root):
+    """读取目录下所有文件内容"""
+    contents = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+
+def test_generator_deterministic():
+    """测试相同参数和种子生成完全相同的项目"""
+    generator = AndroidProjectGenerator(activities=2, fragments=2, adapters=2, plain=2, seed=7)
+    first = tempfile.mkdtemp()
+    second = tempfile.mkdtemp()
+    try:
+        statistics = generator.generate(first)
+        generator.generate(second)
+        assert _read_tree(first) == _read_tree(second)
+        assert statistics['files'] == 8
+        assert statistics['butterknife_files'] == 6
+        assert statistics['by_kind'] == {'activity': 2, 'fragment': 2, 'adapter': 2, 'plain': 2}
+    finally:
+        shutil.rmtree(first, ignore_errors=True)
+        shutil.rmtree(second, ignore_errors=True)
+    print("✅ 相同种子生成的项目完全相同")
+
+
+def test_generated_sources_parse():
+    """测试生成的源码包含ViewHolder内部类和多ID点击方法，并能被解析"""
+    generator = AndroidProjectGenerator(activities=1, fragments=1, adapters=1, plain=1,
+                                        views_per_class=4, clicks_per_class=2, ids_per_click=3,
+                                        size_distribution=parse_size_distribution("1:4"))
+    root = tempfile.mkdtemp()
+    try:
+        statistics = generator.generate(root)
+        parser = ButterKnifeParser()
+        sources = {os.path.basename(path): content.decode('utf-8') for path, content in _read_tree(root).items()}
+
+        adapter = sources['Bench0Adapter.java']
+        assert 'static class ViewHolder extends RecyclerView.ViewHolder' in adapter
+        assert len(adapter.encode('utf-8')) >= 4 * 1024
+
+        activity = parser.parse(sources['Bench0Activity.java'])
+        assert len(activity['bind_views']) == 4
+        assert any(len(on_click['ids']) == 3 for on_click in activity['on_clicks'])
+
+        assert not parser.parse(sources['Bench0Helper.java'])['has_butterknife']
+        assert statistics['bind_views'] == 12
+        assert statistics['on_clicks'] == 4
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print("✅ 生成的源码结构正确")
+
+
+def test_bench_migration_report():
+    """测试分阶段基准测试输出的结果结构"""
+    generator = AndroidProjectGenerator(activities=2, fragments=1, adapters=1, plain=2,
+                                        size_distribution=parse_size_distribution("1:2"))
+    report = bench_migration.run(generator, repeat=1)
+
+    assert set(report['stages']) == set(bench_migration.STAGES)
+    assert report['files_scanned'] == 6
+    assert report['files_migrated'] == 4
+    assert report['stages']['transform']['files'] == 4
+    assert report['migrate_seconds'] > 0
+
+    comparison = bench_migration.compare_reports(report, report)
+    assert comparison['parse']['ratio'] == 1.0
+    assert 'migrate' in comparison
+    print("✅ 分阶段基准测试结果结构正确")
+
+
+if __name__ == "__main__":
+    print("🧪 测试基准测试套件...")
+    test_generator_deterministic()
+    test_generated_sources_parse()
+    test_bench_migration_report()
+    print("🎉 所有测试通过！")
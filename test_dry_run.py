@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试预览模式：不写入文件、不创建备份，输出的差异与实际迁移结果一致
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from main import ButterKnifeMigrator
+from writer.diff_writer import unified_diff
+from project_fixtures import JAVA_DIR, SAMPLE_FILES, create_project, create_config
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _read_tree(project_dir: str) -> dict:
+    """读取项目中的所有文件"""
+    contents = {}
+    for root, _, names in os.walk(project_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, project_dir)] = f.read()
+    return contents
+
+
+def _create_config(project_dir: str) -> Config:
+    """创建测试配置"""
+    return create_config(project_dir, BACKUP_ENABLED=True, LOG_LEVEL='WARNING')
+
+
+def test_unified_diff_no_newline():
+    """测试文件末尾没有换行时的差异格式"""
+    diff = unified_diff("class A {\n}", "class A {\n    int a;\n}", os.path.join("src", "A.java"))
+    assert diff.startswith("diff --git a/src/A.java b/src/A.java\n--- a/src/A.java\n+++ b/src/A.java\n")
+    assert diff.endswith("+    int a;\n }\n\\ No newline at end of file\n")
+    assert unified_diff("same\n", "same\n", "A.java") == ""
+    print("✅ 差异格式正确")
+
+
+def test_dry_run_writes_nothing():
+    """测试预览模式不修改项目，补丁应用后与实际迁移结果一致"""
+    project_dir = create_project("butterknife_dry_run_")
+    migrated_dir = create_project("butterknife_dry_run_")
+    patch_path = os.path.join(tempfile.mkdtemp(prefix="butterknife_patch_"), "migration.patch")
+    try:
+        before = _read_tree(project_dir)
+        config = _create_config(project_dir)
+        config.DRY_RUN = True
+        config.DIFF_OUTPUT = patch_path
+        ButterKnifeMigrator(config).migrate()
+
+        # 没有修改文件、没有备份、缓存和报告
+        assert _read_tree(project_dir) == before
+        with open(patch_path, 'r', encoding='utf-8') as f:
+            patch = f.read()
+        assert patch.count("diff --git ") == len(SAMPLE_FILES)
+
+        # 实际迁移另一份相同的项目，应用补丁后结果应当一致
+        ButterKnifeMigrator(_create_config(migrated_dir)).migrate()
+        if shutil.which("git"):
+            subprocess.run(["git", "apply", patch_path], cwd=project_dir, check=True)
+            patched = {k: v for k, v in _read_tree(project_dir).items() if k.startswith(JAVA_DIR)}
+            migrated = {k: v for k, v in _read_tree(migrated_dir).items() if k.startswith(JAVA_DIR)}
+            assert patched == migrated
+        print("✅ 预览模式未写入任何文件，补丁与实际迁移结果一致")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+        shutil.rmtree(migrated_dir, ignore_errors=True)
+        shutil.rmtree(os.path.dirname(patch_path), ignore_errors=True)
+
+
+def test_dry_run_stdout():
+    """测试命令行预览模式把差异输出到标准输出"""
+    project_dir = create_project("butterknife_dry_run_")
+    try:
+        before = _read_tree(project_dir)
+        completed = subprocess.run(
+            [sys.executable, os.path.join(BASE_DIR, "main.py"), "--dry-run", "-p", project_dir],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, encoding='utf-8'
+        )
+        assert completed.returncode == 0, completed.stderr
+        assert completed.stdout.count("diff --git ") == len(SAMPLE_FILES)
+        # 日志输出到标准错误，标准输出可以直接作为补丁使用
+        assert "[INFO]" not in completed.stdout
+        assert "[INFO]" in completed.stderr
+        assert _read_tree(project_dir) == before
+        print("✅ 命令行预览模式输出差异")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试预览模式...")
+    print("=" * 50)
+    test_unified_diff_no_newline()
+    test_dry_run_writes_nothing()
+    test_dry_run_stdout()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试编辑缓冲区
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.edit_buffer import EditBuffer, EditConflictError
+from transformer.findview_transformer import FindViewTransformer
+
+
+def test_apply_edits():
+    """测试多次编辑一次性应用"""
+    buffer = EditBuffer("0123456789")
+    buffer.replace(7, 2, "ab")
+    buffer.insert(3, "X")
+    buffer.delete(0, 1)
+    buffer.insert(3, "Y")
+    buffer.insert(10, "!")
+
+    assert len(buffer) == 5
+    assert buffer.apply() == "12XY3456ab9!"
+    print("✅ 编辑应用正确")
+
+
+def test_conflicts():
+    """测试冲突检测"""
+    buffer = EditBuffer("0123456789")
+    buffer.delete(2, 4)
+
+    for offset, length in ((0, 3), (5, 2), (3, 1), (1, 6), (4, 0)):
+        assert buffer.conflicts(offset, length)
+        try:
+            buffer.replace(offset, length, "")
+            assert False, "应该检测到冲突"
+        except EditConflictError:
+            pass
+
+    # 相邻的编辑不冲突
+    buffer.insert(2, "a")
+    buffer.insert(6, "b")
+    buffer.delete(6, 1)
+    buffer.insert(9, "c")
+    assert buffer.conflicts(8, 2)
+
+    try:
+        buffer.insert(11, "x")
+        assert False, "应该检测到越界"
+    except EditConflictError:
+        pass
+
+    assert buffer.apply() == "01ab78c9"
+    print("✅ 冲突检测正确")
+
+
+def test_findview_replacements():
+    """测试FindView转换器通过编辑缓冲区替换重复的注解"""
+    code = (
+        "public class A {\n"
+        "    @BindView(R.id.title)\n"
+        "    TextView title;\n"
+        "    @BindView(R.id.icon) ImageView icon;\n"
+        "}\n"
+    )
+    parsed_data = {
+        'bind_views': [
+            {'id': 'R.id.title', 'type': 'TextView', 'name': 'title'},
+            {'id': 'R.id.icon', 'type': 'ImageView', 'name': 'icon'},
+            {'id': 'R.id.title', 'type': 'TextView', 'name': 'title'},
+        ]
+    }
+
+    result = FindViewTransformer().transform(parsed_data, code)
+    assert '@BindView' not in result
+    assert 'TextView title;' in result
+    assert 'ImageView icon;' in result
+    print("✅ FindView注解替换正确")
+
+
+if __name__ == "__main__":
+    test_apply_edits()
+    test_conflicts()
+    test_findview_replacements()
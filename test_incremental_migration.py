@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试增量迁移模式
+"""
+
+import sys
+import os
+import shutil
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache.scan_manifest import ScanManifest, scan_settings_key
+from config import Config
+from main import ButterKnifeMigrator
+from scanner.file_scanner import FileScanner
+from project_fixtures import JAVA_DIR, create_project, create_config
+
+
+def _create_project() -> str:
+    """创建临时项目"""
+    return create_project(
+        "butterknife_incremental_",
+        copies={os.path.join(JAVA_DIR, "ui", "TestActivity.java"): "TestActivity.java"},
+        contents={os.path.join(JAVA_DIR, "model", "User.java"): "public class User {\n}\n"}
+    )
+
+
+def _create_config(project_dir: str) -> Config:
+    """创建增量模式配置"""
+    return create_config(project_dir, BACKUP_ENABLED=False, INCREMENTAL=True)
+
+
+def _scan_changed(config: Config) -> list:
+    """使用已保存的清单执行一次增量扫描，并统计重新列出的目录数"""
+    manifest = ScanManifest(config.get_cache_dir(), "settings")
+    listed = []
+    original_scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(path)
+        return original_scandir(path)
+
+    os.scandir = counting_scandir
+    try:
+        changed = FileScanner(config).scan_changed_files(manifest)
+    finally:
+        os.scandir = original_scandir
+
+    manifest.save()
+    return changed, listed
+
+
+def test_incremental_migration():
+    """测试增量模式只处理新增或修改的文件"""
+    project_dir = _create_project()
+    java_dir = os.path.join(project_dir, "app", "src", "main", "java")
+    try:
+        config = _create_config(project_dir)
+        migrator = ButterKnifeMigrator(config)
+        migrator.migrate()
+
+        activity_path = os.path.join(java_dir, "ui", "TestActivity.java")
+        manifest = migrator.scan_manifest
+        assert manifest.get_outcome(activity_path) == 'migrated'
+        assert manifest.get_outcome(os.path.join(java_dir, "model", "User.java")) == 'no_butterknife'
+
+        # 第二次运行：没有任何变化
+        manifest = ScanManifest(config.get_cache_dir(), manifest.settings_key)
+        assert FileScanner(config).scan_changed_files(manifest) == []
+        print("✅ 未修改的项目不需要处理任何文件")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_only_changed_directories_listed():
+    """测试只重新列出mtime变化的目录"""
+    project_dir = _create_project()
+    java_dir = os.path.join(project_dir, "app", "src", "main", "java")
+    try:
+        config = _create_config(project_dir)
+        changed, listed = _scan_changed(config)
+        assert len(changed) == 2
+
+        # 记录处理结果后，没有目录需要重新列出
+        manifest = ScanManifest(config.get_cache_dir(), "settings")
+        for file_path in changed:
+            manifest.record(file_path, 'no_butterknife')
+        FileScanner(config).scan_changed_files(manifest)
+        manifest.save()
+
+        changed, listed = _scan_changed(config)
+        assert changed == [] and listed == []
+
+        # 新增文件只会重新列出其所在目录
+        new_file = os.path.join(java_dir, "model", "Order.java")
+        with open(new_file, 'w', encoding='utf-8') as f:
+            f.write("public class Order {\n}\n")
+        changed, listed = _scan_changed(config)
+        assert changed == [new_file]
+        assert listed == [os.path.join(java_dir, "model")]
+
+        # 修改文件内容不改变目录mtime，但文件本身会被检测到
+        user_file = os.path.join(java_dir, "model", "User.java")
+        with open(user_file, 'a', encoding='utf-8') as f:
+            f.write("// changed\n")
+        changed, listed = _scan_changed(config)
+        assert user_file in changed
+        assert listed == []
+        print("✅ 只重新列出变化的目录")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_settings_change_invalidates_manifest():
+    """测试扫描配置变化时清单失效"""
+    config = Config()
+    key = scan_settings_key(config)
+    config.EXCLUDE_DIRECTORIES = config.EXCLUDE_DIRECTORIES + ["generated"]
+    assert scan_settings_key(config) != key
+    print("✅ 配置变化后清单失效")
+
+
+if __name__ == "__main__":
+    test_incremental_migration()
+    test_only_changed_directories_listed()
+    test_settings_change_invalidates_manifest()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试注入器调试信息按日志级别输出
+"""
+
+import sys
+import os
+import io
+import contextlib
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from injector.code_injector import CodeInjector
+from pipeline.file_pipeline import FilePipeline
+from utils.logger import Logger
+
+
+def _prepare():
+    """解析并转换测试Activity，返回注入前的代码和解析结果"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base_dir, 'TestActivity.java'), 'r', encoding='utf-8') as f:
+        source = f.read()
+    pipeline = FilePipeline(Config())
+    parsed_data = pipeline.parse(source)
+    return pipeline.transform(parsed_data, source), parsed_data
+
+
+def _inject(logger):
+    """执行注入并捕获控制台输出"""
+    code, parsed_data = _prepare()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = CodeInjector(logger).inject(code, parsed_data)
+    return result, output.getvalue()
+
+
+def _create_logger(level: str) -> Logger:
+    """创建同步输出到控制台的日志记录器"""
+    config = Config()
+    config.LOG_LEVEL = level
+    config.LOG_FILE = None
+    config.LOG_ASYNC = False
+    return Logger(config)
+
+
+def test_no_output_by_default():
+    """测试默认（无日志记录器）和INFO级别不输出调试信息"""
+    result, output = _inject(None)
+    assert output == ''
+    info_result, info_output = _inject(_create_logger('INFO'))
+    assert info_output == ''
+    assert info_result == result
+    print("✅ 非调试模式不输出调试信息")
+
+
+def test_debug_output():
+    """测试DEBUG级别通过日志记录器输出调试信息，且不影响注入结果"""
+    result, _ = _inject(None)
+    debug_result, output = _inject(_create_logger('DEBUG'))
+    assert debug_result == result
+    assert '[DEBUG] CodeInjector: ' in output
+    assert 'DEBUG: ' not in output.replace('[DEBUG] CodeInjector: ', '')
+    print(f"✅ 调试模式输出 {output.count(chr(10))} 行调试信息")
+
+
+if __name__ == "__main__":
+    print("🧪 测试注入器调试日志...")
+    test_no_output_by_default()
+    test_debug_output()
+    print("🎉 所有测试通过！")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试Java词法分析器
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.java_lexer import tokenize_java, mask_java, TOKEN_STRING, TOKEN_CHAR, TOKEN_LINE_COMMENT, TOKEN_BLOCK_COMMENT
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+
+TEST_CODE = '''public class MainActivity extends Activity {
+    // 注释中的括号 {
+    /* 块注释中的括号 } */
+    private String text = "字符串中的括号 {}";
+    private char brace = '{';
+
+    @Override
+    protected void onCreate(Bundle savedInstanceState) {
+        if (text != null) {
+            Log.d("TAG", "}");
+        }
+    }
+}
+'''
+
+
+def test_literals_and_comments():
+    """测试字符串、字符和注释被识别为非代码记号"""
+    tokens = tokenize_java(TEST_CODE)
+    kinds = set(tokens.kinds)
+
+    for kind in (TOKEN_STRING, TOKEN_CHAR, TOKEN_LINE_COMMENT, TOKEN_BLOCK_COMMENT):
+        assert kind in kinds
+
+    assert not tokens.is_code(TEST_CODE.index('"字符串') + 1)
+    assert not tokens.is_code(TEST_CODE.index("'{'") + 1)
+    assert tokens.is_code(TEST_CODE.index('onCreate'))
+    print("✅ 字面量和注释识别正确")
+
+
+def test_brace_matching():
+    """测试大括号配对忽略字符串和注释中的括号"""
+    tokens = tokenize_java(TEST_CODE)
+    class_open = TEST_CODE.index('{')
+    class_close = TEST_CODE.rindex('}')
+    assert tokens.matching_brace(class_open) == class_close
+    assert tokens.matching_brace(class_close) == class_open
+
+    method_start = TEST_CODE.index('protected void onCreate')
+    method_open = tokens.find_open_brace(method_start)
+    method_close = tokens.matching_brace(method_open)
+    assert TEST_CODE[method_close - 6:method_close + 1] == '}\n    }'
+    print("✅ 大括号配对正确")
+
+
+def test_find_balance_point():
+    """测试从方法体内部查找平衡点"""
+    tokens = tokenize_java(TEST_CODE)
+    body_start = TEST_CODE.index('{', TEST_CODE.index('onCreate')) + 1
+    end = tokens.find_balance_point(body_start, depth=1)
+    assert end == tokens.matching_brace(body_start - 1)
+    assert tokens.find_balance_point(len(TEST_CODE)) == -1
+    print("✅ 平衡点查找正确")
+
+
+def test_unterminated_literals():
+    """测试未闭合的注释和字符串不会导致异常"""
+    tokens = tokenize_java('class A { String s = "abc\n} /* 未闭合')
+    assert tokens.find_balance_point(0) != -1
+    assert tokenize_java('class A {') is tokenize_java('class A {')
+    print("✅ 未闭合字面量处理正确")
+
+
+def test_mask_preserves_offsets():
+    """测试屏蔽注释和字符串后文本等长，代码不变，与词法分析结果一致"""
+    masked = mask_java(TEST_CODE)
+    assert len(masked) == len(TEST_CODE)
+    assert masked.count('\n') == TEST_CODE.count('\n')
+
+    tokens = tokenize_java(TEST_CODE)
+    for offset, (original, char) in enumerate(zip(TEST_CODE, masked)):
+        if tokens.is_code(offset) or original in '\n"\'':
+            assert char == original, offset
+        else:
+            assert char == ' ', offset
+    assert '{' not in masked[masked.index('private String'):masked.index('@Override')]
+    assert masked.index('protected void onCreate') == TEST_CODE.index('protected void onCreate')
+    print("✅ 屏蔽后偏移量不变")
+
+
+def test_parser_ignores_comments_and_strings():
+    """测试解析器跳过注释中的注解，字符串中的 // 不影响同一行的注解"""
+    content = (
+        'public class A extends Activity {\n'
+        '    // @BindView(R.id.old) TextView old;\n'
+        '    /* @BindView(R.id.block) TextView block; */ @BindView(R.id.title) TextView title;\n'
+        '    String url = "http://example.com"; @BindView(R.id.name) TextView name;\n'
+        '    String fake = "@BindView(R.id.fake) TextView fake;";\n'
+        '}\n'
+    )
+    bind_views = ButterKnifeParser().parse(content)['bind_views']
+    assert [bind_view['name'] for bind_view in bind_views] == ['title', 'name']
+    print("✅ 解析器正确跳过注释和字符串")
+
+
+if __name__ == "__main__":
+    test_literals_and_comments()
+    test_brace_matching()
+    test_find_balance_point()
+    test_unterminated_literals()
+    test_mask_preserves_offsets()
+    test_parser_ignores_comments_and_strings()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试Java文件结构模型
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.java_model import JavaFileModel
+from injector.code_injector import CodeInjector
+
+TEST_CODE = '''package com.example;
+
+public class MainActivity extends BaseActivity {
+    private String text = "class Fake {";
+
+    @Override
+    protected void onCreate(Bundle savedInstanceState) {
+        super.onCreate(savedInstanceState);
+        button.setOnClickListener(new View.OnClickListener() {
+            @Override
+            public void onClick(View v) {
+                if (v != null) {
+                    finish();
+                }
+            }
+        });
+    }
+
+    static class ItemHolder extends RecyclerView.ViewHolder {
+        @BindView(R.id.title)
+        TextView title;
+
+        public ItemHolder(View itemView) {
+            super(itemView);
+        }
+    }
+
+    @OnClick({R.id.a, R.id.b})
+    public Map<String, List<Integer>> load(int a, int b) throws IOException {
+        return null;
+    }
+}
+'''
+
+
+def test_members():
+    """测试类、方法、构造器的识别"""
+    model = JavaFileModel(TEST_CODE)
+
+    main_class = model.main_class
+    assert main_class['name'] == 'MainActivity'
+    assert main_class['extends'] == 'BaseActivity'
+    assert main_class['end'] == TEST_CODE.rindex('}') + 1
+
+    names = [(m['kind'], m['name']) for m in model.members]
+    assert ('method', 'onCreate') in names
+    assert ('anonymous', '') in names
+    assert ('method', 'onClick') in names
+    assert ('class', 'ItemHolder') in names
+    assert ('constructor', 'ItemHolder') in names
+    assert ('method', 'load') in names
+    assert not any(name == 'Fake' for _, name in names)
+
+    load = model.find_methods('load')[0]
+    assert load['annotations'] == ['OnClick']
+    assert load['modifiers'] == ['public']
+    assert load['parameters'] == 'int a, int b'
+    print("✅ 成员识别正确")
+
+
+def test_member_at():
+    """测试按偏移量查找最内层成员"""
+    model = JavaFileModel(TEST_CODE)
+
+    assert model.member_at(TEST_CODE.index('finish()'))['name'] == 'onClick'
+    assert model.member_at(TEST_CODE.index('super.onCreate'))['name'] == 'onCreate'
+    assert model.member_at(TEST_CODE.index('TextView title'))['name'] == 'ItemHolder'
+    assert model.member_at(TEST_CODE.index('private String text'))['name'] == 'MainActivity'
+    assert model.member_at(0) is None
+    assert model.enclosing(TEST_CODE.index('finish()'))['kind'] == 'anonymous'
+    print("✅ 偏移量查找正确")
+
+
+def test_injector_inner_classes():
+    """测试注入器基于结构模型查找内部类"""
+    injector = CodeInjector()
+    inner_classes = injector._find_inner_classes(TEST_CODE)
+
+    assert [c['name'] for c in inner_classes] == ['ItemHolder']
+    assert inner_classes[0]['extends'] == 'RecyclerView.ViewHolder'
+    assert TEST_CODE[inner_classes[0]['end'] - 1] == '}'
+    print("✅ 内部类查找正确")
+
+
+if __name__ == "__main__":
+    test_members()
+    test_member_at()
+    test_injector_inner_classes()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试异步日志记录器
+"""
+
+import sys
+import os
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+import multiprocessing.util
+from utils.logger import Logger, _live_loggers
+
+
+class _CountingArg:
+    """记录被格式化次数的参数"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "value"
+
+
+def _create_config(log_dir: str, asynchronous: bool = True) -> Config:
+    """创建日志写入临时目录的配置"""
+    config = Config()
+    config.PROJECT_PATH = log_dir
+    config.LOG_ASYNC = asynchronous
+    config.LOG_FLUSH_INTERVAL = 10
+    config.LOG_BATCH_SIZE = 1000
+    return config
+
+
+def _read_log(log_dir: str) -> list:
+    """读取日志文件的所有行"""
+    with open(os.path.join(log_dir, "butterknife_migration.log"), 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_lazy_formatting():
+    """测试被级别过滤的消息不会格式化参数"""
+    log_dir = tempfile.mkdtemp(prefix="butterknife_logger_")
+    try:
+        logger = Logger(_create_config(log_dir))
+        argument = _CountingArg()
+        logger.debug("调试 %s", argument)
+        assert argument.count == 0
+
+        logger.warning("警告 %s %d", argument, 3)
+        logger.close()
+        assert argument.count == 1
+        assert _read_log(log_dir)[-1].endswith("[WARNING] 警告 value 3")
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    print("✅ 被过滤的消息不会格式化")
+
+
+def test_batched_flush():
+    """测试后台线程按批写入，flush 后日志完整且有序"""
+    log_dir = tempfile.mkdtemp(prefix="butterknife_logger_")
+    try:
+        config = _create_config(log_dir)
+        config.LOG_LEVEL = 'WARNING'
+        logger = Logger(config)
+        for index in range(100):
+            logger.warning("消息 %d", index)
+        logger.flush()
+
+        lines = _read_log(log_dir)
+        assert len(lines) == 100
+        assert lines[0].endswith("消息 0") and lines[-1].endswith("消息 99")
+        logger.close()
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    print("✅ 批量写入完整有序")
+
+
+def test_synchronous_mode():
+    """测试关闭异步后每条日志立即写入"""
+    log_dir = tempfile.mkdtemp(prefix="butterknife_logger_")
+    try:
+        logger = Logger(_create_config(log_dir, asynchronous=False))
+        logger.warning("同步 %s", "消息")
+        assert _read_log(log_dir)[-1].endswith("同步 消息")
+        logger.close()
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    print("✅ 同步模式立即写入")
+
+
+def test_no_loss_on_interrupt():
+    """测试未捕获的 KeyboardInterrupt 退出时日志不会丢失"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    log_dir = tempfile.mkdtemp(prefix="butterknife_logger_")
+    script = (
+        "import sys\n"
+        f"sys.path.insert(0, {base_dir!r})\n"
+        "from config import Config\n"
+        "from utils.logger import Logger\n"
+        "config = Config()\n"
+        f"config.PROJECT_PATH = {log_dir!r}\n"
+        "config.LOG_FLUSH_INTERVAL = 60\n"
+        "config.LOG_BATCH_SIZE = 100000\n"
+        "logger = Logger(config)\n"
+        "for index in range(2000):\n"
+        "    logger.warning('消息 %d', index)\n"
+        "raise KeyboardInterrupt\n"
+    )
+    try:
+        process = subprocess.run([sys.executable, "-c", script], stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE)
+        assert b"KeyboardInterrupt" in process.stderr
+        lines = _read_log(log_dir)
+        assert len(lines) == 2000
+        assert lines[-1].endswith("消息 1999")
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    print("✅ KeyboardInterrupt 退出时日志完整")
+
+
+def _log_in_child(logger: Logger, count: int):
+    """子进程中通过继承的日志记录器写日志后直接退出"""
+    for index in range(count):
+        logger.warning("子进程消息 %d", index)
+
+
+def test_no_loss_in_forked_child():
+    """测试fork出的子进程（不运行atexit）退出时日志不会丢失"""
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("⏭️ 当前平台不支持fork，跳过")
+        return
+
+    log_dir = tempfile.mkdtemp(prefix="butterknife_logger_")
+    try:
+        config = _create_config(log_dir)
+        config.LOG_LEVEL = 'WARNING'
+        config.LOG_FLUSH_INTERVAL = 60
+        config.LOG_BATCH_SIZE = 100000
+        logger = Logger(config)
+        process = multiprocessing.get_context('fork').Process(target=_log_in_child, args=(logger, 500))
+        process.start()
+        process.join()
+        logger.close()
+
+        lines = _read_log(log_dir)
+        assert process.exitcode == 0
+        assert len(lines) == 500
+        assert lines[-1].endswith("子进程消息 499")
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    print("✅ fork子进程退出时日志完整")
+
+
+def test_shutdown_hook_registered_once():
+    """测试创建多个日志记录器不会累积退出回调，关闭后不再被退出回调引用"""
+    log_dir = tempfile.mkdtemp(prefix="butterknife_logger_")
+    try:
+        Logger(_create_config(log_dir)).close()
+        finalizers = len(multiprocessing.util._finalizer_registry)
+        loggers = [Logger(_create_config(log_dir)) for _ in range(10)]
+        assert len(multiprocessing.util._finalizer_registry) == finalizers
+        assert all(logger in _live_loggers for logger in loggers)
+
+        for logger in loggers:
+            logger.close()
+        assert not any(logger in _live_loggers for logger in loggers)
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    print("✅ 退出回调只注册一次")
+
+
+if __name__ == "__main__":
+    print("🧪 测试异步日志记录器...")
+    test_lazy_formatting()
+    test_batched_flush()
+    test_synchronous_mode()
+    test_no_loss_on_interrupt()
+    test_no_loss_in_forked_child()
+    test_shutdown_hook_registered_once()
+    print("🎉 所有测试通过！")
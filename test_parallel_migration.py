@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试并行迁移与串行迁移输出完全一致
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from main import ButterKnifeMigrator
+from pipeline import worker_pool
+from pipeline.worker_pool import _process_in_worker
+from project_fixtures import JAVA_DIR, create_project, create_config
+
+SOURCE_FILES = [
+    "tests/Agent_DeviceListActivity.java",
+    "butterknife_backup/tests/DeviceListAdapter.java",
+    "TestActivity.java",
+    "TestClass.java",
+    "test_inner_class.java",
+    "test_class_boundary.java",
+]
+
+
+def _create_project() -> str:
+    """创建包含示例文件的临时项目"""
+    # 每个文件复制两份，保证有足够的任务分发给多个进程
+    copies = {
+        os.path.join(JAVA_DIR, f"pkg{index}_{copy}", os.path.basename(source)): source
+        for index, source in enumerate(SOURCE_FILES) for copy in range(2)
+    }
+    return create_project("butterknife_parallel_", copies)
+
+
+def _run_migration(project_dir: str, jobs: int, log_level: str = None, diff_output: str = None) -> dict:
+    """执行迁移并返回所有Java文件的内容（提供diff_output时只预览，输出补丁）"""
+    config = create_config(project_dir, BACKUP_ENABLED=False, JOBS=jobs)
+    if log_level:
+        config.LOG_LEVEL = log_level
+    if diff_output:
+        config.DRY_RUN = True
+        config.DIFF_OUTPUT = diff_output
+
+    ButterKnifeMigrator(config).migrate()
+
+    contents = {}
+    java_dir = os.path.join(project_dir, JAVA_DIR)
+    for root, _, files in os.walk(java_dir):
+        for file in files:
+            path = os.path.join(root, file)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, java_dir)] = f.read()
+
+    return contents
+
+
+def _read_report(project_dir: str) -> dict:
+    """读取迁移报告中与耗时无关的部分"""
+    with open(os.path.join(project_dir, 'butterknife_migration_report.json'), 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    for detail in report['details']:
+        del detail['timings']
+    for key in ('timings', 'slowest_files'):
+        report.pop(key, None)
+    return report
+
+
+def test_parallel_output_identical():
+    """测试并行模式输出与串行模式逐字节一致"""
+    serial_dir = _create_project()
+    parallel_dir = _create_project()
+
+    try:
+        serial_contents = _run_migration(serial_dir, jobs=1)
+        parallel_contents = _run_migration(parallel_dir, jobs=2)
+
+        assert serial_contents.keys() == parallel_contents.keys()
+        for name, content in serial_contents.items():
+            assert content == parallel_contents[name], f"文件内容不一致: {name}"
+        assert _read_report(serial_dir) == _read_report(parallel_dir)
+
+        print(f"✅ {len(serial_contents)} 个文件并行与串行输出一致")
+    finally:
+        shutil.rmtree(serial_dir, ignore_errors=True)
+        shutil.rmtree(parallel_dir, ignore_errors=True)
+
+
+def test_parallel_diff_identical():
+    """测试并行预览模式输出的补丁与串行模式逐字节一致"""
+    project_dir = _create_project()
+    patch_dir = tempfile.mkdtemp(prefix="butterknife_parallel_patch_")
+
+    try:
+        patches = []
+        for jobs in (1, 3):
+            patch_path = os.path.join(patch_dir, f"jobs{jobs}.patch")
+            _run_migration(project_dir, jobs, diff_output=patch_path)
+            with open(patch_path, 'rb') as f:
+                patches.append(f.read())
+
+        assert patches[0].count(b"diff --git ") > 0
+        assert patches[0] == patches[1]
+
+        print("✅ 并行与串行预览补丁一致")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+        shutil.rmtree(patch_dir, ignore_errors=True)
+
+
+def _crash_on_test_class(file_path: str, cached_parse=None):
+    """工作进程处理其中一个文件时直接退出（模拟被系统杀死）"""
+    if file_path.endswith(os.path.join("pkg3_0", "TestClass.java")):
+        os._exit(1)
+    return _process_in_worker(file_path, cached_parse)
+
+
+def test_worker_crash_isolated():
+    """测试工作进程异常退出时迁移继续完成，只有导致退出的文件记为失败"""
+    serial_dir = _create_project()
+    parallel_dir = _create_project()
+
+    try:
+        serial_contents = _run_migration(serial_dir, jobs=1)
+        worker_pool._process_in_worker = _crash_on_test_class
+        try:
+            parallel_contents = _run_migration(parallel_dir, jobs=2)
+        finally:
+            worker_pool._process_in_worker = _process_in_worker
+
+        crashed = os.path.join("pkg3_0", "TestClass.java")
+        report = _read_report(parallel_dir)
+        assert report['failed_migrations'] == 1
+        assert report['total_files'] == _read_report(serial_dir)['total_files']
+        for name, content in serial_contents.items():
+            if name != crashed:
+                assert content == parallel_contents[name], f"文件内容不一致: {name}"
+        assert parallel_contents[crashed] != serial_contents[crashed]
+
+        print("✅ 工作进程异常退出时只有对应文件失败")
+    finally:
+        shutil.rmtree(serial_dir, ignore_errors=True)
+        shutil.rmtree(parallel_dir, ignore_errors=True)
+
+
+def _count_log_lines(project_dir: str, level: str) -> int:
+    """统计项目日志文件中指定级别的行数"""
+    with open(os.path.join(project_dir, Config().LOG_FILE), 'r', encoding='utf-8') as f:
+        return sum(1 for line in f if f"] [{level}] " in line)
+
+
+def test_parallel_debug_log_complete():
+    """测试并行模式下工作进程的调试日志不会丢失"""
+    serial_dir = _create_project()
+    parallel_dir = _create_project()
+
+    try:
+        _run_migration(serial_dir, jobs=1, log_level='DEBUG')
+        _run_migration(parallel_dir, jobs=3, log_level='DEBUG')
+
+        serial_count = _count_log_lines(serial_dir, 'DEBUG')
+        parallel_count = _count_log_lines(parallel_dir, 'DEBUG')
+        assert serial_count > 0
+        assert parallel_count == serial_count, f"调试日志行数不一致: 串行 {serial_count}，并行 {parallel_count}"
+
+        print(f"✅ 并行与串行均输出 {serial_count} 行调试日志")
+    finally:
+        shutil.rmtree(serial_dir, ignore_errors=True)
+        shutil.rmtree(parallel_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_parallel_output_identical()
+    test_parallel_diff_identical()
+    test_worker_crash_isolated()
+    test_parallel_debug_log_complete()
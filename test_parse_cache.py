@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试持久化解析缓存
+"""
+
+import sys
+import os
+import re
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache.parse_cache import ParseCache, parser_fingerprint
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+from butterknife_parser_module.parse_records import ParseResult
+from main import ButterKnifeMigrator
+from project_fixtures import JAVA_DIR, create_project, create_config
+
+PLAIN_CODE = '''public class PlainActivity extends Activity {
+    private TextView title;
+}
+'''
+
+
+def _create_project() -> str:
+    """创建包含一个ButterKnife文件和一个普通文件的临时项目"""
+    return create_project(
+        "butterknife_cache_",
+        copies={os.path.join(JAVA_DIR, "TestActivity.java"): "TestActivity.java"},
+        contents={os.path.join(JAVA_DIR, "PlainActivity.java"): PLAIN_CODE}
+    )
+
+
+def test_cache_skips_unchanged_files():
+    """测试第二次运行时未修改的文件命中缓存"""
+    project_dir = _create_project()
+    try:
+        config = create_config(project_dir, BACKUP_ENABLED=False)
+
+        ButterKnifeMigrator(config).migrate()
+
+        # 迁移后TestActivity已被改写，第二次运行两个文件都不含ButterKnife
+        migrator = ButterKnifeMigrator(config)
+        migrator.migrate()
+
+        cache = ParseCache(config.get_cache_dir(), parser_fingerprint(migrator.parser))
+        plain_path = os.path.join(project_dir, JAVA_DIR, "PlainActivity.java")
+        entry = cache.lookup(plain_path)
+        assert entry == {'has_butterknife': False, 'parsed_data': None}
+
+        # 仅修改时间变化，内容哈希相同仍然命中
+        os.utime(plain_path, ns=(0, 0))
+        assert cache.lookup(plain_path) is not None
+        assert cache.get_statistics() == {'hits': 2, 'misses': 0}
+
+        # 内容变化后失效
+        with open(plain_path, 'a', encoding='utf-8') as f:
+            f.write('// changed\n')
+        assert cache.lookup(plain_path) is None
+        cache.close()
+        print("✅ 未修改的文件命中缓存")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_cache_invalidated_by_pattern_change():
+    """测试解析器正则表达式变化后缓存失效"""
+    cache_dir = tempfile.mkdtemp(prefix="butterknife_cache_")
+    try:
+        parser = ButterKnifeParser()
+        file_path = os.path.join(cache_dir, "A.java")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(PLAIN_CODE)
+        stat = os.stat(file_path)
+
+        cache = ParseCache(cache_dir, parser_fingerprint(parser))
+        cache.store(file_path, stat.st_size, stat.st_mtime_ns, "hash", {'has_butterknife': True, 'bind_views': []})
+        entry = cache.lookup(file_path)
+        assert entry['has_butterknife'] is True
+        assert entry['parsed_data'] == ParseResult.from_mapping({'has_butterknife': True, 'bind_views': []})
+        cache.close()
+
+        parser.bind_call_pattern = re.compile(r'ButterKnife\.bind\s*\(\s*\w+\s*\)\s*;')
+        cache = ParseCache(cache_dir, parser_fingerprint(parser))
+        assert cache.lookup(file_path) is None
+        cache.close()
+        print("✅ 正则表达式变化后缓存失效")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_cache_bounded():
+    """测试缓存条目数量有上限"""
+    cache_dir = tempfile.mkdtemp(prefix="butterknife_cache_")
+    try:
+        cache = ParseCache(cache_dir, "fingerprint", max_entries=3)
+        for index in range(10):
+            cache.store(f"/tmp/File{index}.java", 1, 1, "hash", {'has_butterknife': False})
+        cache.close()
+
+        cache = ParseCache(cache_dir, "fingerprint", max_entries=3)
+        count = cache.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        assert count == 3
+        cache.close()
+        print("✅ 缓存大小受限")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_cache_skips_unchanged_files()
+    test_cache_invalidated_by_pattern_change()
+    test_cache_bounded()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试解析结果记录（ParseResult等）的字典视图和序列化
+"""
+
+import sys
+import os
+import pickle
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser, ParsingResult
+from butterknife_parser_module.parse_records import ParseResult, BindView, ClassInfo
+from cache.parse_cache import ParseCache, parser_fingerprint
+from transformer.findview_transformer import FindViewTransformer
+
+TEST_CODE = '''import butterknife.BindView;
+import butterknife.OnClick;
+
+public class MainActivity extends AppCompatActivity {
+    @BindView(R.id.title) TextView title;
+
+    @OnClick({R.id.title, R.id.button})
+    public void onTitleClick(View view) {
+    }
+}
+'''
+
+
+def test_mapping_view():
+    """测试记录可以按字典方式访问，并与等价的字典比较相等"""
+    result = ButterKnifeParser().parse(TEST_CODE)
+    assert isinstance(result, ParseResult)
+    assert result['bind_views'][0]['name'] == 'title'
+    assert result['on_clicks'][0].get('ids') == ['R.id.title', 'R.id.button']
+    assert result.get('missing', 'default') == 'default'
+    assert result['class_info'] == {'name': 'MainActivity', 'extends': 'AppCompatActivity', 'implements': None}
+    assert result == result.to_dict()
+    assert isinstance(result.to_dict()['bind_views'][0], dict)
+    assert not hasattr(result.bind_views[0], '__dict__')
+    print("✅ 解析结果的字典视图正确")
+
+
+def test_existing_consumers_accept_records():
+    """测试验证、统计和转换器输入检查接受记录"""
+    parser = ButterKnifeParser()
+    result = parser.parse(TEST_CODE)
+    assert parser.validate_parsed_data(result) == (True, [])
+    assert parser.get_parsing_statistics(result)['class_type'] == 'Activity'
+    assert ParsingResult(result).get_bind_views_count() == 1
+    assert FindViewTransformer().validate_input(result, TEST_CODE)
+    assert parser.parse('public class Plain {}')['class_info'] is None
+    print("✅ 现有代码可以直接使用解析结果记录")
+
+
+def test_compact_serialization():
+    """测试pickle和紧凑格式往返一致，且比字典形式更小"""
+    result = ButterKnifeParser().parse(TEST_CODE)
+    assert pickle.loads(pickle.dumps(result)) == result
+    assert len(pickle.dumps(result)) < len(pickle.dumps(result.to_dict()))
+    assert ParseResult.from_compact(result.to_compact()) == result
+    assert ParseResult.from_mapping(result.to_dict()) == result
+
+    bind_view = BindView('R.id.a', 'TextView', 'a', None)
+    assert pickle.loads(pickle.dumps(bind_view)) == bind_view
+    assert ClassInfo('A', None, None) != ClassInfo('B', None, None)
+    print("✅ 紧凑序列化往返一致")
+
+
+def test_cache_round_trip():
+    """测试解析缓存保存和读取记录"""
+    cache_dir = tempfile.mkdtemp(prefix="butterknife_records_")
+    try:
+        file_path = os.path.join(cache_dir, 'MainActivity.java')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(TEST_CODE)
+        stat = os.stat(file_path)
+
+        parser = ButterKnifeParser()
+        result = parser.parse(TEST_CODE)
+        cache = ParseCache(cache_dir, parser_fingerprint(parser))
+        cache.store(file_path, stat.st_size, stat.st_mtime_ns, 'hash', result)
+        cache.close()
+
+        cache = ParseCache(cache_dir, parser_fingerprint(parser))
+        cached = cache.lookup(file_path)['parsed_data']
+        cache.close()
+        assert isinstance(cached, ParseResult)
+        assert cached == result
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    print("✅ 解析缓存往返一致")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试解析结果记录...")
+    print("=" * 50)
+    test_mapping_view()
+    test_existing_consumers_accept_records()
+    test_compact_serialization()
+    test_cache_round_trip()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
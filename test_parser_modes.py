@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试解析器的两种解析方式（multi / single）结果一致
+"""
+
+import sys
+import os
+import glob
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+from cache.parse_cache import parser_fingerprint
+from benchmarks.project_generator import AndroidProjectGenerator
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ANNOTATION_FIELDS = ('has_butterknife', 'bind_views', 'on_clicks', 'on_long_clicks', 'bind_call', 'imports',
+                     'class_info')
+
+
+def _sample_sources() -> list:
+    """仓库中的示例Java文件"""
+    paths = sorted(glob.glob(os.path.join(BASE_DIR, '*.java')) + glob.glob(os.path.join(BASE_DIR, 'tests', '*.java')))
+    sources = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            sources.append(f.read())
+    return sources
+
+
+def test_modes_agree_on_samples():
+    """测试示例文件上两种方式的注解、import和类信息一致，方法只差注释中的方法"""
+    multi = ButterKnifeParser()
+    single = ButterKnifeParser('single')
+    for content in _sample_sources():
+        expected = multi.parse(content)
+        actual = single.parse(content)
+        for field in ANNOTATION_FIELDS:
+            assert actual[field] == expected[field], field
+        assert set(actual['methods']) <= set(expected['methods'])
+    print("✅ 示例文件上两种解析方式结果一致")
+
+
+def test_modes_agree_on_generated_project():
+    """测试合成项目上两种方式的结果完全一致"""
+    project_dir = tempfile.mkdtemp(prefix="butterknife_parser_modes_")
+    try:
+        AndroidProjectGenerator(activities=3, fragments=3, adapters=3, plain=0, seed=3).generate(project_dir)
+        multi = ButterKnifeParser()
+        single = ButterKnifeParser('single')
+        for path in glob.glob(os.path.join(project_dir, '**', '*.java'), recursive=True):
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            assert single.parse(content) == multi.parse(content), path
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+    print("✅ 合成项目上两种解析方式结果完全一致")
+
+
+def test_single_pass_ignores_comments():
+    """测试single方式不收集注释中的方法和import"""
+    content = (
+        '// import butterknife.OnClick;\n'
+        'import butterknife.BindView;\n'
+        'public class A extends Activity {\n'
+        '    @BindView(R.id.title) TextView title;\n'
+        '    /* public void hidden(View v) { } */\n'
+        '    @OnClick(R.id.title)\n'
+        '    public void onTitle(View v) {\n'
+        '    }\n'
+        '}\n'
+    )
+    result = ButterKnifeParser('single').parse(content)
+    assert result['methods'] == ['onTitle']
+    assert result['imports'] == {'bindview': True, 'onclick': False, 'onlongclick': False, 'butterknife': False}
+    assert result['on_clicks'][0]['method'] == 'onTitle'
+    assert result['on_clicks'][0]['has_view_param'] is True
+    assert result['class_info'] == {'name': 'A', 'extends': 'Activity', 'implements': None}
+    print("✅ single方式跳过注释中的内容")
+
+
+def test_mode_in_cache_fingerprint():
+    """测试解析方式参与缓存指纹，无效的解析方式报错"""
+    assert parser_fingerprint(ButterKnifeParser()) != parser_fingerprint(ButterKnifeParser('single'))
+    try:
+        ButterKnifeParser('fast')
+        assert False, "无效的解析方式应当报错"
+    except ValueError:
+        pass
+    print("✅ 解析方式参与缓存指纹")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试解析方式...")
+    print("=" * 50)
+    test_modes_agree_on_samples()
+    test_modes_agree_on_generated_project()
+    test_single_pass_ignores_comments()
+    test_mode_in_cache_fingerprint()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
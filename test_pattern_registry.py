@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试共享正则注册表
+"""
+
+import sys
+import os
+import re
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser, ParsingResult
+from butterknife_parser_module.parse_records import ParseResult
+from transformer.findview_transformer import FindViewTransformer
+from transformer.onclick_transformer import OnClickTransformer
+from transformer.bindcall_remover import BindCallRemover
+from injector.code_injector import CodeInjector
+from utils.code_formatter import CodeFormatter
+from utils.pattern_registry import PATTERN_REGISTRY, compiled_patterns
+from cache.parse_cache import parser_fingerprint
+
+
+def test_instances_share_patterns():
+    """测试同一组件的不同实例共用同一个编译结果"""
+    first, second = ButterKnifeParser(), ButterKnifeParser('single')
+    assert first.bind_view_pattern is second.bind_view_pattern
+    assert first.single_pass_pattern is ButterKnifeParser.single_pass_pattern
+    assert CodeInjector().onCreate_pattern is CodeInjector().onCreate_pattern
+    assert 'bind_view_pattern' not in vars(first)
+    print("✅ 实例之间共享编译好的正则")
+
+
+def test_method_patterns_registered():
+    """测试方法查找用到的正则也声明为共享正则"""
+    assert 'setcontentview_pattern' in compiled_patterns(CodeInjector())
+    assert 'super_call_pattern' in compiled_patterns(CodeInjector())
+    assert 'onCreate_pattern' in compiled_patterns(FindViewTransformer())
+    assert 'onViewCreated_pattern' in compiled_patterns(OnClickTransformer())
+    assert 'parameter_list_pattern' in compiled_patterns(ButterKnifeParser())
+    print("✅ 方法查找正则已注册")
+
+
+def test_construction_compiles_nothing():
+    """测试构造组件时不编译正则，第一次使用时才编译且只编译一次"""
+    PATTERN_REGISTRY.clear()
+    components = [ButterKnifeParser(), FindViewTransformer(), OnClickTransformer(), BindCallRemover(),
+                  CodeInjector(), CodeFormatter(), ParsingResult(ParseResult.empty())]
+    assert PATTERN_REGISTRY.compiled_count() == 0
+
+    components[0].parse('public class A { @BindView(R.id.a) TextView a; }')
+    compiled = PATTERN_REGISTRY.compiled_count()
+    assert 0 < compiled < PATTERN_REGISTRY.registered_count()
+    ButterKnifeParser().parse('public class B { @BindView(R.id.b) TextView b; }')
+    assert PATTERN_REGISTRY.compiled_count() == compiled
+    print("✅ 构造时不编译正则")
+
+
+def test_instance_override():
+    """测试实例上覆盖的正则只影响该实例，并参与解析缓存指纹"""
+    parser = ButterKnifeParser()
+    fingerprint = parser_fingerprint(parser)
+    assert parser_fingerprint(ButterKnifeParser()) == fingerprint
+
+    parser.bind_call_pattern = re.compile(r'ButterKnife\.bind\s*\(\s*\w+\s*\)\s*;')
+    assert ButterKnifeParser().bind_call_pattern is not parser.bind_call_pattern
+    assert compiled_patterns(parser)['bind_call_pattern'] is parser.bind_call_pattern
+    assert parser_fingerprint(parser) != fingerprint
+    print("✅ 实例覆盖的正则只影响该实例")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试共享正则注册表...")
+    print("=" * 50)
+    test_instances_share_patterns()
+    test_method_patterns_registered()
+    test_construction_compiles_nothing()
+    test_instance_override()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
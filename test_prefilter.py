@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试字节级预过滤器
+"""
+
+import sys
+import os
+import glob
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from butterknife_parser_module.butterknife_parser import ButterKnifeParser
+from scanner import prefilter
+from scanner.prefilter import file_has_butterknife_signature, has_butterknife_signature
+from pipeline.file_pipeline import FilePipeline
+from config import Config
+
+
+def test_signatures():
+    """测试特征串检测"""
+    assert has_butterknife_signature(b'@BindView(R.id.a) TextView a;')
+    assert has_butterknife_signature(b'@OnLongClick(R.id.a)')
+    assert has_butterknife_signature(b'ButterKnife.bind(this);')
+    assert not has_butterknife_signature(b'@Override\npublic void onClick(View v) {}')
+    print("✅ 特征串检测正确")
+
+
+def test_matches_parser():
+    """测试预过滤结果与解析器的判断一致"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = ButterKnifeParser()
+    paths = glob.glob(os.path.join(base_dir, '**', '*.java'), recursive=True)
+    assert paths
+
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            expected = parser._has_butterknife_annotations(f.read())
+        assert file_has_butterknife_signature(path) == expected, path
+    print(f"✅ {len(paths)} 个文件的预过滤结果与解析器一致")
+
+
+def _failing_mmap(*args, **kwargs):
+    """模拟不支持mmap的文件系统"""
+    raise OSError("mmap not supported")
+
+
+def test_large_files_and_mmap_fallback():
+    """测试大文件使用mmap检测，无法mmap时退回整块读取"""
+    original_mmap = prefilter.mmap.mmap
+    with tempfile.NamedTemporaryFile(suffix='.java', delete=False) as f:
+        f.write(b'x' * (prefilter.MMAP_THRESHOLD * 2 - 4) + b'@BindView(R.id.a)')
+        path = f.name
+
+    try:
+        assert file_has_butterknife_signature(path)
+
+        prefilter.mmap.mmap = _failing_mmap
+        assert file_has_butterknife_signature(path)
+    finally:
+        prefilter.mmap.mmap = original_mmap
+        os.remove(path)
+    print("✅ 大文件与mmap失败时的检测正确")
+
+
+def test_pipeline_skips_plain_file():
+    """测试流水线对不含特征串的文件不做解码和解析"""
+    with tempfile.NamedTemporaryFile(suffix='.java', delete=False) as f:
+        f.write(b'public class Plain {}\n\xff')
+        path = f.name
+
+    try:
+        result = FilePipeline(Config()).process_file(path)
+        # 无法解码的内容不会被读取为文本，因此不会产生解析错误
+        assert result['error'] is None
+        assert not result['has_butterknife']
+        assert result['parsed_data'] == {'has_butterknife': False}
+        assert result['content_hash']
+    finally:
+        os.remove(path)
+    print("✅ 流水线跳过不含ButterKnife的文件")
+
+
+if __name__ == "__main__":
+    test_signatures()
+    test_matches_parser()
+    test_large_files_and_mmap_fallback()
+    test_pipeline_skips_plain_file()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试正则表达式在病态输入上的耗时预算（防止灾难性回溯）
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from pipeline.file_pipeline import FilePipeline
+from injector.code_injector import CodeInjector
+from benchmarks.pathological_corpus import PATHOLOGICAL_INPUTS, build_input, build_source
+from benchmarks.bench_regex import (
+    collect_patterns, time_pattern, time_source, PATTERN_BUDGET_SECONDS, SOURCE_BUDGET_SECONDS
+)
+
+PATTERN_INPUT_SIZE = 32 * 1024
+SOURCE_INPUT_SIZE = 16 * 1024
+
+
+def test_patterns_within_budget():
+    """测试每个编译好的正则在每个病态输入上都在预算内完成"""
+    patterns = collect_patterns()
+    assert len(patterns) > 30
+    over_budget = []
+    for input_name in PATHOLOGICAL_INPUTS:
+        text = build_input(input_name, PATTERN_INPUT_SIZE)
+        for pattern_name, pattern in patterns:
+            seconds = time_pattern(pattern, text)
+            if seconds > PATTERN_BUDGET_SECONDS:
+                over_budget.append((pattern_name, input_name, round(seconds, 3)))
+    assert not over_budget, over_budget
+    print(f"✅ {len(patterns)} 个正则在 {len(PATHOLOGICAL_INPUTS)} 种病态输入上均未超出预算")
+
+
+def test_pipeline_within_budget():
+    """测试嵌入病态输入的Activity走完解析、转换、注入流程不超出预算"""
+    pipeline = FilePipeline(Config())
+    over_budget = []
+    for input_name in PATHOLOGICAL_INPUTS:
+        seconds = time_source(pipeline, build_source(input_name, SOURCE_INPUT_SIZE))
+        if seconds > SOURCE_BUDGET_SECONDS:
+            over_budget.append((input_name, round(seconds, 3)))
+    assert not over_budget, over_budget
+    print("✅ 病态文件的完整迁移流程未超出预算")
+
+
+def test_method_declaration_pattern():
+    """测试线性化后的方法声明正则仍能识别各种声明形式"""
+    injector = CodeInjector()
+    assert injector._has_method('    public void initListener() {', 'initListener')
+    assert injector._has_method('    protected static final void initListener(View v) {', 'initListener')
+    assert injector._has_method('private int a; public void initListener() {', 'initListener')
+    assert not injector._has_method('        initListener();', 'initListener')
+    assert not injector._has_method('    public void initListenerLater() {', 'initListener')
+    print("✅ 方法声明识别正确")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试正则耗时预算...")
+    print("=" * 50)
+    test_patterns_within_budget()
+    test_pipeline_within_budget()
+    test_method_declaration_pattern()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试回滚命令：从备份清单并行恢复一次运行修改的所有文件
+"""
+
+import sys
+import os
+import json
+import shutil
+import subprocess
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from main import ButterKnifeMigrator
+from writer.rollback import rollback_run
+from project_fixtures import SAMPLE_FILES, create_project, create_config, read_sources
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _migrate(project_dir: str, backup_mode: str) -> Config:
+    """执行启用备份的迁移"""
+    config = create_config(project_dir, BACKUP_ENABLED=True, BACKUP_MODE=backup_mode,
+                           PARSE_CACHE_ENABLED=False, LOG_LEVEL='WARNING')
+    ButterKnifeMigrator(config).migrate()
+    return config
+
+
+def test_rollback_run():
+    """测试回滚恢复所有文件并校验哈希"""
+    for backup_mode in ('store', 'tar'):
+        project_dir = create_project("butterknife_rollback_")
+        try:
+            originals = read_sources(project_dir)
+            config = _migrate(project_dir, backup_mode)
+            assert read_sources(project_dir) != originals
+
+            with open(os.path.join(project_dir, "butterknife_migration_report.json"), 'r', encoding='utf-8') as f:
+                run_id = json.load(f)['backup_run']
+
+            # 回滚时使用默认的备份方式，自动找到实际使用的备份
+            config.BACKUP_MODE = 'store'
+            result = rollback_run(config, workers=4)
+            assert result['run_id'] == run_id
+            assert result['total_files'] == result['restored_files'] == len(SAMPLE_FILES)
+            assert result['failed_files'] == []
+            assert result['bytes'] == sum(len(data) for data in originals.values())
+            assert read_sources(project_dir) == originals
+
+            try:
+                rollback_run(config, run_id="missing")
+                assert False, "不存在的运行应当报错"
+            except ValueError:
+                pass
+            print(f"✅ {backup_mode} 备份回滚成功")
+        finally:
+            shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def test_rollback_command():
+    """测试 main.py rollback 命令"""
+    project_dir = create_project("butterknife_rollback_")
+    try:
+        originals = read_sources(project_dir)
+        _migrate(project_dir, 'store')
+
+        completed = subprocess.run(
+            [sys.executable, os.path.join(BASE_DIR, "main.py"), "rollback", "-p", project_dir, "-j", "2"],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding='utf-8'
+        )
+        assert completed.returncode == 0, completed.stdout
+        assert f"恢复文件: {len(SAMPLE_FILES)}/{len(SAMPLE_FILES)}" in completed.stdout
+        assert read_sources(project_dir) == originals
+        print("✅ rollback 命令恢复所有文件")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试回滚...")
+    print("=" * 50)
+    test_rollback_run()
+    test_rollback_command()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试并行调度：最长处理时间优先（LPT）和文件耗时历史
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import ButterKnifeMigrator
+from pipeline.scheduler import order_by_cost, simulate_makespan
+from cache.cost_history import CostHistory, COST_HISTORY_NAME
+from project_fixtures import JAVA_DIR, SAMPLE_FILES, create_project, create_config
+
+
+def _write_files(project_dir: str, sizes: dict):
+    """按 文件名 -> 字节数 创建文件"""
+    for name, size in sizes.items():
+        with open(os.path.join(project_dir, name), 'w', encoding='utf-8') as f:
+            f.write('x' * size)
+
+
+def test_order_by_size_and_history():
+    """测试没有历史时按大小排序，有历史时按上次耗时排序"""
+    project_dir = tempfile.mkdtemp(prefix="butterknife_scheduler_")
+    try:
+        _write_files(project_dir, {'A.java': 100, 'B.java': 5000, 'C.java': 1000})
+        tasks = [(os.path.join(project_dir, name), None) for name in ('A.java', 'B.java', 'C.java')]
+
+        ordered = [os.path.basename(path) for path, _ in order_by_cost(tasks, project_dir)]
+        assert ordered == ['B.java', 'C.java', 'A.java']
+
+        # 缓存的注解数计入成本
+        tasks_with_parse = [tasks[0], tasks[1], (tasks[2][0], {'bind_views': [{}] * 10})]
+        ordered = [os.path.basename(path) for path, _ in order_by_cost(tasks_with_parse, project_dir)]
+        assert ordered == ['C.java', 'B.java', 'A.java']
+
+        # 上次运行中 A 最慢
+        history = CostHistory(os.path.join(project_dir, '.cache'))
+        history.record('A.java', 100, 2.0)
+        history.record('B.java', 5000, 0.1)
+        history.record('C.java', 1000, 0.5)
+        history.save()
+        history = CostHistory(os.path.join(project_dir, '.cache'))
+        assert history.get_statistics() == {'files': 3, 'updated': 0}
+        assert history.estimate_seconds('A.java', 200) == 4.0
+        assert history.estimate_seconds('D.java', 100) is None
+
+        ordered = [os.path.basename(path) for path, _ in order_by_cost(tasks, project_dir, history)]
+        assert ordered == ['A.java', 'C.java', 'B.java']
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+    print("✅ 按估算成本从大到小排序")
+
+
+def test_lpt_makespan():
+    """测试偏斜的任务列表上LPT的完成时间不超过按原顺序分发"""
+    costs = [1.0] * 12 + [8.0]
+    assert simulate_makespan(costs, 4) == 11.0
+    assert simulate_makespan(sorted(costs, reverse=True), 4) == 8.0
+    assert simulate_makespan([], 4) == 0.0
+    print("✅ LPT缩短了完成时间")
+
+
+def test_parallel_migration_records_costs():
+    """测试并行迁移记录文件耗时历史，且LPT与FIFO的迁移结果一致"""
+    outputs = {}
+    for schedule in ('lpt', 'fifo'):
+        project_dir = create_project("butterknife_scheduler_",
+                                     {os.path.join(JAVA_DIR, name): name for name in SAMPLE_FILES})
+        try:
+            java_dir = os.path.join(project_dir, JAVA_DIR)
+            config = create_config(project_dir, BACKUP_ENABLED=False, LOG_LEVEL='WARNING',
+                                   JOBS=2, SCHEDULE=schedule)
+            ButterKnifeMigrator(config).migrate()
+
+            history_path = os.path.join(config.get_cache_dir(), COST_HISTORY_NAME)
+            if schedule == 'lpt':
+                with open(history_path, 'r', encoding='utf-8') as f:
+                    files = json.load(f)['files']
+                assert len(files) == 3
+                assert all(entry['seconds'] >= 0 for entry in files.values())
+            else:
+                assert not os.path.exists(history_path)
+
+            outputs[schedule] = {}
+            for name in sorted(os.listdir(java_dir)):
+                with open(os.path.join(java_dir, name), 'r', encoding='utf-8') as f:
+                    outputs[schedule][name] = f.read()
+        finally:
+            shutil.rmtree(project_dir, ignore_errors=True)
+
+    assert outputs['lpt'] == outputs['fifo']
+    print("✅ 并行迁移记录了文件耗时历史")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试并行调度...")
+    print("=" * 50)
+    test_order_by_size_and_history()
+    test_lpt_makespan()
+    test_parallel_migration_records_costs()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试分片执行和分片报告合并
+"""
+
+import sys
+import os
+import json
+import shutil
+import subprocess
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import ButterKnifeMigrator
+from scanner.shard import parse_shard, shard_of, filter_shard
+from utils.report_merge import merge_reports
+from project_fixtures import create_project, create_config, sample_copies
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARD_COUNT = 3
+
+
+def _create_project() -> str:
+    """创建包含多个ButterKnife文件的临时项目（示例文件复制到4个包中）"""
+    copies = {}
+    for copy in range(4):
+        copies.update(sample_copies(f"pkg{copy}"))
+    return create_project("butterknife_shard_", copies)
+
+
+def _migrate(project_dir: str, shard: str = None) -> dict:
+    """执行迁移并返回报告"""
+    config = create_config(project_dir, BACKUP_ENABLED=False, PARSE_CACHE_ENABLED=False,
+                           LOG_LEVEL='WARNING', SHARD=shard)
+    ButterKnifeMigrator(config).migrate()
+    with open(os.path.join(project_dir, "butterknife_migration_report.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_parse_shard():
+    """测试分片参数解析"""
+    assert parse_shard("1/4") == (1, 4)
+    assert parse_shard("4/4") == (4, 4)
+    for value in ("0/4", "5/4", "1/0", "1", "a/b"):
+        try:
+            parse_shard(value)
+            assert False, f"{value} 应当报错"
+        except ValueError:
+            pass
+    print("✅ 分片参数解析正确")
+
+
+def test_partition_is_stable():
+    """测试分片划分完整、不重叠，且与路径分隔符和扫描顺序无关"""
+    paths = [os.path.join("/project", "app", f"File{index}.java") for index in range(200)]
+    shards = [filter_shard(paths, "/project", index, 4) for index in range(1, 5)]
+    assert sorted(path for shard in shards for path in shard) == sorted(paths)
+    assert all(shards)
+    assert filter_shard(list(reversed(paths)), "/project", 2, 4) == list(reversed(shards[1]))
+    assert shard_of(os.path.join("app", "A.java"), 4) == shard_of("app/A.java", 4)
+    print("✅ 分片划分稳定且不重叠")
+
+
+def test_merge_shard_reports():
+    """测试各分片报告合并后与不分片执行的统计一致"""
+    project_dirs = [_create_project() for _ in range(SHARD_COUNT + 1)]
+    try:
+        full_report = _migrate(project_dirs[0])
+        shard_reports = [
+            _migrate(project_dirs[index], f"{index}/{SHARD_COUNT}") for index in range(1, SHARD_COUNT + 1)
+        ]
+        assert [report['shard']['index'] for report in shard_reports] == [1, 2, 3]
+
+        merged = merge_reports(shard_reports)
+        for field in ('total_files', 'successful_migrations', 'unchanged_files', 'failed_migrations'):
+            assert merged[field] == full_report[field], field
+        assert merged['injector_branches'] == full_report['injector_branches']
+        assert merged['merged_shards'] == [1, 2, 3]
+        assert merged['missing_shards'] == []
+        assert merged['timings']['total']['wall_seconds'] == max(
+            report['timings']['total']['wall_seconds'] for report in shard_reports
+        )
+        assert len(merged['details']) == full_report['total_files']
+        assert [detail['path'] for detail in merged['details']] == [
+            detail['path'] for detail in full_report['details']
+        ]
+        assert all(not os.path.isabs(detail['path']) for detail in merged['details'])
+
+        assert merge_reports(shard_reports[:2])['missing_shards'] == [3]
+        try:
+            merge_reports([shard_reports[0], shard_reports[0]])
+            assert False, "重复的分片应当报错"
+        except ValueError:
+            pass
+
+        # 命令行合并
+        report_paths = [
+            os.path.join(project_dir, "butterknife_migration_report.json") for project_dir in project_dirs[1:]
+        ]
+        output_path = os.path.join(project_dirs[0], "merged.json")
+        completed = subprocess.run(
+            [sys.executable, os.path.join(BASE_DIR, "main.py"), "merge-reports"] + report_paths + ["-o", output_path],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding='utf-8'
+        )
+        assert completed.returncode == 0, completed.stdout
+        with open(output_path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['total_files'] == full_report['total_files']
+        print("✅ 分片报告合并正确")
+    finally:
+        for project_dir in project_dirs:
+            shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试分片执行...")
+    print("=" * 50)
+    test_parse_shard()
+    test_partition_is_stable()
+    test_merge_shard_reports()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
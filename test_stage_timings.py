@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试迁移阶段计时与报告
+"""
+
+import sys
+import os
+import json
+import shutil
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from main import ButterKnifeMigrator
+from pipeline.file_pipeline import FilePipeline
+from pipeline.stage_timings import StageTimings, STAGES
+from project_fixtures import JAVA_DIR, create_project, create_config
+
+
+def test_slowest_files():
+    """测试只保留耗时最长的N个文件"""
+    timings = StageTimings(slowest_count=2)
+    timings.add_file('a.java', {'parse': 0.1}, {'parse': 0.1}, None)
+    timings.add_file('b.java', {'parse': 0.3, 'inject': 0.2}, {'parse': 0.3}, 'holder')
+    timings.add_file('c.java', {'parse': 0.2}, {'parse': 0.2}, 'newbase')
+
+    slowest = timings.slowest_files()
+    assert [entry['file'] for entry in slowest] == ['b.java', 'c.java']
+    assert slowest[0]['injector_branch'] == 'holder'
+    assert abs(timings.wall['parse'] - 0.6) < 1e-9
+    assert timings.branches == {'holder': 1, 'newbase': 1}
+
+    report = timings.to_report()
+    assert set(report['stages']) == set(STAGES)
+    print("✅ 最慢文件统计正确")
+
+
+def test_pipeline_records_timings():
+    """测试流水线记录各阶段耗时、转换器和注入分支"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    pipeline = FilePipeline(Config())
+    result = pipeline.process_file(os.path.join(base_dir, 'TestActivity.java'))
+
+    assert result['has_butterknife']
+    assert set(result['timings']) == {'parse', 'transform', 'inject'}
+    assert set(result['cpu_times']) == {'parse', 'transform', 'inject'}
+    assert result['injector_branch'] in ('holder', 'general_activity', 'newbase', 'oncreate_only')
+    assert 'FindViewTransformer' in result['transformers']
+    print(f"✅ 流水线记录了各阶段耗时，注入分支: {result['injector_branch']}")
+
+
+def test_migration_report_timings():
+    """测试迁移报告包含阶段耗时、最慢文件和注入分支"""
+    project_dir = create_project("butterknife_timings_",
+                                 {os.path.join(JAVA_DIR, "TestActivity.java"): "TestActivity.java"})
+    try:
+        config = create_config(project_dir, BACKUP_ENABLED=False, PARSE_CACHE_ENABLED=False)
+        ButterKnifeMigrator(config).migrate()
+
+        with open(os.path.join(project_dir, 'butterknife_migration_report.json'), 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+        assert set(report['timings']['stages']) == set(STAGES)
+        assert report['timings']['total']['wall_seconds'] > 0
+        assert report['slowest_files'][0]['file'] == os.path.join(JAVA_DIR, "TestActivity.java")
+        detail = report['details'][0]
+        assert set(detail['timings']) == {'parse', 'transform', 'inject', 'write'}
+        assert sum(report['injector_branches'].values()) == 1
+        assert detail['injector_branch'] in report['injector_branches']
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+    print("✅ 迁移报告包含阶段耗时")
+
+
+if __name__ == "__main__":
+    print("🧪 测试迁移阶段计时...")
+    test_slowest_files()
+    test_pipeline_records_timings()
+    test_migration_report_timings()
+    print("🎉 所有测试通过！")
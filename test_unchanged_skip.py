@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试迁移后内容未变化的文件不备份也不写入
+"""
+
+import sys
+import os
+import json
+import shutil
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from main import ButterKnifeMigrator
+from pipeline.file_pipeline import FilePipeline
+from writer.backup_store import BackupStore
+from project_fixtures import JAVA_DIR, create_project, create_config
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 迁移后内容与原文件相同的ButterKnife文件
+UNCHANGED_SOURCE = os.path.join(BASE_DIR, "tests", "Agent_DeviceListActivity.java")
+CHANGED_SOURCE = os.path.join(BASE_DIR, "TestClass.java")
+
+
+def _create_project() -> str:
+    """创建包含一个未变化文件和一个需要迁移文件的临时项目"""
+    return create_project("butterknife_unchanged_", {
+        os.path.join(JAVA_DIR, "Unchanged.java"): UNCHANGED_SOURCE,
+        os.path.join(JAVA_DIR, "Changed.java"): CHANGED_SOURCE
+    })
+
+
+def test_pipeline_marks_unchanged():
+    """测试流水线标记迁移后内容未变化的文件"""
+    pipeline = FilePipeline(Config())
+    assert pipeline.process_file(UNCHANGED_SOURCE)['unchanged']
+    assert not pipeline.process_file(CHANGED_SOURCE)['unchanged']
+    print("✅ 流水线正确标记内容未变化的文件")
+
+
+def test_unchanged_file_not_written():
+    """测试内容未变化的文件不备份、不写入，并在报告中记为unchanged"""
+    project_dir = _create_project()
+    try:
+        config = create_config(project_dir, BACKUP_ENABLED=True, PARSE_CACHE_ENABLED=False, LOG_LEVEL='WARNING')
+
+        target = os.path.join(project_dir, "app", "src", "main", "java", "Unchanged.java")
+        os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+
+        ButterKnifeMigrator(config).migrate()
+
+        assert os.stat(target).st_mtime_ns == 1_000_000_000
+        store = BackupStore(os.path.join(project_dir, "butterknife_backup"))
+        runs = store.list_runs()
+        assert len(runs) == 1
+        assert list(store.load_manifest(runs[0])) == [os.path.join("app", "src", "main", "java", "Changed.java")]
+
+        with open(os.path.join(project_dir, "butterknife_migration_report.json"), 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        assert report['total_files'] == 2
+        assert report['successful_migrations'] == 1
+        assert report['unchanged_files'] == 1
+        statuses = {detail['file']: detail['status'] for detail in report['details']}
+        assert statuses == {"Unchanged.java": 'unchanged', "Changed.java": 'success'}
+        print("✅ 内容未变化的文件未备份、未写入")
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试跳过未变化文件...")
+    print("=" * 50)
+    test_pipeline_marks_unchanged()
+    test_unchanged_file_not_written()
+    print("=" * 50)
+    print("🎉 所有测试通过！")
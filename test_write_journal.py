@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试原子写入、写前日志和 --resume
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import ButterKnifeMigrator
+from project_fixtures import create_project, create_config, read_sources
+from writer.file_writer import FileWriter
+from writer.write_journal import WriteJournal, JOURNAL_FILE_NAME, file_hash, recover_in_flight
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_atomic_write():
+    """测试写入通过临时文件原子替换，并记录写前日志"""
+    project_dir = create_project("butterknife_journal_")
+    try:
+        config = create_config(project_dir, BACKUP_ENABLED=True, PARSE_CACHE_ENABLED=False, LOG_LEVEL='WARNING')
+        journal_path = os.path.join(config.get_cache_dir(), JOURNAL_FILE_NAME)
+        journal = WriteJournal(journal_path)
+        journal.begin()
+        writer = FileWriter(config, journal)
+
+        target = os.path.join(project_dir, "app", "src", "main", "java", "File0.java")
+        original_hash = file_hash(target)
+        assert writer.write_file(target, "class File0 {}\n")
+        journal.end()
+        journal.close()
+
+        with open(target, 'r', encoding='utf-8') as f:
+            assert f.read() == "class File0 {}\n"
+        assert not os.path.exists(writer._temp_path(target))
+
+        state = WriteJournal.load(journal_path)
+        entry = state['files'][os.path.join("app", "src", "main", "java", "File0.java")]
+        assert state['complete']
+        assert entry['state'] == 'committed'
+        assert entry['original_hash'] == original_hash
+        assert entry['new_hash'] == file_hash(target)
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+    print("✅ 原子写入并记录写前日志")
+
+
+def test_resume_after_crash():
+    """测试进程在替换文件前退出后，--resume 跳过已提交文件并完成剩余文件"""
+    expected_dir = create_project("butterknife_journal_")
+    project_dir = create_project("butterknife_journal_")
+    try:
+        ButterKnifeMigrator(
+            create_config(expected_dir, BACKUP_ENABLED=True, PARSE_CACHE_ENABLED=False, LOG_LEVEL='WARNING')
+        ).migrate()
+        expected = read_sources(expected_dir)
+
+        # 第二个文件写完临时文件后、替换前进程退出
+        script = (
+            "import os, sys\n"
+            f"sys.path.insert(0, {BASE_DIR!r})\n"
+            "from writer.file_writer import FileWriter\n"
+            "original = FileWriter._atomic_write\n"
+            "calls = []\n"
+            "def crashing_write(self, file_path, temp_path, data):\n"
+            "    calls.append(file_path)\n"
+            "    if len(calls) == 2:\n"
+            "        with open(temp_path, 'wb') as f:\n"
+            "            f.write(data[:10])\n"
+            "        os._exit(3)\n"
+            "    original(self, file_path, temp_path, data)\n"
+            "FileWriter._atomic_write = crashing_write\n"
+            "from main import main\n"
+            f"sys.argv = ['main.py', '-p', {project_dir!r}, '--backup', '--no-cache']\n"
+            "main()\n"
+        )
+        process = subprocess.run([sys.executable, "-c", script], stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL)
+        assert process.returncode == 3
+
+        journal_path = os.path.join(project_dir, ".butterknife_cache", JOURNAL_FILE_NAME)
+        state = WriteJournal.load(journal_path)
+        assert not state['complete']
+        committed = [key for key, entry in state['files'].items() if entry['state'] == 'committed']
+        assert len(committed) == 1
+
+        # 已提交的文件在继续运行时不应再被写入
+        committed_path = os.path.join(project_dir, committed[0])
+        committed_mtime = os.stat(committed_path).st_mtime_ns
+
+        config = create_config(project_dir, BACKUP_ENABLED=True, PARSE_CACHE_ENABLED=False, LOG_LEVEL='WARNING')
+        config.RESUME = True
+        migrator = ButterKnifeMigrator(config)
+        migrator.migrate()
+
+        assert migrator.resume_committed == set(committed)
+        assert os.stat(committed_path).st_mtime_ns == committed_mtime
+        assert read_sources(project_dir) == expected
+        assert WriteJournal.load(journal_path)['complete']
+        leftovers = [name for name in os.listdir(os.path.dirname(committed_path)) if name.endswith('.tmp')]
+        assert not leftovers
+    finally:
+        shutil.rmtree(expected_dir, ignore_errors=True)
+        shutil.rmtree(project_dir, ignore_errors=True)
+    print("✅ 中途退出后 --resume 完成迁移")
+
+
+def test_recover_from_other_directory():
+    """测试日志中的临时文件和备份路径相对于项目根目录，从其他工作目录继续时仍能回滚"""
+    project_dir = create_project("butterknife_journal_")
+    original_cwd = os.getcwd()
+    try:
+        # 以相对路径指定项目，在项目的上级目录中运行
+        os.chdir(os.path.dirname(project_dir))
+        config = create_config(os.path.basename(project_dir), BACKUP_ENABLED=True, PARSE_CACHE_ENABLED=False,
+                               LOG_LEVEL='WARNING')
+        journal_path = os.path.join(config.get_cache_dir(), JOURNAL_FILE_NAME)
+        journal = WriteJournal(journal_path)
+        journal.begin()
+        target = os.path.join(config.PROJECT_PATH, "app", "src", "main", "java", "File0.java")
+        with open(target, 'rb') as f:
+            original = f.read()
+        assert FileWriter(config, journal).write_file(target, "class File0 {}\n")
+        journal.close()
+
+        state = WriteJournal.load(journal_path)
+        file_key = os.path.join("app", "src", "main", "java", "File0.java")
+        entry = state['files'][file_key]
+        assert entry['temp'] == os.path.join("app", "src", "main", "java", ".File0.java.butterknife.tmp")
+        assert not os.path.isabs(entry['backup'])
+
+        # 模拟替换到一半退出：留下临时文件，目标文件内容损坏
+        entry['state'] = 'backed_up'
+        temp_path = os.path.join(project_dir, entry['temp'])
+        with open(temp_path, 'wb') as f:
+            f.write(b"partial")
+        with open(os.path.join(project_dir, file_key), 'wb') as f:
+            f.write(b"corrupted")
+
+        os.chdir(BASE_DIR)
+        result = recover_in_flight(state, project_dir)
+        assert result['rolled_back'] == [file_key]
+        assert not os.path.exists(temp_path)
+        with open(os.path.join(project_dir, file_key), 'rb') as f:
+            assert f.read() == original
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(project_dir, ignore_errors=True)
+    print("✅ 日志路径与工作目录无关")
+
+
+if __name__ == "__main__":
+    print("🧪 测试写前日志...")
+    test_atomic_write()
+    test_resume_after_crash()
+    test_recover_from_other_directory()
+    print("🎉 所有测试通过！")
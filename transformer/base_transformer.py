@@ -6,7 +6,9 @@
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from typing import Dict, Any
+from utils.java_model import build_file_model
 
 
 class BaseTransformer(ABC):
@@ -64,13 +66,13 @@ class BaseTransformer(ABC):
         验证输入数据的有效性
         
         Args:
-            parsed_data: 解析后的数据
+            parsed_data: 解析后的数据（字典或ParseResult等映射）
             original_code: 原始代码
             
         Returns:
             输入是否有效
         """
-        if not isinstance(parsed_data, dict):
+        if not isinstance(parsed_data, Mapping):
             return False
         
         if not isinstance(original_code, str):
@@ -141,6 +143,20 @@ class BaseTransformer(ABC):
             print(f"转换器 {self.name} 执行失败: {e}")
             return original_code
     
+    def _find_main_class_end(self, code: str) -> int:
+        """
+        查找主类的结束位置，排除内部类
+        
+        Returns:
+            主类结束括号所在行的行首（新方法插入在类内部），未找到主类时返回-1
+        """
+        # 主类的区间来自结构模型，内部类已被正确嵌套
+        main_class = build_file_model(code).main_class
+        if not main_class or main_class['body_end'] >= len(code):
+            return -1
+        
+        return code.rfind('\n', 0, main_class['body_end']) + 1
+    
     def __str__(self) -> str:
         """字符串表示"""
         return f"{self.name}: {self.description}"
@@ -9,40 +9,40 @@ BindCall移除器
 import re
 from typing import Dict, Any
 from .base_transformer import BaseTransformer
+from utils.pattern_registry import SharedPattern
 
 
 class BindCallRemover(BaseTransformer):
     """BindCall移除器类"""
     
+    bind_call_pattern = SharedPattern(
+        r'(?<!\s)\s*ButterKnife\.bind\s*\(\s*this\s*\)\s*;?\s*\n?',
+        re.MULTILINE
+    )
+    
+    butterknife_import_pattern = SharedPattern(
+        r'import\s+butterknife\.ButterKnife\s*;\s*\n?',
+        re.MULTILINE
+    )
+    
+    bindview_import_pattern = SharedPattern(
+        r'import\s+butterknife\.BindView\s*;\s*\n?',
+        re.MULTILINE
+    )
+    
+    onclick_import_pattern = SharedPattern(
+        r'import\s+butterknife\.OnClick\s*;\s*\n?',
+        re.MULTILINE
+    )
+    
+    unbind_call_pattern = SharedPattern(
+        r'(?<!\s)\s*ButterKnife\.unbind\s*\(\s*this\s*\)\s*;?\s*\n?',
+        re.MULTILINE
+    )
+    
     def __init__(self):
         super().__init__()
         self.description = "删除ButterKnife.bind调用和相关import语句"
-        
-        # 编译正则表达式
-        self.bind_call_pattern = re.compile(
-            r'\s*ButterKnife\.bind\s*\(\s*this\s*\)\s*;?\s*\n?',
-            re.MULTILINE
-        )
-        
-        self.butterknife_import_pattern = re.compile(
-            r'import\s+butterknife\.ButterKnife\s*;\s*\n?',
-            re.MULTILINE
-        )
-        
-        self.bindview_import_pattern = re.compile(
-            r'import\s+butterknife\.BindView\s*;\s*\n?',
-            re.MULTILINE
-        )
-        
-        self.onclick_import_pattern = re.compile(
-            r'import\s+butterknife\.OnClick\s*;\s*\n?',
-            re.MULTILINE
-        )
-        
-        self.unbind_call_pattern = re.compile(
-            r'\s*ButterKnife\.unbind\s*\(\s*this\s*\)\s*;?\s*\n?',
-            re.MULTILINE
-        )
     
     def can_transform(self, parsed_data: Dict[str, Any]) -> bool:
         """检查是否可以应用此转换器"""
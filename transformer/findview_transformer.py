@@ -8,25 +8,45 @@ FindView转换器
 import re
 from typing import Dict, Any, List
 from .base_transformer import BaseTransformer
+from utils.java_lexer import tokenize_java, mask_java
+from utils.edit_buffer import EditBuffer
+from utils.pattern_registry import SharedPattern
 
 
 class FindViewTransformer(BaseTransformer):
     """FindView转换器类"""
     
+    bind_view_pattern = SharedPattern(
+        r'@BindView\s*\(\s*(R\.id\.\w+)\s*\)[^\S\n]*\n\s*(?:public\s+|private\s+|protected\s+)?(\w+)\s+(\w+)\s*;',
+        re.MULTILINE | re.DOTALL
+    )
+    
+    # 带@BindView注解的字段声明（同一行或多行格式）
+    bind_view_declaration_pattern = SharedPattern(
+        r'@BindView\s*\(\s*(R2?\.id\.\w+)\s*\)\s+(?:public\s+|private\s+|protected\s+)?(\w+)\s+(\w+)\s*;',
+        re.MULTILINE
+    )
+    
+    field_declaration_pattern = SharedPattern(
+        r'(?<!\s)(?!(?<=\w)\w)(\s*)(\w+)\s+(\w+)\s*;',
+        re.MULTILINE
+    )
+    
+    # 带@Override的onCreate方法声明
+    onCreate_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override[^\S\n]*\n\s*protected\s+void\s+onCreate\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
+    # 带@Override的onViewCreated方法声明
+    onViewCreated_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override[^\S\n]*\n\s*public\s+void\s+onViewCreated\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
     def __init__(self):
         super().__init__()
         self.description = "将@BindView注解转换为findViewById调用"
-        
-        # 编译正则表达式
-        self.bind_view_pattern = re.compile(
-            r'@BindView\s*\(\s*(R\.id\.\w+)\s*\)\s*\n\s*(?:public\s+|private\s+|protected\s+)?(\w+)\s+(\w+)\s*;',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        self.field_declaration_pattern = re.compile(
-            r'(\s*)(\w+)\s+(\w+)\s*;',
-            re.MULTILINE
-        )
     
     def can_transform(self, parsed_data: Dict[str, Any]) -> bool:
         """检查是否可以应用此转换器"""
@@ -37,54 +57,39 @@ class FindViewTransformer(BaseTransformer):
         if not self.can_transform(parsed_data):
             return original_code
         
-        transformed_code = original_code
         bind_views = parsed_data.get('bind_views', [])
         
-        # 替换@BindView注解为普通字段声明
+        # 替换@BindView注解为普通字段声明（所有替换记录在编辑缓冲区中，最后一次性应用）
+        buffer = EditBuffer(original_code)
+        declarations = self._index_bind_view_declarations(original_code)
         for bind_view in bind_views:
-            transformed_code = self._replace_bind_view_annotation(
-                transformed_code, bind_view
-            )
+            self._replace_bind_view_annotation(buffer, declarations, bind_view)
+        transformed_code = buffer.apply()
         
         # 添加findViewById初始化代码
         transformed_code = self._add_findviewbyid_initialization(transformed_code, bind_views)
         
         return transformed_code
     
-    def _replace_bind_view_annotation(self, code: str, bind_view: Dict[str, Any]) -> str:
+    def _index_bind_view_declarations(self, code: str) -> Dict[tuple, List[tuple]]:
+        """扫描一次代码，按 (资源ID, 类型, 字段名) 索引所有@BindView字段声明的位置"""
+        declarations = {}
+        for match in self.bind_view_declaration_pattern.finditer(mask_java(code)):
+            key = (match.group(1), match.group(2), match.group(3))
+            declarations.setdefault(key, []).append((match.start(), match.end()))
+        return declarations
+    
+    def _replace_bind_view_annotation(self, buffer: EditBuffer, declarations: Dict[tuple, List[tuple]],
+                                      bind_view: Dict[str, Any]):
         """替换@BindView注解为普通字段声明"""
         field_type = bind_view['type']
         field_name = bind_view['name']
         resource_id = bind_view['id']
         
-        # 查找@BindView注解行（支持同一行和多行格式）
-        escaped_resource_id = re.escape(resource_id)
-        escaped_field_type = re.escape(field_type)
-        escaped_field_name = re.escape(field_name)
-        
-        # 模式1：同一行的格式 @BindView(R.id.xxx) Type fieldName;
-        pattern1 = re.compile(
-            r'@BindView\s*\(\s*' + escaped_resource_id + r'\s*\)\s+(?:public\s+|private\s+|protected\s+)?' + escaped_field_type + r'\s+' + escaped_field_name + r'\s*;',
-            re.MULTILINE
-        )
-        
-        # 模式2：多行的格式
-        pattern2 = re.compile(
-            r'@BindView\s*\(\s*' + escaped_resource_id + r'\s*\)\s*\n\s*(?:public\s+|private\s+|protected\s+)?' + escaped_field_type + r'\s+' + escaped_field_name + r'\s*;',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        # 替换为普通字段声明
+        # 替换为普通字段声明（同一字段重复出现时只替换一次）
         replacement = f"{field_type} {field_name};"
-        
-        # 先尝试模式1（同一行）
-        result = pattern1.sub(replacement, code)
-        if result != code:
-            return result
-        
-        # 再尝试模式2（多行）
-        result = pattern2.sub(replacement, code)
-        return result
+        for start, end in declarations.pop((resource_id, field_type, field_name), []):
+            buffer.replace(start, end - start, replacement)
     
     def _add_findviewbyid_initialization(self, code: str, bind_views: List[Dict[str, Any]]) -> str:
         """添加findViewById初始化代码"""
@@ -125,29 +130,16 @@ class FindViewTransformer(BaseTransformer):
     def _insert_in_oncreate(self, code: str, initialization_code: str) -> str:
         """在onCreate方法中插入初始化代码"""
         # 查找onCreate方法
-        onCreate_pattern = re.compile(
-            r'(\s*@Override\s*\n\s*protected\s+void\s+onCreate\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
-        
-        match = onCreate_pattern.search(code)
+        match = self.onCreate_pattern.search(mask_java(code))
         if match:
             # 在onCreate方法开始后插入初始化代码
             insert_position = match.end()
             
             # 查找方法体的结束位置
-            brace_count = 0
             start_pos = insert_position
-            
-            for i, char in enumerate(code[start_pos:], start_pos):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        # 找到方法体结束位置
-                        insert_position = i
-                        break
+            balance_point = tokenize_java(code).find_balance_point(start_pos)
+            if balance_point != -1:
+                insert_position = balance_point
             
             # 在方法体结束前插入初始化代码
             if insert_position > start_pos:
@@ -163,29 +155,16 @@ class FindViewTransformer(BaseTransformer):
     def _insert_in_onviewcreated(self, code: str, initialization_code: str) -> str:
         """在onViewCreated方法中插入初始化代码"""
         # 查找onViewCreated方法
-        onViewCreated_pattern = re.compile(
-            r'(\s*@Override\s*\n\s*public\s+void\s+onViewCreated\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
-        
-        match = onViewCreated_pattern.search(code)
+        match = self.onViewCreated_pattern.search(mask_java(code))
         if match:
             # 在onViewCreated方法开始后插入初始化代码
             insert_position = match.end()
             
             # 查找方法体的结束位置
-            brace_count = 0
             start_pos = insert_position
-            
-            for i, char in enumerate(code[start_pos:], start_pos):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        # 找到方法体结束位置
-                        insert_position = i
-                        break
+            balance_point = tokenize_java(code).find_balance_point(start_pos)
+            if balance_point != -1:
+                insert_position = balance_point
             
             # 在方法体结束前插入初始化代码
             if insert_position > start_pos:
@@ -218,40 +197,6 @@ class FindViewTransformer(BaseTransformer):
         
         return code
     
-    def _find_main_class_end(self, code: str) -> int:
-        """查找主类的结束位置，排除内部类"""
-        lines = code.split('\n')
-        brace_count = 0
-        in_main_class = False
-        main_class_start = -1
-        
-        # 查找主类开始位置
-        for i, line in enumerate(lines):
-            if re.match(r'\s*public\s+class\s+\w+', line):
-                main_class_start = i
-                break
-        
-        if main_class_start == -1:
-            return -1
-        
-        # 从主类开始位置计算大括号
-        for i in range(main_class_start, len(lines)):
-            line = lines[i]
-            
-            # 计算大括号
-            for char in line:
-                if char == '{':
-                    brace_count += 1
-                    if brace_count == 1:
-                        in_main_class = True
-                elif char == '}':
-                    brace_count -= 1
-                    if in_main_class and brace_count == 0:
-                        # 找到主类结束位置
-                        return sum(len(lines[j]) + 1 for j in range(i + 1))
-        
-        return -1
-    
     def _has_initialization_code(self, code: str, bind_views: List[Dict[str, Any]]) -> bool:
         """检查是否已经包含初始化代码"""
         if not bind_views:
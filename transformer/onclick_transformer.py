@@ -8,25 +8,45 @@ OnClick转换器
 import re
 from typing import Dict, Any, List
 from .base_transformer import BaseTransformer
+from utils.java_lexer import tokenize_java, mask_java
+from utils.edit_buffer import EditBuffer
+from utils.pattern_registry import SharedPattern
 
 
 class OnClickTransformer(BaseTransformer):
     """OnClick转换器类"""
     
+    on_click_pattern = SharedPattern(
+        r'@OnClick\s*\(\s*\{\s*((?:R\.id\.\w+(?:\s*,\s*R\.id\.\w+)*)?)\s*\}\s*\)\s*public\s+void\s+(\w+)\s*\([^()]*\)\s*\{',
+        re.MULTILINE
+    )
+    
+    on_click_method_pattern = SharedPattern(
+        r'@OnClick\s*\(\s*\{\s*((?:R\.id\.\w+(?:\s*,\s*R\.id\.\w+)*)?)\s*\}\s*\)\s*public\s+void\s+(\w+)\s*\([^()]*\)\s*\{[^}]*\}',
+        re.MULTILINE | re.DOTALL
+    )
+    
+    # 所有@OnClick注解（包括单参数和多参数的情况）
+    on_click_annotation_pattern = SharedPattern(
+        r'@OnClick\s*\(\s*(?:\{\s*)?(?:R\.id\.\w+(?:\s*,\s*R\.id\.\w+)*)?(?:\s*\})?\s*\)',
+        re.MULTILINE
+    )
+    
+    # 带@Override的onCreate方法声明
+    onCreate_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override[^\S\n]*\n\s*protected\s+void\s+onCreate\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
+    # 带@Override的onViewCreated方法声明
+    onViewCreated_pattern = SharedPattern(
+        r'(?<!\s)(\s*@Override[^\S\n]*\n\s*public\s+void\s+onViewCreated\s*\([^()]*\)\s*\{)',
+        re.MULTILINE
+    )
+    
     def __init__(self):
         super().__init__()
         self.description = "将@OnClick注解转换为setOnClickListener调用"
-        
-        # 编译正则表达式
-        self.on_click_pattern = re.compile(
-            r'@OnClick\s*\(\s*\{\s*((?:R\.id\.\w+(?:\s*,\s*R\.id\.\w+)*)?)\s*\}\s*\)\s*public\s+void\s+(\w+)\s*\([^)]*\)\s*\{',
-            re.MULTILINE
-        )
-        
-        self.on_click_method_pattern = re.compile(
-            r'@OnClick\s*\(\s*\{\s*((?:R\.id\.\w+(?:\s*,\s*R\.id\.\w+)*)?)\s*\}\s*\)\s*public\s+void\s+(\w+)\s*\([^)]*\)\s*\{[^}]*\}',
-            re.MULTILINE | re.DOTALL
-        )
     
     def can_transform(self, parsed_data: Dict[str, Any]) -> bool:
         """检查是否可以应用此转换器"""
@@ -37,37 +57,24 @@ class OnClickTransformer(BaseTransformer):
         if not self.can_transform(parsed_data):
             return original_code
         
-        transformed_code = original_code
         on_clicks = parsed_data.get('on_clicks', [])
         
-        # 替换@OnClick注解为普通方法
-        for on_click in on_clicks:
-            transformed_code = self._replace_on_click_annotation(
-                transformed_code, on_click
-            )
+        # 替换@OnClick注解为普通方法（所有注解在一次扫描中移除）
+        transformed_code = original_code
+        if any(on_click['ids'] for on_click in on_clicks):
+            transformed_code = self._replace_on_click_annotations(transformed_code)
         
         # 添加setOnClickListener初始化代码
         transformed_code = self._add_onclick_listener_initialization(transformed_code, on_clicks)
         
         return transformed_code
     
-    def _replace_on_click_annotation(self, code: str, on_click: Dict[str, Any]) -> str:
-        """替换@OnClick注解为普通方法"""
-        resource_ids = on_click['ids']
-        method_name = on_click['method']
-        
-        if not resource_ids:
-            return code
-        
-        # 使用更简单的正则表达式，匹配所有@OnClick注解
-        # 包括单参数和多参数的情况
-        annotation_pattern = re.compile(
-            r'@OnClick\s*\(\s*(?:\{\s*)?(?:R\.id\.\w+(?:\s*,\s*R\.id\.\w+)*)?(?:\s*\})?\s*\)',
-            re.MULTILINE
-        )
-        
-        # 只移除注解，保留方法定义
-        return annotation_pattern.sub('', code)
+    def _replace_on_click_annotations(self, code: str) -> str:
+        """移除所有@OnClick注解，保留方法定义"""
+        buffer = EditBuffer(code)
+        for match in self.on_click_annotation_pattern.finditer(mask_java(code)):
+            buffer.delete(match.start(), match.end() - match.start())
+        return buffer.apply()
     
     def _add_onclick_listener_initialization(self, code: str, on_clicks: List[Dict[str, Any]]) -> str:
         """添加setOnClickListener初始化代码"""
@@ -127,29 +134,16 @@ class OnClickTransformer(BaseTransformer):
     def _insert_in_oncreate(self, code: str, initialization_code: str) -> str:
         """在onCreate方法中插入初始化代码"""
         # 查找onCreate方法
-        onCreate_pattern = re.compile(
-            r'(\s*@Override\s*\n\s*protected\s+void\s+onCreate\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
-        
-        match = onCreate_pattern.search(code)
+        match = self.onCreate_pattern.search(mask_java(code))
         if match:
             # 在onCreate方法开始后插入初始化代码
             insert_position = match.end()
             
             # 查找方法体的结束位置
-            brace_count = 0
             start_pos = insert_position
-            
-            for i, char in enumerate(code[start_pos:], start_pos):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        # 找到方法体结束位置
-                        insert_position = i
-                        break
+            balance_point = tokenize_java(code).find_balance_point(start_pos)
+            if balance_point != -1:
+                insert_position = balance_point
             
             # 在方法体结束前插入初始化代码
             if insert_position > start_pos:
@@ -165,29 +159,16 @@ class OnClickTransformer(BaseTransformer):
     def _insert_in_onviewcreated(self, code: str, initialization_code: str) -> str:
         """在onViewCreated方法中插入初始化代码"""
         # 查找onViewCreated方法
-        onViewCreated_pattern = re.compile(
-            r'(\s*@Override\s*\n\s*public\s+void\s+onViewCreated\s*\([^)]*\)\s*\{)',
-            re.MULTILINE
-        )
-        
-        match = onViewCreated_pattern.search(code)
+        match = self.onViewCreated_pattern.search(mask_java(code))
         if match:
             # 在onViewCreated方法开始后插入初始化代码
             insert_position = match.end()
             
             # 查找方法体的结束位置
-            brace_count = 0
             start_pos = insert_position
-            
-            for i, char in enumerate(code[start_pos:], start_pos):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        # 找到方法体结束位置
-                        insert_position = i
-                        break
+            balance_point = tokenize_java(code).find_balance_point(start_pos)
+            if balance_point != -1:
+                insert_position = balance_point
             
             # 在方法体结束前插入初始化代码
             if insert_position > start_pos:
@@ -220,40 +201,6 @@ class OnClickTransformer(BaseTransformer):
         
         return code
     
-    def _find_main_class_end(self, code: str) -> int:
-        """查找主类的结束位置，排除内部类"""
-        lines = code.split('\n')
-        brace_count = 0
-        in_main_class = False
-        main_class_start = -1
-        
-        # 查找主类开始位置
-        for i, line in enumerate(lines):
-            if re.match(r'\s*public\s+class\s+\w+', line):
-                main_class_start = i
-                break
-        
-        if main_class_start == -1:
-            return -1
-        
-        # 从主类开始位置计算大括号
-        for i in range(main_class_start, len(lines)):
-            line = lines[i]
-            
-            # 计算大括号
-            for char in line:
-                if char == '{':
-                    brace_count += 1
-                    if brace_count == 1:
-                        in_main_class = True
-                elif char == '}':
-                    brace_count -= 1
-                    if in_main_class and brace_count == 0:
-                        # 找到主类结束位置
-                        return sum(len(lines[j]) + 1 for j in range(i + 1))
-        
-        return -1
-    
     def _has_onclick_initialization_code(self, code: str, on_clicks: List[Dict[str, Any]]) -> bool:
         """检查是否已经包含OnClick初始化代码"""
         if not on_clicks:
@@ -5,5 +5,12 @@
 """
 
 from .logger import Logger, ColoredLogger, get_logger, set_global_logger
+from .java_lexer import JavaTokens, tokenize_java, mask_java
+from .java_model import JavaFileModel, build_file_model
+from .edit_buffer import EditBuffer, EditConflictError
+from .report_merge import merge_reports
+from .pattern_registry import PatternRegistry, PATTERN_REGISTRY, SharedPattern, compiled_patterns
 
-__all__ = ['Logger', 'ColoredLogger', 'get_logger', 'set_global_logger']
+__all__ = ['Logger', 'ColoredLogger', 'get_logger', 'set_global_logger', 'JavaTokens', 'tokenize_java', 'mask_java',
+           'JavaFileModel', 'build_file_model', 'EditBuffer', 'EditConflictError', 'merge_reports',
+           'PatternRegistry', 'PATTERN_REGISTRY', 'SharedPattern', 'compiled_patterns']
\ No newline at end of file
@@ -7,29 +7,29 @@
 
 import re
 from typing import List, Tuple
+from .pattern_registry import SharedPattern
 
 
 class CodeFormatter:
     """代码格式化器类"""
     
-    def __init__(self):
-        # 匹配@BindView注解在同一行的情况
-        self.bindview_same_line_pattern = re.compile(
-            r'(\s*)@BindView\s*\(\s*([^)]+)\s*\)\s+(\w+)\s+(\w+)\s*;',
-            re.MULTILINE
-        )
-        
-        # 匹配@OnClick注解在同一行的情况
-        self.onclick_same_line_pattern = re.compile(
-            r'(\s*)@OnClick\s*\(\s*([^)]+)\s*\)\s+(?:public\s+)?(?:void\s+)?(\w+)\s*\([^)]*\)',
-            re.MULTILINE
-        )
-        
-        # 匹配@OnLongClick注解在同一行的情况
-        self.onlongclick_same_line_pattern = re.compile(
-            r'(\s*)@OnLongClick\s*\(\s*([^)]+)\s*\)\s+(?:public\s+)?(?:boolean\s+)?(\w+)\s*\([^)]*\)',
-            re.MULTILINE
-        )
+    # 匹配@BindView注解在同一行的情况
+    bindview_same_line_pattern = SharedPattern(
+        r'(?<!\s)(\s*)@BindView\s*\(\s*([^()\s][^()]*|\s)\)\s+(\w+)\s+(\w+)\s*;',
+        re.MULTILINE
+    )
+    
+    # 匹配@OnClick注解在同一行的情况
+    onclick_same_line_pattern = SharedPattern(
+        r'(?<!\s)(\s*)@OnClick\s*\(\s*([^()\s][^()]*|\s)\)\s+(?:public\s+)?(?:void\s+)?(\w+)\s*\([^()]*\)',
+        re.MULTILINE
+    )
+    
+    # 匹配@OnLongClick注解在同一行的情况
+    onlongclick_same_line_pattern = SharedPattern(
+        r'(?<!\s)(\s*)@OnLongClick\s*\(\s*([^()\s][^()]*|\s)\)\s+(?:public\s+)?(?:boolean\s+)?(\w+)\s*\([^()]*\)',
+        re.MULTILINE
+    )
     
     def format_butterknife_annotations(self, content: str) -> str:
         """格式化ButterKnife注解，将同一行的注解分离到不同行"""
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+编辑缓冲区
+针对原始文本记录 (偏移量, 删除长度, 插入文本) 形式的编辑
+记录时检测相互冲突的编辑，最后一次性拼接生成结果
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import List, Tuple
+
+
+class EditConflictError(ValueError):
+    """编辑冲突异常"""
+    pass
+
+
+class EditBuffer:
+    """编辑缓冲区类"""
+
+    __slots__ = ('text', '_edits', '_deleted_starts', '_deleted_ends', '_insert_points')
+
+    def __init__(self, text: str):
+        self.text = text
+        # (偏移量, 删除长度, 插入文本, 记录序号)
+        self._edits = []
+        # 已删除区间（互不重叠，按起点排序）
+        self._deleted_starts = []
+        self._deleted_ends = []
+        # 纯插入位置（有序）
+        self._insert_points = []
+
+    def __len__(self) -> int:
+        return len(self._edits)
+
+    def conflicts(self, offset: int, delete_len: int = 0) -> bool:
+        """
+        检查编辑是否与已记录的编辑冲突
+
+        删除区间互相重叠，或插入点落在已删除区间内部，均视为冲突
+        在同一位置的多次插入按记录顺序拼接，不视为冲突
+        """
+        end = offset + delete_len
+        starts = self._deleted_starts
+
+        if delete_len == 0:
+            # 插入点严格位于某个删除区间内部
+            index = bisect_left(starts, offset) - 1
+            return index >= 0 and self._deleted_ends[index] > offset
+
+        # 与前一个或后一个删除区间重叠
+        index = bisect_left(starts, end)
+        if index > 0 and self._deleted_ends[index - 1] > offset:
+            return True
+
+        # 已有插入点严格位于本次删除区间内部
+        points = self._insert_points
+        return bisect_left(points, end) > bisect_right(points, offset)
+
+    def replace(self, offset: int, delete_len: int, insert_text: str = ''):
+        """
+        记录一次编辑：从offset开始删除delete_len个字符并插入insert_text
+
+        Raises:
+            EditConflictError: 与已记录的编辑冲突或超出文本范围
+        """
+        if offset < 0 or delete_len < 0 or offset + delete_len > len(self.text):
+            raise EditConflictError(f"编辑超出文本范围: offset={offset}, delete_len={delete_len}")
+
+        if self.conflicts(offset, delete_len):
+            raise EditConflictError(f"编辑冲突: offset={offset}, delete_len={delete_len}")
+
+        if delete_len:
+            index = bisect_left(self._deleted_starts, offset)
+            self._deleted_starts.insert(index, offset)
+            self._deleted_ends.insert(index, offset + delete_len)
+        else:
+            insort(self._insert_points, offset)
+
+        self._edits.append((offset, delete_len, insert_text, len(self._edits)))
+
+    def insert(self, offset: int, insert_text: str):
+        """在offset处插入文本"""
+        self.replace(offset, 0, insert_text)
+
+    def delete(self, offset: int, delete_len: int):
+        """删除从offset开始的delete_len个字符"""
+        self.replace(offset, delete_len, '')
+
+    def edits(self) -> List[Tuple[int, int, str]]:
+        """按应用顺序返回所有编辑"""
+        ordered = sorted(self._edits, key=lambda edit: (edit[0], edit[1] > 0, edit[3]))
+        return [(offset, delete_len, insert_text) for offset, delete_len, insert_text, _ in ordered]
+
+    def apply(self) -> str:
+        """一次性应用所有编辑，返回新文本"""
+        if not self._edits:
+            return self.text
+
+        text = self.text
+        pieces = []
+        position = 0
+
+        for offset, delete_len, insert_text in self.edits():
+            pieces.append(text[position:offset])
+            pieces.append(insert_text)
+            position = offset + delete_len
+
+        pieces.append(text[position:])
+        return ''.join(pieces)
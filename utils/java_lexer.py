@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Java词法分析器
+一次扫描把文件切分为紧凑的记号数组（类型、起始、结束）
+能正确识别字符串、字符字面量和注释，供解析器、转换器和注入器共享
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+
+# 记号类型
+TOKEN_IDENTIFIER = 1
+TOKEN_NUMBER = 2
+TOKEN_STRING = 3
+TOKEN_CHAR = 4
+TOKEN_LINE_COMMENT = 5
+TOKEN_BLOCK_COMMENT = 6
+TOKEN_LBRACE = 7
+TOKEN_RBRACE = 8
+TOKEN_LPAREN = 9
+TOKEN_RPAREN = 10
+TOKEN_SEMICOLON = 11
+TOKEN_AT = 12
+TOKEN_OPERATOR = 13
+
+# 非代码记号（注释和字面量）
+NON_CODE_TOKENS = frozenset([
+    TOKEN_STRING, TOKEN_CHAR, TOKEN_LINE_COMMENT, TOKEN_BLOCK_COMMENT
+])
+
+_PUNCTUATION_KINDS = {
+    '{': TOKEN_LBRACE,
+    '}': TOKEN_RBRACE,
+    '(': TOKEN_LPAREN,
+    ')': TOKEN_RPAREN,
+    ';': TOKEN_SEMICOLON,
+    '@': TOKEN_AT
+}
+
+_GROUP_KINDS = {
+    'block_comment': TOKEN_BLOCK_COMMENT,
+    'line_comment': TOKEN_LINE_COMMENT,
+    'text_block': TOKEN_STRING,
+    'string': TOKEN_STRING,
+    'char': TOKEN_CHAR,
+    'identifier': TOKEN_IDENTIFIER,
+    'number': TOKEN_NUMBER
+}
+
+# 注释和字面量（未闭合的注释、字符串在文件或行末尾结束，保证扫描总是线性的）
+_NON_CODE_PATTERN = (
+    r'(?P<block_comment>/\*.*?(?:\*/|\Z))'
+    r'|(?P<line_comment>//[^\n]*)'
+    r'|(?P<text_block>"""(?:[^"\\]|\\.|"(?!""))*(?:"""|\Z))'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*"?)'
+    r"|(?P<char>'(?:[^'\\\n]|\\.)*'?)"
+)
+
+_TOKEN_PATTERN = re.compile(
+    r'(?P<whitespace>\s+)'
+    r'|' + _NON_CODE_PATTERN +
+    r'|(?P<identifier>(?:[^\W\d]|\$)[\w$]*)'
+    r'|(?P<number>\d[\w.]*)'
+    r'|(?P<punctuation>.)',
+    re.DOTALL
+)
+
+# 在代码中，'/'、'"'、"'" 只会作为注释或字面量的开头出现（除法运算符不会与 // 或 /* 混淆），
+# 因此从左到右查找最左匹配即可得到与词法分析一致的注释和字面量区间
+_MASK_PATTERN = re.compile(_NON_CODE_PATTERN, re.DOTALL)
+
+# 屏蔽时保留换行，行号不变
+_MASKED_CHAR_PATTERN = re.compile(r'[^\r\n]')
+
+# 字面量保留的引号长度
+_QUOTE_LENGTHS = {'text_block': 3, 'string': 1, 'char': 1}
+
+
+class JavaTokens:
+    """Java记号数组类"""
+
+    __slots__ = (
+        'text', 'kinds', 'starts', 'ends', 'partners',
+        'brace_offsets', 'brace_opens', '_line_starts'
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.kinds = array('b')
+        self.starts = array('i')
+        self.ends = array('i')
+        # 配对括号的记号下标，-1表示无配对
+        self.partners = array('i')
+        # 代码中的大括号位置及是否为左括号，用于快速遍历
+        self.brace_offsets = array('i')
+        self.brace_opens = array('b')
+        self._line_starts = None
+
+        self._tokenize()
+
+    def _tokenize(self):
+        """扫描文本，生成记号数组并完成括号配对"""
+        kinds = self.kinds
+        starts = self.starts
+        ends = self.ends
+        partners = self.partners
+        brace_stack = []
+        paren_stack = []
+
+        for match in _TOKEN_PATTERN.finditer(self.text):
+            group = match.lastgroup
+            if group == 'whitespace':
+                continue
+
+            index = len(kinds)
+            start = match.start()
+
+            if group == 'punctuation':
+                kind = _PUNCTUATION_KINDS.get(match.group(), TOKEN_OPERATOR)
+            else:
+                kind = _GROUP_KINDS[group]
+
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(match.end())
+            partners.append(-1)
+
+            if kind == TOKEN_LBRACE:
+                brace_stack.append(index)
+                self.brace_offsets.append(start)
+                self.brace_opens.append(1)
+            elif kind == TOKEN_RBRACE:
+                if brace_stack:
+                    open_index = brace_stack.pop()
+                    partners[open_index] = index
+                    partners[index] = open_index
+                self.brace_offsets.append(start)
+                self.brace_opens.append(0)
+            elif kind == TOKEN_LPAREN:
+                paren_stack.append(index)
+            elif kind == TOKEN_RPAREN and paren_stack:
+                open_index = paren_stack.pop()
+                partners[open_index] = index
+                partners[index] = open_index
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def token_at(self, offset: int) -> int:
+        """返回起始于offset的记号下标，不存在返回-1"""
+        index = bisect_left(self.starts, offset)
+        if index < len(self.starts) and self.starts[index] == offset:
+            return index
+        return -1
+
+    def token_containing(self, offset: int) -> int:
+        """返回包含offset的记号下标，不存在（如空白处）返回-1"""
+        index = bisect_right(self.starts, offset) - 1
+        if index >= 0 and offset < self.ends[index]:
+            return index
+        return -1
+
+    def is_code(self, offset: int) -> bool:
+        """判断offset是否位于代码中（不在注释或字面量内）"""
+        index = self.token_containing(offset)
+        return index == -1 or self.kinds[index] not in NON_CODE_TOKENS
+
+    def matching_brace(self, offset: int) -> int:
+        """返回与offset处大括号配对的大括号位置，不存在返回-1"""
+        index = self.token_at(offset)
+        if index == -1 or self.kinds[index] not in (TOKEN_LBRACE, TOKEN_RBRACE):
+            return -1
+
+        partner = self.partners[index]
+        return self.starts[partner] if partner != -1 else -1
+
+    def find_open_brace(self, offset: int) -> int:
+        """返回offset及其之后第一个代码中的 '{' 位置，不存在返回-1"""
+        for position, is_open in self.iter_braces(offset):
+            if is_open:
+                return position
+        return -1
+
+    def iter_braces(self, start: int, end: int = None) -> Iterator[Tuple[int, bool]]:
+        """按顺序遍历[start, end)范围内代码中的大括号，产出(位置, 是否为左括号)"""
+        offsets = self.brace_offsets
+        opens = self.brace_opens
+        stop = len(offsets) if end is None else bisect_left(offsets, end)
+
+        for index in range(bisect_left(offsets, start), stop):
+            yield offsets[index], opens[index] == 1
+
+    def find_balance_point(self, start: int, depth: int = 0) -> int:
+        """
+        从start开始统计大括号深度，返回深度在 '}' 处首次回到0的位置
+
+        Args:
+            start: 起始位置
+            depth: 起始深度（如从方法体 '{' 之后开始则为1）
+
+        Returns:
+            '}' 的位置，未找到返回-1
+        """
+        for position, is_open in self.iter_braces(start):
+            if is_open:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return position
+        return -1
+
+    def line_index(self, offset: int) -> int:
+        """返回offset所在的行号（从0开始）"""
+        if self._line_starts is None:
+            line_starts = array('i', [0])
+            position = self.text.find('\n')
+            while position != -1:
+                line_starts.append(position + 1)
+                position = self.text.find('\n', position + 1)
+            self._line_starts = line_starts
+
+        return bisect_right(self._line_starts, offset) - 1
+
+
+@lru_cache(maxsize=32)
+def tokenize_java(text: str) -> JavaTokens:
+    """
+    对Java源码进行词法分析
+    相同文本只分析一次，各处理阶段共享同一份记号数组
+
+    Args:
+        text: Java源码
+
+    Returns:
+        记号数组
+    """
+    return JavaTokens(text)
+
+
+def _mask_match(match) -> str:
+    """把一个注释或字面量替换为等长的空白，字面量保留两端的引号"""
+    text = match.group()
+    quote = _QUOTE_LENGTHS.get(match.lastgroup)
+    if quote is None:
+        return _MASKED_CHAR_PATTERN.sub(' ', text)
+
+    # 未闭合的字面量只保留开头的引号
+    end = len(text) - quote if len(text) >= 2 * quote and text.endswith(text[:quote]) else len(text)
+    return text[:quote] + _MASKED_CHAR_PATTERN.sub(' ', text[quote:end]) + text[end:]
+
+
+@lru_cache(maxsize=32)
+def mask_java(text: str) -> str:
+    """
+    屏蔽Java源码中的注释和字符串、字符字面量的内容
+    被屏蔽的字符替换为空格（换行保留），结果与原文等长，
+    在屏蔽后的文本上匹配得到的偏移量可直接用于原文；一次线性扫描完成，
+    相同文本只屏蔽一次，解析器、转换器和注入器共享
+
+    Args:
+        text: Java源码
+
+    Returns:
+        屏蔽后的源码
+    """
+    if '/' not in text and '"' not in text and "'" not in text:
+        return text
+    return _MASK_PATTERN.sub(_mask_match, text)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Java文件结构模型
+基于词法分析结果一次性建立类、方法、构造器的嵌套区间索引
+记录每个成员的注解和修饰符，支持按偏移量O(log n)查找所属成员
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from .java_lexer import (
+    JavaTokens, tokenize_java, NON_CODE_TOKENS,
+    TOKEN_IDENTIFIER, TOKEN_LBRACE, TOKEN_RBRACE, TOKEN_LPAREN, TOKEN_RPAREN,
+    TOKEN_SEMICOLON, TOKEN_AT, TOKEN_OPERATOR
+)
+
+
+# 类成员类型
+CLASS_KINDS = frozenset(['class', 'interface', 'enum', 'anonymous'])
+METHOD_KINDS = frozenset(['method', 'constructor'])
+
+JAVA_MODIFIERS = frozenset([
+    'public', 'protected', 'private', 'static', 'final', 'abstract',
+    'synchronized', 'native', 'strictfp', 'default', 'transient', 'volatile'
+])
+
+# 带括号但不是方法声明的语句
+CONTROL_KEYWORDS = frozenset([
+    'if', 'for', 'while', 'switch', 'catch', 'synchronized', 'try', 'else', 'do'
+])
+
+
+class JavaFileModel:
+    """Java文件结构模型类"""
+
+    __slots__ = ('text', 'tokens', 'members', '_segment_starts', '_segment_members')
+
+    def __init__(self, text: str, tokens: JavaTokens = None):
+        self.text = text
+        self.tokens = tokens if tokens is not None else tokenize_java(text)
+        # 所有类、方法、构造器，按起始位置排序
+        self.members = []
+        # 基本区间起点及其所属的最内层成员下标（-1表示不属于任何成员）
+        self._segment_starts = []
+        self._segment_members = []
+
+        self._build_members()
+        self._build_segments()
+
+    def _build_members(self):
+        """遍历左大括号，识别其所属的声明"""
+        tokens = self.tokens
+        # 当前打开的成员下标栈
+        stack = []
+
+        for index in range(len(tokens)):
+            if tokens.kinds[index] != TOKEN_LBRACE:
+                continue
+
+            body_start = tokens.starts[index]
+            while stack and self.members[stack[-1]]['end'] <= body_start:
+                stack.pop()
+
+            parent = self.members[stack[-1]] if stack else None
+            member = self._classify_declaration(index, parent)
+            if member is None:
+                continue
+
+            member['index'] = len(self.members)
+            member['parent'] = parent['index'] if parent else -1
+            member['depth'] = len(stack)
+            self.members.append(member)
+            stack.append(member['index'])
+
+    def _collect_header(self, brace_index: int) -> List[int]:
+        """向前收集左大括号之前的声明头记号（括号组以右括号下标表示）"""
+        tokens = self.tokens
+        kinds = tokens.kinds
+        text = self.text
+        header = []
+        angle_depth = 0
+        i = brace_index - 1
+
+        while i >= 0:
+            kind = kinds[i]
+            if kind in NON_CODE_TOKENS:
+                i -= 1
+                continue
+
+            if kind == TOKEN_RPAREN and tokens.partners[i] != -1:
+                header.append(i)
+                i = tokens.partners[i] - 1
+                continue
+
+            if kind in (TOKEN_SEMICOLON, TOKEN_LBRACE, TOKEN_RBRACE, TOKEN_LPAREN):
+                break
+
+            if kind == TOKEN_OPERATOR:
+                char = text[tokens.starts[i]]
+                if char == '>' and not (i > 0 and text[tokens.starts[i - 1]] == '-'):
+                    angle_depth += 1
+                elif char == '<':
+                    angle_depth -= 1
+                elif char == ',' and angle_depth <= 0:
+                    # 位于参数列表中（如作为实参的匿名类），声明头到此为止
+                    break
+
+            header.append(i)
+            i -= 1
+
+        header.reverse()
+        return header
+
+    def _token_text(self, index: int) -> str:
+        """返回记号文本"""
+        return self.text[self.tokens.starts[index]:self.tokens.ends[index]]
+
+    def _classify_declaration(self, brace_index: int, parent: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """判断左大括号开启的是类、方法、构造器还是普通代码块"""
+        tokens = self.tokens
+        header = self._collect_header(brace_index)
+        if not header:
+            return None
+
+        words = [
+            self._token_text(i) if tokens.kinds[i] == TOKEN_IDENTIFIER else None
+            for i in header
+        ]
+
+        close_index = tokens.partners[brace_index]
+        body_start = tokens.starts[brace_index]
+        body_end = tokens.starts[close_index] if close_index != -1 else len(self.text)
+
+        member = {
+            'kind': None,
+            'name': '',
+            'start': tokens.starts[header[0]],
+            'end': body_end + 1 if close_index != -1 else len(self.text),
+            'body_start': body_start,
+            'body_end': body_end,
+            'annotations': self._collect_annotations(header),
+            'modifiers': [],
+            'extends': '',
+            'parameters': ''
+        }
+
+        # 类、接口、枚举声明
+        for position, word in enumerate(words):
+            if word not in ('class', 'interface', 'enum'):
+                continue
+
+            previous = header[position - 1] if position > 0 else -1
+            if previous != -1 and self._token_text(previous) == '.':
+                # Foo.class 字面量
+                continue
+
+            if position + 1 >= len(words) or not words[position + 1]:
+                continue
+
+            member['kind'] = word
+            member['name'] = words[position + 1]
+            member['modifiers'] = self._collect_modifiers(words[:position])
+            member['extends'] = self._clause_text(header, words, 'extends', 'implements')
+            return member
+
+        last = header[-1]
+        if tokens.kinds[last] != TOKEN_RPAREN:
+            # 可能是带 throws 子句的方法
+            if 'throws' not in words:
+                return None
+            throws_position = words.index('throws')
+            if throws_position == 0 or tokens.kinds[header[throws_position - 1]] != TOKEN_RPAREN:
+                return None
+            last = header[throws_position - 1]
+
+        open_paren = tokens.partners[last]
+
+        # 匿名内部类：new Type(...) {
+        if 'new' in words:
+            member['kind'] = 'anonymous'
+            member['extends'] = self._clause_text(header, words, 'new', None, stop_index=open_paren)
+            return member
+
+        name_index = open_paren - 1
+        if name_index not in header or tokens.kinds[name_index] != TOKEN_IDENTIFIER:
+            return None
+
+        name = self._token_text(name_index)
+        name_position = header.index(name_index)
+        if name in CONTROL_KEYWORDS:
+            return None
+
+        # 只有直接位于类体内的声明才是方法或构造器
+        if parent is None or parent['kind'] not in CLASS_KINDS:
+            return None
+
+        if name == parent['name']:
+            member['kind'] = 'constructor'
+        else:
+            member['kind'] = 'method'
+        member['name'] = name
+        member['modifiers'] = self._collect_modifiers(words[:name_position])
+        member['parameters'] = self.text[tokens.ends[open_paren]:tokens.starts[last]].strip()
+        return member
+
+    def _collect_annotations(self, header: List[int]) -> List[str]:
+        """收集声明头中的注解名称"""
+        tokens = self.tokens
+        annotations = []
+
+        for position, i in enumerate(header):
+            if tokens.kinds[i] != TOKEN_AT or position + 1 >= len(header):
+                continue
+
+            name_parts = []
+            j = position + 1
+            while j < len(header) and tokens.kinds[header[j]] == TOKEN_IDENTIFIER:
+                name_parts.append(self._token_text(header[j]))
+                if j + 1 < len(header) and self._token_text(header[j + 1]) == '.':
+                    j += 2
+                else:
+                    break
+
+            if name_parts and name_parts[0] != 'interface':
+                annotations.append('.'.join(name_parts))
+
+        return annotations
+
+    def _collect_modifiers(self, words: List[Optional[str]]) -> List[str]:
+        """收集声明头中的修饰符"""
+        return [word for word in words if word in JAVA_MODIFIERS]
+
+    def _clause_text(self, header: List[int], words: List[Optional[str]], keyword: str,
+                     stop_keyword: Optional[str], stop_index: int = -1) -> str:
+        """提取关键字之后的子句文本（如 extends 之后的父类）"""
+        if keyword not in words:
+            return ''
+
+        tokens = self.tokens
+        position = words.index(keyword)
+        if position + 1 >= len(header):
+            return ''
+
+        start = tokens.ends[header[position]]
+        if stop_index != -1:
+            end = tokens.starts[stop_index]
+        elif stop_keyword and stop_keyword in words[position:]:
+            end = tokens.starts[header[position + words[position:].index(stop_keyword)]]
+        else:
+            end = tokens.ends[header[-1]]
+
+        return ' '.join(self.text[start:end].split())
+
+    def _build_segments(self):
+        """把嵌套区间展开为互不重叠的基本区间，供二分查找"""
+        starts = self._segment_starts
+        owners = self._segment_members
+        children = [[] for _ in self.members]
+        roots = []
+        for member in self.members:
+            if member['parent'] == -1:
+                roots.append(member['index'])
+            else:
+                children[member['parent']].append(member['index'])
+
+        def add_segment(position: int, owner: int):
+            if starts and starts[-1] == position:
+                owners[-1] = owner
+            else:
+                starts.append(position)
+                owners.append(owner)
+
+        # 使用显式栈按深度优先顺序展开，避免深层嵌套时递归过深
+        # 栈元素为 (位置, 所属成员, 是否为成员起点)
+        add_segment(0, -1)
+        work = [(root, -1, True) for root in reversed(roots)]
+        while work:
+            value, owner, is_start = work.pop()
+            if not is_start:
+                # 成员结束后恢复外层成员
+                add_segment(value, owner)
+                continue
+
+            member = self.members[value]
+            add_segment(member['start'], value)
+            work.append((member['end'], owner, False))
+            for child in reversed(children[value]):
+                work.append((child, value, True))
+
+    def member_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        """返回包含offset的最内层类、方法或构造器，不存在返回None"""
+        position = bisect_right(self._segment_starts, offset) - 1
+        if position < 0:
+            return None
+
+        owner = self._segment_members[position]
+        return self.members[owner] if owner != -1 else None
+
+    def parent_of(self, member: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """返回成员的外层成员"""
+        parent = member['parent']
+        return self.members[parent] if parent != -1 else None
+
+    def enclosing(self, offset: int, kinds=CLASS_KINDS) -> Optional[Dict[str, Any]]:
+        """返回包含offset的最内层指定类型成员"""
+        member = self.member_at(offset)
+        while member is not None and member['kind'] not in kinds:
+            member = self.parent_of(member)
+        return member
+
+    def children_of(self, member: Dict[str, Any], kinds=None) -> List[Dict[str, Any]]:
+        """返回成员的直接子成员"""
+        return [
+            child for child in self.members
+            if child['parent'] == member['index'] and (kinds is None or child['kind'] in kinds)
+        ]
+
+    @property
+    def classes(self) -> List[Dict[str, Any]]:
+        """所有具名类、接口和枚举"""
+        return [m for m in self.members if m['kind'] in CLASS_KINDS and m['kind'] != 'anonymous']
+
+    @property
+    def methods(self) -> List[Dict[str, Any]]:
+        """所有方法和构造器"""
+        return [m for m in self.members if m['kind'] in METHOD_KINDS]
+
+    @property
+    def main_class(self) -> Optional[Dict[str, Any]]:
+        """主类：第一个public顶层类，不存在时取第一个顶层类"""
+        top_level = [m for m in self.classes if m['parent'] == -1]
+        for member in top_level:
+            if 'public' in member['modifiers']:
+                return member
+        return top_level[0] if top_level else None
+
+    @property
+    def inner_classes(self) -> List[Dict[str, Any]]:
+        """主类之后声明的所有具名类（包括嵌套类和其它顶层类）"""
+        main_class = self.main_class
+        if main_class is None:
+            return [m for m in self.classes if m['kind'] == 'class']
+
+        return [
+            m for m in self.classes
+            if m['kind'] == 'class' and m['start'] > main_class['start']
+        ]
+
+    def find_methods(self, name: str, owner: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """按名称查找方法，可限定所属类"""
+        return [
+            m for m in self.methods
+            if m['name'] == name and (owner is None or m['parent'] == owner['index'])
+        ]
+
+
+@lru_cache(maxsize=32)
+def build_file_model(text: str) -> JavaFileModel:
+    """
+    构建Java文件结构模型
+    相同文本只构建一次
+
+    Args:
+        text: Java源码
+
+    Returns:
+        文件结构模型
+    """
+    return JavaFileModel(text)
@@ -4,15 +4,138 @@
 日志工具模块
 控制台输出 + 文件日志
 支持 debug/info/warning/error 等级
+支持 %-style 延迟格式化和后台线程批量写入
 """
 
+import atexit
+import multiprocessing.util
 import os
+import queue
 import sys
+import threading
+import time
+import weakref
 from datetime import datetime
 from typing import Optional, TextIO
 from config import Config
 
 
+class AsyncLogWriter:
+    """
+    后台日志写入线程
+    日志记录放入队列，由后台线程按批写入控制台和日志文件：
+    攒够 batch_size 条或距第一条记录超过 flush_interval 秒时写入并刷新一次
+    """
+    
+    def __init__(self, log_file: Optional[TextIO], flush_interval: float = 0.5, batch_size: int = 256):
+        self.log_file = log_file
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.pid = os.getpid()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+    
+    def write(self, stream: Optional[TextIO], console_text: Optional[str], file_text: str):
+        """提交一条日志记录（stream为提交时的控制台流，保证重定向生效）"""
+        self._queue.put(('record', stream, console_text, file_text))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已提交的记录全部写出"""
+        return self._send_control('flush', timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """写出剩余记录并停止后台线程"""
+        if self._closed:
+            return True
+        self._closed = True
+        return self._send_control('stop', timeout)
+    
+    def _send_control(self, kind: str, timeout: Optional[float]) -> bool:
+        """发送控制消息并等待后台线程处理"""
+        if not self._thread.is_alive():
+            return False
+        
+        done = threading.Event()
+        self._queue.put((kind, done))
+        return done.wait(timeout)
+    
+    def _run(self):
+        """后台线程主循环"""
+        pending = []
+        deadline = 0.0
+        
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write_batch(pending)
+                pending = []
+                continue
+            
+            if item[0] == 'record':
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                if len(pending) >= self.batch_size:
+                    self._write_batch(pending)
+                    pending = []
+                continue
+            
+            # 控制消息：先写出已攒的记录
+            self._write_batch(pending)
+            pending = []
+            item[1].set()
+            if item[0] == 'stop':
+                return
+    
+    def _write_batch(self, records: list):
+        """写出一批记录，每个输出流只刷新一次"""
+        if not records:
+            return
+        
+        streams = []
+        file_lines = []
+        for _, stream, console_text, file_text in records:
+            if stream is not None and console_text is not None:
+                try:
+                    stream.write(console_text + '\n')
+                    if stream not in streams:
+                        streams.append(stream)
+                except Exception:
+                    pass
+            file_lines.append(file_text + '\n')
+        
+        for stream in streams:
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        
+        if self.log_file:
+            try:
+                self.log_file.write(''.join(file_lines))
+                self.log_file.flush()
+            except Exception as e:
+                print(f"写入日志文件失败: {e}", file=sys.__stderr__)
+
+
+# 使用后台写入且尚未关闭的日志记录器（弱引用，不影响回收），退出时由同一个回调统一关闭
+_live_loggers = weakref.WeakSet()
+# 已注册退出回调的进程ID
+_shutdown_hook_pid = None
+
+
+def _close_live_loggers():
+    """退出时关闭本进程中仍在后台写入的日志记录器（atexit / multiprocessing 退出回调）"""
+    for logger in list(_live_loggers):
+        # 从父进程继承、未在本进程中写过日志的记录器由父进程负责关闭
+        if logger._writer is not None and logger._writer.pid == os.getpid():
+            logger.close()
+
+
 class Logger:
     """日志记录器类"""
     
@@ -20,10 +143,40 @@ class Logger:
         self.config = config or Config()
         self.log_file = None
         self.log_level = self._get_log_level()
+        self._writer = None
         
         # 初始化日志文件
         if self.config.LOG_FILE:
             self._init_log_file()
+        
+        # 后台批量写入；退出（包括KeyboardInterrupt导致的退出）时写出剩余日志
+        if self.config.LOG_ASYNC:
+            self._writer = self._create_writer()
+            self._register_shutdown_hook()
+    
+    def _register_shutdown_hook(self):
+        """
+        登记到退出时写出剩余日志的集合，每个进程只注册一次退出回调
+        atexit 覆盖普通进程（fork 出的子进程继承父进程的注册）；multiprocessing 的子进程（如进程池工作进程）
+        以 os._exit 退出，不运行 atexit，但会在退出前运行当前进程中注册的 Finalize 回调
+        """
+        global _shutdown_hook_pid
+        _live_loggers.add(self)
+        if _shutdown_hook_pid == os.getpid():
+            return
+        
+        if _shutdown_hook_pid is None:
+            atexit.register(_close_live_loggers)
+        multiprocessing.util.Finalize(None, _close_live_loggers, exitpriority=10)
+        _shutdown_hook_pid = os.getpid()
+    
+    def _create_writer(self) -> AsyncLogWriter:
+        """创建后台写入线程"""
+        return AsyncLogWriter(
+            self.log_file,
+            self.config.LOG_FLUSH_INTERVAL,
+            self.config.LOG_BATCH_SIZE
+        )
     
     def _get_log_level(self) -> int:
         """获取日志级别数值"""
@@ -67,18 +220,31 @@ class Logger:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"[{timestamp}] [{level.upper()}] {message}"
     
-    def _write_log(self, level: str, message: str):
-        """写入日志"""
+    def _write_log(self, level: str, message: str, args: tuple = ()):
+        """
+        写入日志
+        
+        args 不为空时按 message % args 格式化，被级别过滤的消息不会格式化
+        """
         if not self._should_log(level):
             return
         
+        if args:
+            message = message % args
         formatted_message = self._format_message(level, message)
+        console_message = self._format_console_message(level, formatted_message)
+        stream = sys.stderr if self.config.LOG_STDERR or level.upper() == 'ERROR' else sys.stdout
+        
+        if self._writer is not None:
+            if self._writer.pid != os.getpid():
+                # fork 出的子进程中没有后台线程，重新创建，并在子进程中注册退出回调
+                self._writer = self._create_writer()
+                self._register_shutdown_hook()
+            self._writer.write(stream, console_message, formatted_message)
+            return
         
         # 控制台输出
-        if level.upper() == 'ERROR':
-            print(formatted_message, file=sys.stderr)
-        else:
-            print(formatted_message)
+        print(console_message, file=stream)
         
         # 文件日志
         if self.log_file:
@@ -88,29 +254,38 @@ class Logger:
             except Exception as e:
                 print(f"写入日志文件失败: {e}")
     
-    def debug(self, message: str):
+    def _format_console_message(self, level: str, formatted_message: str) -> str:
+        """控制台输出的消息（子类可添加颜色）"""
+        return formatted_message
+    
+    def debug(self, message: str, *args):
         """记录调试信息"""
-        self._write_log('DEBUG', message)
+        self._write_log('DEBUG', message, args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """记录一般信息"""
-        self._write_log('INFO', message)
+        self._write_log('INFO', message, args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """记录警告信息"""
-        self._write_log('WARNING', message)
+        self._write_log('WARNING', message, args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """记录错误信息"""
-        self._write_log('ERROR', message)
+        self._write_log('ERROR', message, args)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """记录严重错误信息"""
-        self._write_log('ERROR', f"CRITICAL: {message}")
+        self._write_log('ERROR', "CRITICAL: " + message, args)
     
-    def log(self, level: str, message: str):
+    def log(self, level: str, message: str, *args):
         """通用日志方法"""
-        self._write_log(level, message)
+        self._write_log(level, message, args)
+    
+    def flush(self):
+        """等待后台线程写出所有已提交的日志"""
+        if self._writer is not None and self._writer.pid == os.getpid():
+            self._writer.flush()
     
     def log_exception(self, message: str, exception: Exception = None):
         """记录异常信息"""
@@ -216,7 +391,13 @@ class Logger:
         return self.log_level <= 3
     
     def close(self):
-        """关闭日志文件"""
+        """写出剩余日志并关闭日志文件"""
+        _live_loggers.discard(self)
+        writer = self._writer
+        self._writer = None
+        if writer is not None and writer.pid == os.getpid():
+            writer.close()
+        
         if self.log_file:
             try:
                 self.log_file.close()
@@ -250,29 +431,10 @@ class ColoredLogger(Logger):
             'RESET': '\033[0m'      # 重置
         }
     
-    def _write_log(self, level: str, message: str):
-        """写入带颜色的日志"""
-        if not self._should_log(level):
-            return
-        
-        formatted_message = self._format_message(level, message)
-        
-        # 控制台输出（带颜色）
-        if level.upper() == 'ERROR':
-            colored_message = f"{self.colors['ERROR']}{formatted_message}{self.colors['RESET']}"
-            print(colored_message, file=sys.stderr)
-        else:
-            color = self.colors.get(level.upper(), self.colors['RESET'])
-            colored_message = f"{color}{formatted_message}{self.colors['RESET']}"
-            print(colored_message)
-        
-        # 文件日志（不带颜色）
-        if self.log_file:
-            try:
-                self.log_file.write(formatted_message + '\n')
-                self.log_file.flush()
-            except Exception as e:
-                print(f"写入日志文件失败: {e}")
+    def _format_console_message(self, level: str, formatted_message: str) -> str:
+        """控制台输出带颜色，文件日志不带颜色"""
+        color = self.colors.get(level.upper(), self.colors['RESET'])
+        return f"{color}{formatted_message}{self.colors['RESET']}"
 
 
 # 全局日志记录器实例
@@ -295,21 +457,21 @@ def set_global_logger(logger: Logger):
     _global_logger = logger
 
 
-def log_debug(message: str):
+def log_debug(message: str, *args):
     """全局调试日志"""
-    get_logger().debug(message)
+    get_logger().debug(message, *args)
 
 
-def log_info(message: str):
+def log_info(message: str, *args):
     """全局信息日志"""
-    get_logger().info(message)
+    get_logger().info(message, *args)
 
 
-def log_warning(message: str):
+def log_warning(message: str, *args):
     """全局警告日志"""
-    get_logger().warning(message)
+    get_logger().warning(message, *args)
 
 
-def log_error(message: str):
+def log_error(message: str, *args):
     """全局错误日志"""
-    get_logger().error(message)
+    get_logger().error(message, *args)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享正则注册表
+解析器、转换器、注入器的正则表达式声明为类属性 SharedPattern，登记在模块级注册表中，
+第一次被访问时才编译，之后所有实例（以及同一进程中的所有工作任务）共用同一个编译结果，
+创建实例时不再编译任何正则
+实例上直接赋值同名属性仍可覆盖共享正则（只影响该实例）
+"""
+
+import re
+import threading
+from typing import Dict, Pattern, Tuple
+
+
+class PatternRegistry:
+    """正则注册表类：名称 -> (模式, 标志)，按需编译并缓存"""
+
+    def __init__(self):
+        self._sources: Dict[str, Tuple[str, int]] = {}
+        self._compiled: Dict[str, Pattern] = {}
+        self._lock = threading.Lock()
+
+    def register(self, key: str, pattern: str, flags: int = 0):
+        """登记一个正则（不编译）"""
+        self._sources[key] = (pattern, flags)
+
+    def get(self, key: str) -> Pattern:
+        """获取编译好的正则，第一次获取时编译"""
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(key)
+                if compiled is None:
+                    pattern, flags = self._sources[key]
+                    compiled = re.compile(pattern, flags)
+                    self._compiled[key] = compiled
+        return compiled
+
+    def compiled_count(self) -> int:
+        """已编译的正则数量"""
+        return len(self._compiled)
+
+    def registered_count(self) -> int:
+        """已登记的正则数量"""
+        return len(self._sources)
+
+    def clear(self):
+        """丢弃所有编译结果（登记信息保留），用于测量冷启动开销"""
+        with self._lock:
+            self._compiled.clear()
+
+
+# 进程内唯一的注册表
+PATTERN_REGISTRY = PatternRegistry()
+
+
+class SharedPattern:
+    """
+    共享正则描述符：作为类属性声明，登记到 PATTERN_REGISTRY，定义类和创建实例时都不编译；
+    第一次通过实例或类访问时编译，之后该类的所有实例共用同一个编译结果
+    """
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+        self.key = None
+
+    def __set_name__(self, owner, name: str):
+        self.key = f"{owner.__module__}.{owner.__qualname__}.{name}"
+        PATTERN_REGISTRY.register(self.key, self.pattern, self.flags)
+
+    def __get__(self, instance, owner) -> Pattern:
+        return PATTERN_REGISTRY.get(self.key)
+
+
+def compiled_patterns(obj) -> Dict[str, Pattern]:
+    """对象可用的所有编译正则：类上的共享正则，加上实例上覆盖或新增的正则"""
+    patterns = {}
+    for cls in reversed(type(obj).__mro__):
+        for name, value in vars(cls).items():
+            if isinstance(value, SharedPattern):
+                patterns[name] = getattr(obj, name)
+    for name, value in vars(obj).items():
+        if isinstance(value, re.Pattern):
+            patterns[name] = value
+    return patterns
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合并分片迁移报告
+把各分片生成的 butterknife_migration_report.json 合并为一份完整报告：
+计数和各阶段耗时累加，总墙钟时间取最慢的分片，文件详情按路径排序，耗时最长的文件重新排序
+"""
+
+import json
+from typing import Dict, Any, List
+
+
+# 直接累加的计数字段
+COUNTER_FIELDS = ('total_files', 'successful_migrations', 'unchanged_files', 'failed_migrations',
+                  'resumed_committed_files')
+
+
+def load_reports(report_paths: List[str]) -> List[Dict[str, Any]]:
+    """读取多个报告文件"""
+    reports = []
+    for report_path in report_paths:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            reports.append(json.load(f))
+    return reports
+
+
+def _sum_dicts(dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """按键累加数值"""
+    merged = {}
+    for values in dicts:
+        for key, value in values.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _merge_timings(timings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """合并计时：各阶段累加；分片并行执行，总墙钟时间取最大值，CPU时间累加"""
+    stages = {}
+    for report_timings in timings:
+        for stage, stage_timings in report_timings['stages'].items():
+            merged = stages.setdefault(stage, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            merged['wall_seconds'] = round(merged['wall_seconds'] + stage_timings['wall_seconds'], 6)
+            merged['cpu_seconds'] = round(merged['cpu_seconds'] + stage_timings['cpu_seconds'], 6)
+
+    return {
+        'total': {
+            'wall_seconds': max(t['total']['wall_seconds'] for t in timings),
+            'cpu_seconds': round(sum(t['total']['cpu_seconds'] for t in timings), 6),
+            'shard_wall_seconds': round(sum(t['total']['wall_seconds'] for t in timings), 6)
+        },
+        'stages': stages
+    }
+
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并分片报告
+
+    Args:
+        reports: 各分片的报告
+
+    Returns:
+        合并后的报告；缺少的分片记录在 missing_shards 中
+
+    Raises:
+        ValueError: 没有报告、分片数不一致或分片重复
+    """
+    if not reports:
+        raise ValueError("没有需要合并的报告")
+
+    shards = [report.get('shard') for report in reports if report.get('shard')]
+    counts = {shard['count'] for shard in shards}
+    if len(counts) > 1:
+        raise ValueError(f"报告来自不同的分片数: {sorted(counts)}")
+    indexes = [shard['index'] for shard in shards]
+    duplicates = sorted({index for index in indexes if indexes.count(index) > 1})
+    if duplicates:
+        raise ValueError(f"分片报告重复: {duplicates}")
+
+    merged = {field: 0 for field in COUNTER_FIELDS[:4]}
+    for field in COUNTER_FIELDS:
+        values = [report[field] for report in reports if field in report]
+        if values:
+            merged[field] = sum(values)
+    # 与单次迁移的报告一致，按项目内相对路径排序
+    details = [detail for report in reports for detail in report.get('details', [])]
+    merged['details'] = sorted(details, key=lambda detail: detail.get('path', detail['file']))
+
+    if shards:
+        count = counts.pop()
+        merged['merged_shards'] = sorted(indexes)
+        merged['missing_shards'] = [index for index in range(1, count + 1) if index not in indexes]
+        merged['shard_count'] = count
+
+    backup_runs = [report['backup_run'] for report in reports if report.get('backup_run')]
+    if backup_runs:
+        merged['backup_runs'] = backup_runs
+
+    dry_runs = [report['dry_run'] for report in reports if report.get('dry_run')]
+    if dry_runs:
+        merged['dry_run'] = _sum_dicts(dry_runs)
+
+    merged['injector_branches'] = dict(sorted(
+        _sum_dicts([report.get('injector_branches', {}) for report in reports]).items()
+    ))
+
+    timings = [report['timings'] for report in reports if report.get('timings')]
+    if timings:
+        merged['timings'] = _merge_timings(timings)
+
+    slowest_count = max(len(report.get('slowest_files', [])) for report in reports)
+    slowest_files = [entry for report in reports for entry in report.get('slowest_files', [])]
+    merged['slowest_files'] = sorted(slowest_files, key=lambda entry: -entry['total_seconds'])[:slowest_count]
+
+    return merged
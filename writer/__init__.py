@@ -5,5 +5,12 @@
 """
 
 from .file_writer import FileWriter
+from .write_journal import WriteJournal, recover_in_flight
+from .backup_store import BackupStore
+from .backup_archive import BackupArchive
+from .rollback import rollback_run
+from .diff_writer import DiffWriter
 
-__all__ = ['FileWriter']
+__all__ = [
+    'FileWriter', 'WriteJournal', 'recover_in_flight', 'BackupStore', 'BackupArchive', 'rollback_run', 'DiffWriter'
+]
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单文件归档备份
+原始文件以追加方式写入同一个 tar 或 zip 归档，避免为每个文件创建备份文件和目录
+索引文件按行记录每个文件对应的成员及其数据在归档中的偏移，恢复时直接定位读取，
+不需要解析整个归档；批量恢复按偏移顺序一次顺序读取
+
+目录结构:
+    butterknife_backup/
+        backup.tar (或 backup.zip)      所有运行共用的归档，成员按内容的SHA-256命名
+        backup.tar.index.jsonl          索引，每行一个文件
+"""
+
+import hashlib
+import io
+import json
+import os
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from .backup_store import write_file_atomic, hash_is_current
+
+
+ARCHIVE_FORMATS = ('tar', 'zip')
+INDEX_SUFFIX = ".index.jsonl"
+
+# 备份引用（写前日志使用）："归档路径::偏移:长度:编码"，不依赖索引即可读取
+REFERENCE_SEPARATOR = "::"
+
+# 成员数据的编码
+CODEC_NONE = 'none'
+CODEC_ZLIB = 'zlib'
+CODEC_DEFLATE = 'deflate'
+
+# zip本地文件头：签名、版本、标志、压缩方法、时间、日期、CRC、压缩后大小、原大小、文件名长度、扩展字段长度
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def _decode(data: bytes, codec: str) -> bytes:
+    """按编码还原成员数据"""
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_DEFLATE:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+def read_reference(reference: str) -> bytes:
+    """读取备份引用指向的原始文件内容"""
+    archive_path, _, location = reference.rpartition(REFERENCE_SEPARATOR)
+    offset, size, codec = location.split(':')
+    with open(archive_path, 'rb') as f:
+        f.seek(int(offset))
+        return _decode(f.read(int(size)), codec)
+
+
+def is_archive_reference(reference: str) -> bool:
+    """判断备份路径是否为归档引用"""
+    return REFERENCE_SEPARATOR in reference
+
+
+class BackupArchive:
+    """单文件归档备份类"""
+
+    def __init__(self, backup_dir: str, archive_format: str = 'tar', compress: bool = False):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"不支持的归档格式: {archive_format}")
+
+        self.backup_dir = backup_dir
+        self.archive_format = archive_format
+        self.compress = compress
+        self.archive_path = os.path.join(backup_dir, f"backup.{archive_format}")
+        self.index_path = self.archive_path + INDEX_SUFFIX
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        # 索引在第一次使用时读取：所有记录，以及 内容哈希 → 已写入的成员记录
+        self._entries = None
+        self._members = {}
+        self._archive = None
+        self._archive_file = None
+        self._index_file = None
+        self.statistics = {'files': 0, 'stored_blobs': 0, 'deduplicated': 0}
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        """读取索引，只保留数据已完整写入归档的记录"""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = []
+        if os.path.exists(self.index_path):
+            archive_size = os.path.getsize(self.archive_path) if os.path.exists(self.archive_path) else 0
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 进程退出时写了一半的最后一行
+                        continue
+                    if entry['offset'] + entry['stored_size'] > archive_size:
+                        continue
+                    self._entries.append(entry)
+                    self._members.setdefault(entry['hash'], entry)
+        return self._entries
+
+    def _open_archive(self):
+        """打开归档准备追加成员"""
+        if self.archive_format == 'zip':
+            compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+            # 上次运行中途退出时归档没有中央目录，zipfile会在文件末尾追加新的归档，
+            # 旧成员的数据仍在原偏移处，索引仍然有效
+            self._archive = zipfile.ZipFile(self.archive_path, 'a', compression=compression)
+            return
+
+        # tar：截断到索引中最后一个成员之后（丢弃上次运行写了一半的成员和结束块）再继续写入
+        end = 0
+        for entry in self._load_index():
+            end = max(end, entry['offset'] + _padded(entry['stored_size']))
+        self._archive_file = open(self.archive_path, 'r+b' if os.path.exists(self.archive_path) else 'w+b')
+        self._archive_file.seek(end)
+        self._archive_file.truncate()
+        self._archive = tarfile.open(fileobj=self._archive_file, mode='w', format=tarfile.GNU_FORMAT)
+
+    def _append_member(self, content_hash: str, data: bytes) -> Dict[str, Any]:
+        """把文件内容追加为归档成员并落盘，返回成员的位置信息"""
+        if self._archive is None:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self._open_archive()
+
+        if self.archive_format == 'zip':
+            self._archive.writestr(content_hash, data)
+            info = self._archive.filelist[-1]
+            archive_file = self._archive.fp
+            position = archive_file.tell()
+            archive_file.seek(info.header_offset)
+            header = _ZIP_LOCAL_HEADER.unpack(archive_file.read(_ZIP_LOCAL_HEADER.size))
+            archive_file.seek(position)
+            offset = info.header_offset + _ZIP_LOCAL_HEADER.size + header[9] + header[10]
+            stored_size = info.compress_size
+            codec = CODEC_DEFLATE if info.compress_type == zipfile.ZIP_DEFLATED else CODEC_NONE
+            member = content_hash
+        else:
+            codec = CODEC_ZLIB if self.compress else CODEC_NONE
+            payload = zlib.compress(data) if self.compress else data
+            member = content_hash + ('.z' if self.compress else '')
+            info = tarfile.TarInfo(member)
+            info.size = len(payload)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(payload))
+            archive_file = self._archive_file
+            offset = self._archive.offset - _padded(len(payload))
+            stored_size = len(payload)
+
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+        return {'member': member, 'offset': offset, 'stored_size': stored_size, 'codec': codec}
+
+    def add(self, file_key: str, source_path: str, content_hash: Optional[str] = None,
+            hashed_stat: Optional[Tuple[int, int]] = None) -> str:
+        """
+        备份文件
+
+        Args:
+            file_key: 文件相对于项目根目录的路径
+            source_path: 要备份的文件
+            content_hash: 文件内容的SHA-256，已知时内容已在归档中则不再读取文件
+            hashed_stat: 计算 content_hash 时文件的 (大小, 修改时间)，与当前不一致时重新读取文件
+
+        Returns:
+            备份引用（可由 read_reference 读取）
+        """
+        self._load_index()
+        stat = os.stat(source_path)
+        trusted = content_hash and hash_is_current(hashed_stat, stat)
+        member = self._members.get(content_hash) if trusted else None
+
+        if member is None:
+            with open(source_path, 'rb') as f:
+                data = f.read()
+            content_hash = hashlib.sha256(data).hexdigest()
+            member = self._members.get(content_hash)
+
+        if member is None:
+            member = self._append_member(content_hash, data)
+            self.statistics['stored_blobs'] += 1
+        else:
+            self.statistics['deduplicated'] += 1
+
+        entry = {
+            'run': self.run_id,
+            'file': file_key,
+            'hash': content_hash,
+            'member': member['member'],
+            'offset': member['offset'],
+            'stored_size': member['stored_size'],
+            'codec': member['codec'],
+            'size': stat.st_size,
+            'mode': stat.st_mode & 0o7777,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        self._append_index(entry)
+        self._entries.append(entry)
+        self._members.setdefault(content_hash, entry)
+        self.statistics['files'] += 1
+        return self.reference(entry)
+
+    def reference(self, entry: Dict[str, Any]) -> str:
+        """备份记录对应的引用"""
+        return (f"{self.archive_path}{REFERENCE_SEPARATOR}"
+                f"{entry['offset']}:{entry['stored_size']}:{entry['codec']}")
+
+    def _append_index(self, entry: Dict[str, Any]):
+        """追加索引记录并立即刷新"""
+        if self._index_file is None:
+            self._index_file = open(self.index_path, 'a', encoding='utf-8')
+        self._index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._index_file.flush()
+
+    def close(self):
+        """写入归档的结束标记（tar结束块 / zip中央目录）并关闭索引"""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        if self._archive_file is not None:
+            self._archive_file.close()
+            self._archive_file = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def list_runs(self) -> List[str]:
+        """所有运行ID，按时间先后排序"""
+        return sorted({entry['run'] for entry in self._load_index()})
+
+    def latest_entries(self, run_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """每个文件最近一次的备份记录；指定运行ID时只包含该次运行"""
+        entries = {}
+        for entry in self._load_index():
+            if run_id is None or entry['run'] == run_id:
+                entries[entry['file']] = entry
+        return entries
+
+    def lookup(self, file_key: str) -> Optional[Dict[str, Any]]:
+        """查找文件最近一次的备份记录"""
+        for entry in reversed(self._load_index()):
+            if entry['file'] == file_key:
+                return entry
+        return None
+
+    def _read(self, archive_file, entry: Dict[str, Any]) -> bytes:
+        """从归档中读取并校验成员内容"""
+        archive_file.seek(entry['offset'])
+        data = _decode(archive_file.read(entry['stored_size']), entry['codec'])
+        if hashlib.sha256(data).hexdigest() != entry['hash']:
+            raise ValueError(f"备份数据已损坏: {entry['member']}")
+        return data
+
+    @staticmethod
+    def _restore_data(data: bytes, entry: Dict[str, Any], target_path: str):
+        """写入恢复的内容并还原权限和修改时间"""
+        os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+        write_file_atomic(target_path, data)
+        os.chmod(target_path, entry['mode'])
+        os.utime(target_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+    def restore(self, entry: Dict[str, Any], target_path: str):
+        """
+        按备份记录恢复单个文件（直接定位到成员数据）
+
+        Raises:
+            ValueError: 成员内容与记录的哈希不一致
+        """
+        self._flush_archive()
+        with open(self.archive_path, 'rb') as f:
+            self._restore_data(self._read(f, entry), entry, target_path)
+
+    def restore_all(self, entries: Dict[str, Dict[str, Any]], project_path: str) -> List[str]:
+        """
+        批量恢复文件：按成员在归档中的偏移排序，一次顺序读取
+
+        Args:
+            entries: 文件相对路径 → 备份记录
+            project_path: 项目根目录
+
+        Returns:
+            已恢复的文件相对路径
+        """
+        self._flush_archive()
+        restored = []
+        ordered = sorted(entries.values(), key=lambda entry: (entry['offset'], entry['file']))
+        with open(self.archive_path, 'rb') as f:
+            data = None
+            offset = None
+            for entry in ordered:
+                # 内容相同的文件共用一个成员，只读取一次
+                if entry['offset'] != offset:
+                    data = self._read(f, entry)
+                    offset = entry['offset']
+                self._restore_data(data, entry, os.path.join(project_path, entry['file']))
+                restored.append(entry['file'])
+        return restored
+
+    def _flush_archive(self):
+        """恢复前确保本次运行写入的成员已写出"""
+        if self._archive is not None:
+            archive_file = self._archive.fp if self.archive_format == 'zip' else self._archive_file
+            archive_file.flush()
+
+    def get_info(self) -> Dict[str, Any]:
+        """根据索引汇总备份信息"""
+        entries = self._load_index()
+        members = {}
+        for entry in entries:
+            members.setdefault(entry['offset'], entry)
+
+        return {
+            'run_count': len(self.list_runs()),
+            'file_count': len({entry['file'] for entry in entries}),
+            'blob_count': len(members),
+            'original_size': sum(entry['size'] for entry in members.values()),
+            'stored_size': sum(entry['stored_size'] for entry in members.values())
+        }
+
+
+def _padded(size: int) -> int:
+    """tar成员数据按512字节块对齐后的长度"""
+    return (size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE * tarfile.BLOCKSIZE
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址备份存储
+原始文件按内容的SHA-256保存为对象（可选zlib压缩），内容相同的文件只保存一次
+每次运行追加写入一个清单，记录 文件相对路径 → 对象 的映射
+
+目录结构:
+    butterknife_backup/
+        objects/ab/abcdef...        未压缩的对象
+        objects/ab/abcdef....z      zlib压缩的对象
+        manifests/<运行ID>.jsonl    每次运行的清单，每行一个文件
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+
+OBJECTS_DIR = "objects"
+MANIFESTS_DIR = "manifests"
+MANIFEST_SUFFIX = ".jsonl"
+COMPRESSED_SUFFIX = ".z"
+
+
+def read_blob(blob_path: str) -> bytes:
+    """读取对象内容，压缩的对象自动解压"""
+    with open(blob_path, 'rb') as f:
+        data = f.read()
+    if blob_path.endswith(COMPRESSED_SUFFIX):
+        data = zlib.decompress(data)
+    return data
+
+
+def hash_is_current(hashed_stat: Optional[Tuple[int, int]], stat: os.stat_result) -> bool:
+    """计算哈希时记录的 (大小, 修改时间) 与文件当前状态一致时，调用方提供的哈希才可信"""
+    return hashed_stat is not None and tuple(hashed_stat) == (stat.st_size, stat.st_mtime_ns)
+
+
+def write_file_atomic(file_path: str, data: bytes):
+    """先写入同目录的临时文件再原子替换，避免留下写了一半的文件"""
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class BackupStore:
+    """内容寻址备份存储类"""
+
+    def __init__(self, backup_dir: str, compress: bool = False):
+        self.backup_dir = backup_dir
+        self.compress = compress
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self._manifest_file = None
+        # 本次运行的清单，以及已读取的历史清单（运行ID → 清单）
+        self._entries = {}
+        self._manifests = {}
+        self.statistics = {'files': 0, 'stored_blobs': 0, 'deduplicated': 0}
+
+    @property
+    def manifest_path(self) -> str:
+        """本次运行的清单路径"""
+        return os.path.join(self.backup_dir, MANIFESTS_DIR, self.run_id + MANIFEST_SUFFIX)
+
+    def _blob_relative_path(self, content_hash: str, compressed: bool) -> str:
+        """对象相对于备份目录的路径"""
+        name = content_hash + (COMPRESSED_SUFFIX if compressed else '')
+        return os.path.join(OBJECTS_DIR, content_hash[:2], name)
+
+    def _find_blob(self, content_hash: str) -> Optional[str]:
+        """查找已保存的对象（压缩或未压缩），返回相对路径"""
+        for compressed in (self.compress, not self.compress):
+            relative_path = self._blob_relative_path(content_hash, compressed)
+            if os.path.exists(os.path.join(self.backup_dir, relative_path)):
+                return relative_path
+        return None
+
+    def add(self, file_key: str, source_path: str, content_hash: Optional[str] = None,
+            hashed_stat: Optional[Tuple[int, int]] = None) -> str:
+        """
+        备份文件
+
+        Args:
+            file_key: 文件相对于项目根目录的路径
+            source_path: 要备份的文件
+            content_hash: 文件内容的SHA-256，已知时对象已存在则不再读取文件
+            hashed_stat: 计算 content_hash 时文件的 (大小, 修改时间)，与当前不一致时重新读取文件
+
+        Returns:
+            对象文件的完整路径
+        """
+        stat = os.stat(source_path)
+        trusted = content_hash and hash_is_current(hashed_stat, stat)
+        blob = self._find_blob(content_hash) if trusted else None
+
+        if blob is None:
+            with open(source_path, 'rb') as f:
+                data = f.read()
+            content_hash = hashlib.sha256(data).hexdigest()
+            blob = self._find_blob(content_hash)
+
+        if blob is None:
+            blob = self._blob_relative_path(content_hash, self.compress)
+            blob_path = os.path.join(self.backup_dir, blob)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            write_file_atomic(blob_path, zlib.compress(data) if self.compress else data)
+            self.statistics['stored_blobs'] += 1
+        else:
+            self.statistics['deduplicated'] += 1
+
+        blob_path = os.path.join(self.backup_dir, blob)
+        entry = {
+            'file': file_key,
+            'hash': content_hash,
+            'blob': blob,
+            'size': stat.st_size,
+            'stored_size': os.path.getsize(blob_path),
+            'mode': stat.st_mode & 0o7777,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        self._append_manifest(entry)
+        self._entries[file_key] = entry
+        self.statistics['files'] += 1
+        return blob_path
+
+    def _append_manifest(self, entry: Dict[str, Any]):
+        """追加清单记录并立即刷新，进程中途退出时已备份的文件仍可恢复"""
+        if self._manifest_file is None:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            self._manifest_file = open(self.manifest_path, 'a', encoding='utf-8')
+        self._manifest_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._manifest_file.flush()
+
+    def close(self):
+        """关闭本次运行的清单"""
+        if self._manifest_file is not None:
+            self._manifest_file.close()
+            self._manifest_file = None
+
+    def list_runs(self) -> List[str]:
+        """所有运行ID，按时间先后排序"""
+        manifests_dir = os.path.join(self.backup_dir, MANIFESTS_DIR)
+        if not os.path.isdir(manifests_dir):
+            return []
+        return sorted(
+            name[:-len(MANIFEST_SUFFIX)] for name in os.listdir(manifests_dir)
+            if name.endswith(MANIFEST_SUFFIX)
+        )
+
+    def load_manifest(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """读取某次运行的清单（文件相对路径 → 记录），同一文件以最后一条为准"""
+        if run_id == self.run_id:
+            return self._entries
+        if run_id in self._manifests:
+            return self._manifests[run_id]
+
+        entries = {}
+        path = os.path.join(self.backup_dir, MANIFESTS_DIR, run_id + MANIFEST_SUFFIX)
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 进程退出时写了一半的最后一行
+                    continue
+                entries[entry['file']] = entry
+
+        self._manifests[run_id] = entries
+        return entries
+
+    def latest_entries(self, run_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """每个文件最近一次的备份记录；指定运行ID时只包含该次运行"""
+        if run_id is not None:
+            return dict(self.load_manifest(run_id))
+
+        entries = {}
+        for run in self.list_runs():
+            entries.update(self.load_manifest(run))
+        entries.update(self._entries)
+        return entries
+
+    def lookup(self, file_key: str) -> Optional[Dict[str, Any]]:
+        """查找文件最近一次的备份记录"""
+        if file_key in self._entries:
+            return self._entries[file_key]
+        for run_id in reversed(self.list_runs()):
+            entry = self.load_manifest(run_id).get(file_key)
+            if entry is not None:
+                return entry
+        return None
+
+    def restore(self, entry: Dict[str, Any], target_path: str):
+        """
+        按备份记录恢复文件，并还原权限和修改时间
+
+        Raises:
+            ValueError: 对象内容与记录的哈希不一致
+        """
+        data = read_blob(os.path.join(self.backup_dir, entry['blob']))
+        if hashlib.sha256(data).hexdigest() != entry['hash']:
+            raise ValueError(f"备份对象已损坏: {entry['blob']}")
+
+        os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+        write_file_atomic(target_path, data)
+        os.chmod(target_path, entry['mode'])
+        os.utime(target_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+    def restore_all(self, entries: Dict[str, Dict[str, Any]], project_path: str) -> List[str]:
+        """
+        批量恢复文件
+
+        Args:
+            entries: 文件相对路径 → 备份记录
+            project_path: 项目根目录
+
+        Returns:
+            已恢复的文件相对路径
+        """
+        restored = []
+        for file_key, entry in sorted(entries.items()):
+            self.restore(entry, os.path.join(project_path, file_key))
+            restored.append(file_key)
+        return restored
+
+    def get_info(self) -> Dict[str, Any]:
+        """根据清单汇总备份信息，不遍历对象目录"""
+        runs = self.list_runs()
+        if self.run_id not in runs and self._entries:
+            runs.append(self.run_id)
+
+        files = set()
+        blobs = {}
+        for run_id in runs:
+            for file_key, entry in self.load_manifest(run_id).items():
+                files.add(file_key)
+                blobs[entry['blob']] = entry
+
+        return {
+            'run_count': len(runs),
+            'file_count': len(files),
+            'blob_count': len(blobs),
+            'original_size': sum(entry['size'] for entry in blobs.values()),
+            'stored_size': sum(entry['stored_size'] for entry in blobs.values())
+        }
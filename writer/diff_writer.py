@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预览模式的差异输出
+不写入文件，逐个文件输出迁移前后的统一差异（unified diff），可以用 git apply 应用
+并行模式下文件的完成顺序不固定，差异先缓存，结束时按文件路径排序输出
+"""
+
+import difflib
+import os
+import sys
+from typing import Dict, Optional, TextIO
+
+
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+
+
+def unified_diff(original: str, migrated: str, file_key: str, context: int = 3) -> str:
+    """
+    生成单个文件的统一差异（git格式的文件头），内容相同时返回空字符串
+
+    Args:
+        original: 原内容
+        migrated: 迁移后的内容
+        file_key: 文件相对于项目根目录的路径
+        context: 上下文行数
+    """
+    if original == migrated:
+        return ""
+
+    file_key = file_key.replace(os.sep, '/')
+    lines = [f"diff --git a/{file_key} b/{file_key}\n"]
+    for line in difflib.unified_diff(
+        original.splitlines(keepends=True), migrated.splitlines(keepends=True),
+        f"a/{file_key}", f"b/{file_key}", n=context
+    ):
+        lines.append(line)
+        if not line.endswith('\n'):
+            # 文件末尾没有换行的行
+            lines.append('\n' + NO_NEWLINE_MARKER)
+    return ''.join(lines)
+
+
+class DiffWriter:
+    """差异输出类"""
+
+    def __init__(self, project_path: str, output_path: Optional[str] = None, stream: Optional[TextIO] = None,
+                 ordered: bool = False):
+        """
+        Args:
+            project_path: 项目根目录（差异中的路径相对于它）
+            output_path: 补丁文件路径，未提供时输出到 stream
+            stream: 输出流，默认标准输出
+            ordered: 缓存全部差异，关闭时按文件路径排序输出（文件不按扫描顺序到达时使用）
+        """
+        self.project_path = project_path
+        self.output_path = output_path
+        self._stream = stream
+        self._file = None
+        self._pending: Optional[Dict[str, str]] = {} if ordered else None
+        self.statistics = {'files': 0, 'added_lines': 0, 'removed_lines': 0}
+
+    def _output(self) -> TextIO:
+        """打开输出（补丁文件在第一次写入时创建）"""
+        if self.output_path is None:
+            return self._stream or sys.stdout
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+            self._file = open(self.output_path, 'w', encoding='utf-8', newline='\n')
+        return self._file
+
+    def write_diff(self, file_path: str, original: str, migrated: str) -> bool:
+        """
+        输出单个文件的差异并立即刷新（ordered 模式下缓存到关闭时输出）
+
+        Returns:
+            文件内容是否有变化
+        """
+        file_key = os.path.relpath(os.path.abspath(file_path), os.path.abspath(self.project_path))
+        diff = unified_diff(original, migrated, file_key)
+        if not diff:
+            return False
+
+        if self._pending is not None:
+            self._pending[file_key] = diff
+        else:
+            self._emit(diff)
+
+        self.statistics['files'] += 1
+        # 跳过 diff --git、---、+++ 三行文件头
+        for line in diff.splitlines()[3:]:
+            if line.startswith('+'):
+                self.statistics['added_lines'] += 1
+            elif line.startswith('-'):
+                self.statistics['removed_lines'] += 1
+        return True
+
+    def _emit(self, diff: str):
+        """写出差异并刷新"""
+        output = self._output()
+        output.write(diff)
+        output.flush()
+
+    def close(self):
+        """按文件路径顺序写出缓存的差异，关闭补丁文件"""
+        if self._pending:
+            for file_key in sorted(self._pending):
+                self._emit(self._pending[file_key])
+            self._pending.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
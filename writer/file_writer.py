@@ -2,47 +2,68 @@
 # -*- coding: utf-8 -*-
 """
 文件写入器
-写入修改后的文件
-支持备份原始文件（如 .bak）
+写入修改后的文件（先写临时文件再原子替换，进程中途退出不会留下截断的文件）
+支持备份原始文件（内容寻址存储，相同内容只保存一次；或追加写入单个 tar/zip 归档）
+支持写前日志，记录每个文件的写入进度
 支持输出迁移报告（统计替换数量）
 """
 
+import hashlib
 import os
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from config import Config
+from .write_journal import WriteJournal, file_hash, to_project_path
+from .backup_store import BackupStore
+from .backup_archive import BackupArchive, ARCHIVE_FORMATS
+
+
+BACKUP_DIR_NAME = "butterknife_backup"
+
+
+def create_backup_store(backup_dir: str, mode: str = 'store', compress: bool = False):
+    """按备份方式创建备份存储（store为内容寻址对象目录，tar/zip为单文件归档）"""
+    if mode in ARCHIVE_FORMATS:
+        return BackupArchive(backup_dir, mode, compress)
+    return BackupStore(backup_dir, compress)
 
 
 class FileWriter:
     """文件写入器类"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, journal: Optional[WriteJournal] = None):
         self.config = config
         self.backup_dir = None
+        self.backup_store = None
         self.migration_log = []
+        self.journal = journal
         
-        # 创建备份目录
-        if self.config.BACKUP_ENABLED:
+        # 创建备份目录（预览模式不创建）
+        if self.config.BACKUP_ENABLED and not self.config.DRY_RUN:
             self._create_backup_directory()
     
     def _create_backup_directory(self):
         """创建备份目录"""
         project_path = Path(self.config.PROJECT_PATH)
-        backup_dir = project_path / "butterknife_backup"
+        backup_dir = project_path / BACKUP_DIR_NAME
         
         if not backup_dir.exists():
             backup_dir.mkdir(parents=True, exist_ok=True)
         
         self.backup_dir = backup_dir
+        self.backup_store = create_backup_store(str(backup_dir), self.config.BACKUP_MODE, self.config.BACKUP_COMPRESS)
     
-    def write_file(self, file_path: str, content: str) -> bool:
+    def write_file(self, file_path: str, content: str, original_hash: Optional[str] = None,
+                   original_stat: Optional[Tuple[int, int]] = None) -> bool:
         """
         写入文件
         
         Args:
             file_path: 文件路径
             content: 文件内容
+            original_hash: 原文件内容的SHA-256（写前日志使用，未提供时重新计算）
+            original_stat: 计算 original_hash 时原文件的 (大小, 修改时间)，备份时据此判断哈希是否仍然有效
             
         Returns:
             是否成功写入
@@ -55,13 +76,34 @@ class FileWriter:
                 print(f"警告: 文件不存在: {file_path}")
                 return False
             
+            # 与文本模式写入一致的字节内容
+            if os.linesep != '\n':
+                content = content.replace('\n', os.linesep)
+            data = content.encode('utf-8')
+            temp_path = self._temp_path(file_path)
+            journal_key = None
+            
+            if self.journal is not None:
+                journal_key = self.get_relative_path(file_path)
+                original_hash = original_hash or file_hash(file_path)
+                self.journal.planned(
+                    journal_key,
+                    original_hash,
+                    hashlib.sha256(data).hexdigest(),
+                    to_project_path(temp_path, self.config.PROJECT_PATH)
+                )
+            
             # 创建备份
             if self.config.BACKUP_ENABLED and self.backup_dir:
-                self._create_backup(file_path)
+                backup_path = self._create_backup(file_path, original_hash, original_stat)
+                if backup_path and journal_key is not None:
+                    self.journal.backed_up(journal_key, to_project_path(backup_path, self.config.PROJECT_PATH))
             
             # 写入新内容
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._atomic_write(file_path, temp_path, data)
+            
+            if journal_key is not None:
+                self.journal.committed(journal_key)
             
             # 记录迁移日志
             self._log_migration(file_path, True, "文件写入成功")
@@ -74,36 +116,52 @@ class FileWriter:
             self._log_migration(file_path, False, error_msg)
             return False
     
-    def _create_backup(self, file_path: str):
-        """创建文件备份"""
-        if not self.backup_dir:
-            return
+    @staticmethod
+    def _temp_path(file_path: str) -> str:
+        """与目标文件位于同一目录的临时文件路径（保证可以原子替换）"""
+        directory, name = os.path.split(file_path)
+        return os.path.join(directory, f".{name}.butterknife.tmp")
+    
+    def _atomic_write(self, file_path: str, temp_path: str, data: bytes):
+        """先写入临时文件并落盘，再用 os.replace 原子替换目标文件"""
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def get_relative_path(self, file_path: str) -> str:
+        """文件相对于项目根目录的路径"""
+        return os.path.relpath(os.path.abspath(file_path), os.path.abspath(self.config.PROJECT_PATH))
+    
+    def _create_backup(self, file_path: str, content_hash: Optional[str] = None,
+                       hashed_stat: Optional[Tuple[int, int]] = None) -> Optional[str]:
+        """创建文件备份，返回备份对象的路径"""
+        if not self.backup_store:
+            return None
         
         try:
-            file_path_obj = Path(file_path)
-            project_path = Path(self.config.PROJECT_PATH)
-            
-            # 计算相对路径
-            try:
-                relative_path = file_path_obj.relative_to(project_path)
-            except ValueError:
-                # 如果文件不在项目目录内，使用文件名
-                relative_path = file_path_obj.name
-            
-            # 创建备份文件路径
-            backup_file_path = self.backup_dir / relative_path
-            
-            # 创建必要的目录
-            backup_file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 复制文件
-            shutil.copy2(file_path, backup_file_path)
+            backup_path = self.backup_store.add(self.get_relative_path(file_path), file_path, content_hash, hashed_stat)
             
             # 记录备份信息
-            self._log_migration(file_path, True, f"备份文件已创建: {backup_file_path}")
+            self._log_migration(file_path, True, f"备份文件已创建: {backup_path}")
+            
+            return backup_path
             
         except Exception as e:
             print(f"创建备份失败: {e}")
+            return None
+    
+    def close(self):
+        """关闭备份清单"""
+        if self.backup_store:
+            self.backup_store.close()
     
     def _log_migration(self, file_path: str, success: bool, message: str):
         """记录迁移日志"""
@@ -223,30 +281,25 @@ class FileWriter:
             return False
     
     def restore_from_backup(self, file_path: str) -> bool:
-        """从备份恢复文件"""
+        """从最近一次的备份恢复文件"""
         if not self.backup_dir or not self.backup_dir.exists():
             print("备份目录不存在")
             return False
         
         try:
-            file_path_obj = Path(file_path)
-            project_path = Path(self.config.PROJECT_PATH)
-            
-            # 计算相对路径
-            try:
-                relative_path = file_path_obj.relative_to(project_path)
-            except ValueError:
-                relative_path = file_path_obj.name
+            file_key = self.get_relative_path(file_path)
+            entry = self.backup_store.lookup(file_key)
             
-            # 查找备份文件
-            backup_file_path = self.backup_dir / relative_path
+            if entry is not None:
+                self.backup_store.restore(entry, file_path)
+            else:
+                # 旧版本按项目目录结构复制的备份
+                backup_file_path = self.backup_dir / file_key
+                if not backup_file_path.is_file():
+                    print(f"备份文件不存在: {file_key}")
+                    return False
+                shutil.copy2(backup_file_path, file_path)
             
-            if not backup_file_path.exists():
-                print(f"备份文件不存在: {backup_file_path}")
-                return False
-            
-            # 恢复文件
-            shutil.copy2(backup_file_path, file_path)
             print(f"文件已从备份恢复: {file_path}")
             
             return True
@@ -255,8 +308,27 @@ class FileWriter:
             print(f"从备份恢复文件失败: {e}")
             return False
     
+    def restore_all(self, run_id: Optional[str] = None) -> List[str]:
+        """
+        从备份恢复所有文件（每个文件最近一次的备份）
+        
+        Args:
+            run_id: 指定时只恢复该次运行备份的文件
+            
+        Returns:
+            已恢复的文件相对路径
+        """
+        if not self.backup_store:
+            print("备份目录不存在")
+            return []
+        
+        entries = self.backup_store.latest_entries(run_id)
+        restored = self.backup_store.restore_all(entries, self.config.PROJECT_PATH)
+        print(f"已从备份恢复 {len(restored)} 个文件")
+        return restored
+    
     def get_backup_info(self) -> Dict[str, Any]:
-        """获取备份信息"""
+        """获取备份信息（根据备份清单统计）"""
         if not self.backup_dir or not self.backup_dir.exists():
             return {
                 'backup_enabled': False,
@@ -266,18 +338,17 @@ class FileWriter:
             }
         
         try:
-            backup_files = list(self.backup_dir.rglob('*'))
-            backup_file_count = len([f for f in backup_files if f.is_file()])
-            
-            # 计算备份目录大小
-            backup_size = sum(f.stat().st_size for f in backup_files if f.is_file())
+            info = self.backup_store.get_info()
             
             return {
                 'backup_enabled': True,
                 'backup_directory': str(self.backup_dir),
-                'backup_file_count': backup_file_count,
-                'backup_size': backup_size,
-                'backup_size_mb': backup_size / (1024 * 1024)
+                'backup_file_count': info['file_count'],
+                'backup_size': info['stored_size'],
+                'backup_size_mb': info['stored_size'] / (1024 * 1024),
+                'original_size': info['original_size'],
+                'blob_count': info['blob_count'],
+                'run_count': info['run_count']
             }
             
         except Exception as e:
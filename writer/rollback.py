@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+回滚一次迁移运行
+读取该次运行的备份清单，用线程池并行恢复所有文件，恢复后校验内容哈希
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from config import Config
+from .file_writer import BACKUP_DIR_NAME, create_backup_store
+from .backup_archive import ARCHIVE_FORMATS
+from .write_journal import file_hash
+
+
+def find_backup_store(config: Config):
+    """
+    打开项目的备份存储
+    优先使用配置的备份方式，没有备份记录时依次尝试其他方式（备份方式可能在两次运行之间改变）
+    """
+    backup_dir = os.path.join(config.PROJECT_PATH, BACKUP_DIR_NAME)
+    modes = [config.BACKUP_MODE] + [mode for mode in ('store',) + ARCHIVE_FORMATS if mode != config.BACKUP_MODE]
+    for mode in modes:
+        store = create_backup_store(backup_dir, mode, config.BACKUP_COMPRESS)
+        if store.list_runs():
+            return store
+    return None
+
+
+def rollback_run(config: Config, run_id: Optional[str] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    恢复某次运行备份的所有文件
+
+    Args:
+        config: 配置（使用其中的项目路径和备份方式）
+        run_id: 运行ID，默认回滚最近一次运行
+        workers: 线程数，默认由线程池决定
+
+    Returns:
+        回滚结果，包含恢复的文件数、失败的文件和吞吐量
+
+    Raises:
+        ValueError: 没有备份或指定的运行不存在
+    """
+    store = find_backup_store(config)
+    runs = store.list_runs() if store else []
+    if not runs:
+        raise ValueError(f"没有找到可回滚的备份: {os.path.join(config.PROJECT_PATH, BACKUP_DIR_NAME)}")
+
+    run_id = run_id or runs[-1]
+    if run_id not in runs:
+        raise ValueError(f"备份中没有运行 {run_id}，可用的运行: {', '.join(runs)}")
+
+    entries = store.latest_entries(run_id)
+    # 归档备份按数据偏移排序，尽量顺序读取
+    ordered = sorted(entries.items(), key=lambda item: (item[1].get('offset', 0), item[0]))
+
+    def restore(item):
+        file_key, entry = item
+        target_path = os.path.join(config.PROJECT_PATH, file_key)
+        try:
+            store.restore(entry, target_path)
+        except Exception as e:
+            return file_key, str(e)
+        if file_hash(target_path) != entry['hash']:
+            return file_key, "恢复后的文件内容与备份的哈希不一致"
+        return file_key, None
+
+    start = time.perf_counter()
+    restored = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for file_key, error in pool.map(restore, ordered):
+            if error is None:
+                restored += 1
+            else:
+                failed.append({'file': file_key, 'error': error})
+    seconds = time.perf_counter() - start
+
+    restored_bytes = sum(entry['size'] for entry in entries.values())
+    return {
+        'run_id': run_id,
+        'total_files': len(entries),
+        'restored_files': restored,
+        'failed_files': failed,
+        'bytes': restored_bytes,
+        'seconds': round(seconds, 6),
+        'files_per_second': round(len(entries) / seconds, 1) if seconds > 0 else None,
+        'mb_per_second': round(restored_bytes / (1024 * 1024) / seconds, 2) if seconds > 0 else None
+    }
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+写前日志
+按行追加记录每个文件的写入进度：计划写入 → 已备份 → 已提交
+进程中途退出后，--resume 根据日志跳过已提交的文件，并完成或回滚写入中的文件
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from .backup_store import read_blob, write_file_atomic
+from .backup_archive import read_reference, is_archive_reference, REFERENCE_SEPARATOR
+
+
+JOURNAL_FILE_NAME = "write_journal.jsonl"
+
+# 文件写入状态
+STATE_PLANNED = 'planned'
+STATE_BACKED_UP = 'backed_up'
+STATE_COMMITTED = 'committed'
+
+
+def file_hash(file_path: str) -> Optional[str]:
+    """计算文件内容的SHA-256，文件不存在时返回None"""
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _split_reference(path: str) -> Tuple[str, str]:
+    """拆分为文件路径和归档引用中的位置后缀（普通路径的后缀为空）"""
+    if is_archive_reference(path):
+        archive_path, separator, location = path.rpartition(REFERENCE_SEPARATOR)
+        return archive_path, separator + location
+    return path, ''
+
+
+def to_project_path(path: str, project_path: str) -> str:
+    """
+    日志中保存的路径：临时文件和备份路径（包括归档引用中的归档路径）相对于项目根目录，
+    与当前工作目录无关
+    """
+    file_path, suffix = _split_reference(path)
+    return os.path.relpath(os.path.abspath(file_path), os.path.abspath(project_path)) + suffix
+
+
+def resolve_project_path(path: str, project_path: str) -> str:
+    """将日志中保存的路径还原为可访问的路径（绝对路径保持不变）"""
+    file_path, suffix = _split_reference(path)
+    return os.path.join(project_path, file_path) + suffix
+
+
+class WriteJournal:
+    """写前日志类"""
+
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+        self._file = None
+
+    @staticmethod
+    def load(journal_path: str) -> Optional[Dict[str, Any]]:
+        """
+        读取已有的日志
+
+        Returns:
+            {'complete': 上次运行是否正常结束, 'files': {文件: 最新状态记录}}，日志不存在时返回None
+        """
+        if not os.path.exists(journal_path):
+            return None
+
+        complete = False
+        files = {}
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 进程退出时写了一半的最后一行
+                    continue
+
+                op = record.get('op')
+                if op in ('begin', 'resume'):
+                    complete = False
+                elif op == 'end':
+                    complete = True
+                elif op == STATE_PLANNED:
+                    files[record['file']] = dict(record, state=STATE_PLANNED)
+                elif op in (STATE_BACKED_UP, STATE_COMMITTED) and record['file'] in files:
+                    entry = files[record['file']]
+                    entry['state'] = op
+                    if op == STATE_BACKED_UP:
+                        entry['backup'] = record['backup']
+
+        return {'complete': complete, 'files': files}
+
+    def begin(self, resume: bool = False):
+        """开始记录：新运行时清空日志，继续运行时追加"""
+        os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+        self._file = open(self.journal_path, 'a' if resume else 'w', encoding='utf-8')
+        self._append({'op': 'resume' if resume else 'begin', 'time': datetime.now().isoformat()})
+
+    def planned(self, file_key: str, original_hash: Optional[str], new_hash: str, temp_path: str):
+        """记录即将写入的文件"""
+        self._append({
+            'op': STATE_PLANNED,
+            'file': file_key,
+            'original_hash': original_hash,
+            'new_hash': new_hash,
+            'temp': temp_path
+        })
+
+    def backed_up(self, file_key: str, backup_path: str):
+        """记录文件已备份"""
+        self._append({'op': STATE_BACKED_UP, 'file': file_key, 'backup': backup_path})
+
+    def committed(self, file_key: str):
+        """记录文件已写入完成"""
+        self._append({'op': STATE_COMMITTED, 'file': file_key})
+
+    def end(self):
+        """记录运行正常结束"""
+        self._append({'op': 'end', 'time': datetime.now().isoformat()})
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """关闭日志文件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, record: Dict[str, Any]):
+        """追加一条记录并立即刷新，进程退出时不会丢失"""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+
+def recover_in_flight(state: Dict[str, Any], project_path: str) -> Dict[str, list]:
+    """
+    处理上次运行中未提交的文件
+
+    - 目标文件已是新内容：替换已完成，只差提交记录，视为已提交
+    - 目标文件仍是原内容：清理临时文件，本次重新处理
+    - 其他情况且有备份：从备份回滚后重新处理
+    - 其他情况且无备份：无法判断，保持原样并报告
+
+    Returns:
+        {'committed': [...], 'finished': [...], 'rolled_back': [...], 'pending': [...], 'unresolved': [...]}
+    """
+    result = {'committed': [], 'finished': [], 'rolled_back': [], 'pending': [], 'unresolved': []}
+
+    for file_key, entry in state['files'].items():
+        if entry['state'] == STATE_COMMITTED:
+            result['committed'].append(file_key)
+            continue
+
+        file_path = os.path.join(project_path, file_key)
+        temp_path = resolve_project_path(entry['temp'], project_path) if entry.get('temp') else None
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        backup_path = resolve_project_path(entry['backup'], project_path) if entry.get('backup') else ''
+
+        current_hash = file_hash(file_path)
+        if current_hash is not None and current_hash == entry.get('new_hash'):
+            result['finished'].append(file_key)
+        elif current_hash is not None and current_hash == entry.get('original_hash'):
+            result['pending'].append(file_key)
+        elif entry['state'] == STATE_BACKED_UP and is_archive_reference(backup_path):
+            write_file_atomic(file_path, read_reference(backup_path))
+            result['rolled_back'].append(file_key)
+        elif entry['state'] == STATE_BACKED_UP and os.path.exists(backup_path):
+            write_file_atomic(file_path, read_blob(backup_path))
+            result['rolled_back'].append(file_key)
+        else:
+            result['unresolved'].append(file_key)
+
+    return result